@@ -0,0 +1,89 @@
+# bench_faq_index.py - Query latency: cosine_similarity + argmax (main.py before) vs FAQIndex
+#
+#   python bench_faq_index.py                       # 10k, 100k and 1M synthetic FAQs
+#   python bench_faq_index.py --sizes 10000 --queries 500
+#
+# FAQs are random sentences over a Zipf-distributed vocabulary; queries are questions with
+# words dropped and replaced, so they overlap many questions the way real queries do.
+import argparse
+import time
+
+import numpy as np
+from sklearn.metrics.pairwise import cosine_similarity
+
+from faq_index import FAQIndex
+
+VOCABULARY = np.array([f"w{i}" for i in range(50_000)])
+
+
+def sentences(rng, n, min_words, max_words):
+    lengths = rng.integers(min_words, max_words + 1, size=n)
+    words = VOCABULARY[np.minimum(rng.zipf(1.3, size=lengths.sum()) - 1, len(VOCABULARY) - 1)]
+    bounds = np.concatenate(([0], np.cumsum(lengths)))
+    return [" ".join(words[start:end]) for start, end in zip(bounds[:-1], bounds[1:])]
+
+
+def synthetic_faqs(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return sentences(rng, n, 5, 12), sentences(rng, n, 10, 25)
+
+
+def make_queries(questions, n, seed=1):
+    rng = np.random.default_rng(seed)
+    queries = []
+    for i in rng.integers(0, len(questions), size=n):
+        words = questions[i].split()
+        keep = [word for word in words if rng.random() > 0.3]
+        queries.append(" ".join(keep + sentences(rng, 1, 1, 3)))
+    return queries
+
+
+def legacy_search(vectorizer, vectorized_questions, query):
+    """main.py before FAQIndex: cosine_similarity against every question, dense argmax"""
+    similarities = cosine_similarity(vectorizer.transform([query]), vectorized_questions)
+    return np.argmax(similarities, axis=1)[0], similarities.max()
+
+
+def percentiles(samples):
+    return np.percentile(np.asarray(samples) * 1000, [50, 99])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', nargs='+', type=int, default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--batch', type=int, default=200, help='queries per batched search() call')
+    args = parser.parse_args()
+
+    print(f"{'FAQs':>10} {'build s':>8} {'legacy p50/p99 ms':>18} {'index p50/p99 ms':>17} "
+          f"{'speedup':>8} {'batched ms/query':>17}")
+    for size in args.sizes:
+        questions, answers = synthetic_faqs(size)
+        queries = make_queries(questions, args.queries)
+
+        start = time.perf_counter()
+        index = FAQIndex(questions, answers)
+        build_time = time.perf_counter() - start
+        vectorized_questions = index.vectorizer.transform(questions)
+
+        legacy_times, index_times = [], []
+        for query in queries:
+            start = time.perf_counter()
+            expected, expected_score = legacy_search(index.vectorizer, vectorized_questions, query)
+            legacy_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            indices, scores = index.search([query], k=1)
+            index_times.append(time.perf_counter() - start)
+            assert np.isclose(scores[0, 0], expected_score, rtol=1e-9, atol=1e-12), query
+            assert indices[0, 0] == expected or np.isclose(expected_score, scores[0, 0]), query
+
+        batch = (queries * (args.batch // len(queries) + 1))[:args.batch]
+        start = time.perf_counter()
+        index.search(batch, k=5)
+        batched = (time.perf_counter() - start) / len(batch)
+
+        legacy, fast = percentiles(legacy_times), percentiles(index_times)
+        print(f"{size:>10,} {build_time:>8.1f} {legacy[0]:>9.2f}/{legacy[1]:<8.2f} {fast[0]:>8.2f}/{fast[1]:<8.2f} "
+              f"{legacy[0] / fast[0]:>7.0f}x {batched * 1000:>17.3f}")
+    print("\nTop-1 question and score match the legacy path for every query")
@@ -0,0 +1,118 @@
+# bench_faq_service.py - Load test of faq_service.py: queries/sec over HTTP and stdin/stdout
+#
+#   python bench_faq_service.py                          # 100k synthetic FAQs, 1..64 clients
+#   python bench_faq_service.py --faqs 10000 --clients 1 16 --seconds 3
+#
+# The service runs in its own process, once with batching off (--max-batch 1) and once with it on;
+# clients are threads here holding keep-alive connections, each sending one query per request.
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas
+
+from bench_faq_index import make_queries, synthetic_faqs
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_service(csv, port, max_batch):
+    process = subprocess.Popen([sys.executable, 'faq_service.py', '--csv', csv, '--http', '--port', str(port),
+                                '--max-batch', str(max_batch)], cwd=os.path.dirname(os.path.abspath(__file__)),
+                               stdout=subprocess.PIPE, text=True)
+    process.stdout.readline()  # printed once the index is loaded and the socket is listening
+    return process
+
+
+def client(port, queries, stop, latencies, k):
+    connection = http.client.HTTPConnection('127.0.0.1', port)
+    i = 0
+    while not stop.is_set():
+        body = json.dumps({'query': queries[i % len(queries)], 'k': k})
+        start = time.perf_counter()
+        connection.request('POST', '/ask', body, {'Content-Type': 'application/json'})
+        response = connection.getresponse()
+        assert response.status == 200 and len(json.loads(response.read())['results'][0]) == k
+        latencies.append(time.perf_counter() - start)
+        i += 1
+    connection.close()
+
+
+def load(port, queries, n_clients, seconds, k):
+    stop = threading.Event()
+    latencies = [[] for _ in range(n_clients)]
+    threads = [threading.Thread(target=client, args=(port, queries[i::n_clients], stop, latencies[i], k))
+               for i in range(n_clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    done = np.concatenate([np.asarray(times) for times in latencies]) * 1000
+    return len(done) / elapsed, np.percentile(done, 50), np.percentile(done, 99)
+
+
+def stats(port):
+    connection = http.client.HTTPConnection('127.0.0.1', port)
+    connection.request('GET', '/stats')
+    return json.loads(connection.getresponse().read())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--faqs', type=int, default=100_000)
+    parser.add_argument('--clients', nargs='+', type=int, default=[1, 8, 32, 64])
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--stdio-queries', type=int, default=20_000)
+    parser.add_argument('-k', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        questions, answers = synthetic_faqs(args.faqs)
+        csv = os.path.join(tmp, 'faqs.csv')
+        pandas.DataFrame({'Question': questions, 'Answer': answers}).to_csv(csv, index=False)
+        queries = make_queries(questions, 5_000)
+        subprocess.run([sys.executable, '-c', f'from faq_index import FAQIndex; FAQIndex.open({csv!r})'],
+                       cwd=os.path.dirname(os.path.abspath(__file__)), check=True)  # build the artifact once
+
+        print(f"{args.faqs:,} FAQs, top {args.k}\n")
+        print(f"{'mode':<14} {'clients':>8} {'queries/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'mean batch':>11}")
+        for label, max_batch in (('unbatched', 1), ('batched', 256)):
+            port = free_port()
+            service = start_service(csv, port, max_batch)
+            try:
+                for n_clients in args.clients:
+                    before = stats(port)
+                    qps, p50, p99 = load(port, queries, n_clients, args.seconds, args.k)
+                    after = stats(port)
+                    mean_batch = (after['queries'] - before['queries']) / max(1, after['batches'] - before['batches'])
+                    print(f"{label:<14} {n_clients:>8} {qps:>10.0f} {p50:>8.2f} {p99:>8.2f} {mean_batch:>11.1f}")
+            finally:
+                service.terminate()
+                service.wait()
+
+        repeated = (queries * (args.stdio_queries // len(queries) + 1))[:args.stdio_queries]
+        lines = ''.join(query + '\n' for query in repeated)
+        start = time.perf_counter()
+        output = subprocess.run([sys.executable, 'faq_service.py', '--csv', csv, '--stdio', '-k', str(args.k)],
+                                input=lines, capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+        elapsed = time.perf_counter() - start
+        assert output.count('\n') == args.stdio_queries
+        print(f"{'stdio (pipe)':<14} {'-':>8} {args.stdio_queries / elapsed:>10.0f}   "
+              f"({args.stdio_queries:,} lines in {elapsed:.2f}s including startup)")
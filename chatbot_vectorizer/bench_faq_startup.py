@@ -0,0 +1,68 @@
+# bench_faq_startup.py - Cold start to first answer: refit from CSV vs memory-mapped index artifact
+#
+#   python bench_faq_startup.py                    # faqs.csv and 10k, 100k, 1M synthetic FAQs
+#   python bench_faq_startup.py --sizes 100000
+#
+# Every start is a fresh interpreter, timed from the parent, so imports are included.
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas
+
+from bench_faq_index import synthetic_faqs
+
+QUERY = "how do I access this course"
+STARTS = {
+    'imports only': "import faq_index",
+    'refit (before)': "from faq_index import FAQIndex; print(FAQIndex.from_csv({path!r}).answer({query!r})[:30])",
+    'artifact': "from faq_index import FAQIndex; print(FAQIndex.open({path!r}).answer({query!r})[:30])",
+}
+
+
+def start(code, path):
+    began = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", code.format(path=path, query=QUERY)],
+                            cwd=os.path.dirname(os.path.abspath(__file__)),
+                            check=True, capture_output=True, text=True).stdout
+    return time.perf_counter() - began, output.strip()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', nargs='+', type=int, default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'FAQs':>10} {'imports s':>10} {'refit s':>9} {'build s':>9} {'artifact s':>11} {'speedup':>8} {'size MB':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {9: os.path.join(tmp, "faqs.csv")}
+        pandas.read_csv(os.path.join(os.path.dirname(os.path.abspath(__file__)), "faqs.csv")).to_csv(
+            paths[9], index=False)
+        for size in args.sizes:
+            questions, answers = synthetic_faqs(size)
+            paths[size] = os.path.join(tmp, f"faqs_{size}.csv")
+            pandas.DataFrame({'Question': questions, 'Answer': answers}).to_csv(paths[size], index=False)
+
+        for size, path in paths.items():
+            imports = min(start(STARTS['imports only'], path)[0] for _ in range(args.repeat))
+            refit, expected = start(STARTS['refit (before)'], path)
+            build, first = start(STARTS['artifact'], path)  # no artifact yet: fit, save, then map
+            artifact, answer = min(start(STARTS['artifact'], path) for _ in range(args.repeat))
+            assert expected == first == answer, (expected, first, answer)
+
+            index_dir = os.path.join(tmp, ".index")
+            megabytes = sum(os.path.getsize(os.path.join(root, name))
+                            for root, _, names in os.walk(index_dir) for name in names
+                            if os.path.basename(root).startswith(os.path.basename(path) + ".")) / 1e6
+            print(f"{size:>10,} {imports:>10.3f} {refit:>9.3f} {build:>9.3f} {artifact:>11.3f} "
+                  f"{refit / artifact:>7.1f}x {megabytes:>8.1f}")
+
+            # touching the CSV makes the next start rebuild
+            os.utime(path, ns=(time.time_ns(), time.time_ns()))
+            assert start(STARTS['artifact'], path)[1] == expected
+
+    print("\nRefit and artifact starts gave the same first answer")
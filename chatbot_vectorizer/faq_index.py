@@ -0,0 +1,239 @@
+import glob
+import json
+import os
+import re
+import shutil
+
+import numpy as np
+import scipy.sparse
+
+# pandas and scikit-learn are imported only where an index is built: importing them takes
+# far longer than loading a saved index, so query processes never do
+
+ARRAYS = ['terms', 'idf', 'data', 'indices', 'indptr',
+          'questions_text', 'questions_offsets', 'answers_text', 'answers_offsets']
+
+
+class Texts:
+    """Strings stored as one UTF-8 byte array plus offsets, decoded only when looked up"""
+
+    def __init__(self, text, offsets):
+        self.text, self.offsets = text, offsets
+
+    @classmethod
+    def encode(cls, strings):
+        encoded = [str(s).encode() for s in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        return cls(np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return self.text[self.offsets[i]:self.offsets[i + 1]].tobytes().decode()
+
+
+# TfidfVectorizer settings QueryVectorizer reproduces; any other value falls back to scikit-learn
+QUERY_VECTORIZER_PARAMS = {'analyzer': 'word', 'binary': False, 'input': 'content', 'ngram_range': [1, 1],
+                           'norm': 'l2', 'preprocessor': None, 'stop_words': None, 'strip_accents': None,
+                           'sublinear_tf': False, 'tokenizer': None, 'use_idf': True}
+
+
+class QueryVectorizer:
+    """
+    TfidfVectorizer.transform() for a fitted vocabulary and IDF with the default word analyzer:
+    the same lowercasing, token pattern, counts x IDF and L2 norm, without importing scikit-learn.
+    """
+
+    def __init__(self, terms, idf, params):
+        self.terms, self.idf_, self.params = terms, idf, params
+        self.vocabulary_ = dict(zip(terms.tolist(), range(len(terms))))
+        self.token_pattern = re.compile(params['token_pattern'])
+
+    @classmethod
+    def supports(cls, params):
+        return all(params.get(key) == value for key, value in QUERY_VECTORIZER_PARAMS.items())
+
+    def get_feature_names_out(self):
+        return self.terms
+
+    def get_params(self):
+        return dict(self.params)
+
+    def transform(self, texts):
+        indptr, indices, counts = [0], [], []
+        for text in texts:
+            if self.params['lowercase']:
+                text = text.lower()
+            ids = [self.vocabulary_[token] for token in self.token_pattern.findall(text) if token in self.vocabulary_]
+            unique, repeats = np.unique(np.asarray(ids, dtype=np.int64), return_counts=True)
+            indices.append(unique)
+            counts.append(repeats)
+            indptr.append(indptr[-1] + len(unique))
+        indices = np.concatenate(indices) if indices else np.zeros(0, dtype=np.int64)
+        data = np.concatenate(counts).astype(np.float64) if counts else np.zeros(0)
+        data *= self.idf_[indices]
+        shape = (len(indptr) - 1, len(self.terms))
+        return _l2_normalized(scipy.sparse.csr_matrix((data, indices, indptr), shape=shape))
+
+
+def _l2_normalized(matrix):
+    """CSR rows scaled to unit length; all-zero rows stay zero"""
+    matrix = matrix.tocsr().astype(np.float64)
+    rows = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+    norms = np.sqrt(np.bincount(rows, matrix.data ** 2, minlength=matrix.shape[0]))
+    norms[norms == 0] = 1
+    matrix.data /= norms[rows]
+    return matrix
+
+
+class FAQIndex:
+    """
+    Nearest-question lookup over a FAQ by TF-IDF cosine similarity.
+
+    Question rows are L2-normalized once when the index is built, so a query's cosine similarities
+    are a single sparse product with the (terms x questions) matrix. Only questions that share a
+    term with the query get a score, and the top k are picked with argpartition among those.
+    """
+
+    def __init__(self, questions, answers, vectorizer=None, matrix=None):
+        self.questions = np.asarray(questions, dtype=object)
+        self.answers = np.asarray(answers, dtype=object)
+        if vectorizer is None:
+            from sklearn.feature_extraction.text import TfidfVectorizer
+            vectorizer = TfidfVectorizer()
+            vectorizer.fit(np.concatenate((self.questions, self.answers)))
+        self.vectorizer = vectorizer
+        if matrix is None:
+            matrix = _l2_normalized(vectorizer.transform(self.questions))
+        # stored transposed: query (CSR) @ terms x questions (CSR) is a row-by-row sparse product
+        self.matrix = matrix.T.tocsr()
+
+    @classmethod
+    def from_csv(cls, path="faqs.csv"):
+        import pandas
+        df = pandas.read_csv(path).dropna()
+        return cls(df.Question.to_numpy(), df.Answer.to_numpy())
+
+    def save(self, directory):
+        """
+        Write the index as .npy arrays: vocabulary terms in column order and their IDF, the CSR
+        (terms x questions) matrix as data, indices and indptr, and the texts as UTF-8 bytes + offsets
+        """
+        os.makedirs(directory, exist_ok=True)
+        questions = self.questions if isinstance(self.questions, Texts) else Texts.encode(self.questions)
+        answers = self.answers if isinstance(self.answers, Texts) else Texts.encode(self.answers)
+        arrays = {
+            'terms': self.vectorizer.get_feature_names_out().astype(str),
+            'idf': self.vectorizer.idf_,
+            'data': self.matrix.data, 'indices': self.matrix.indices, 'indptr': self.matrix.indptr,
+            'questions_text': questions.text, 'questions_offsets': questions.offsets,
+            'answers_text': answers.text, 'answers_offsets': answers.offsets,
+        }
+        for name in ARRAYS:
+            np.save(os.path.join(directory, f"{name}.npy"), arrays[name])
+        with open(os.path.join(directory, "index.json"), "w") as f:
+            params = {key: value for key, value in self.vectorizer.get_params().items() if key != 'dtype'}
+            json.dump({'shape': list(self.matrix.shape), 'params': params}, f)
+
+    @classmethod
+    def load(cls, directory):
+        """An index saved by save(), its arrays memory-mapped rather than read"""
+        with open(os.path.join(directory, "index.json")) as f:
+            meta = json.load(f)
+        arrays = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode='r') for name in ARRAYS}
+
+        if QueryVectorizer.supports(meta['params']):
+            vectorizer = QueryVectorizer(arrays['terms'], np.asarray(arrays['idf']), meta['params'])
+        else:
+            from sklearn.feature_extraction.text import TfidfVectorizer
+            vectorizer = TfidfVectorizer(**dict(meta['params'], ngram_range=tuple(meta['params']['ngram_range'])))
+            vectorizer.vocabulary_ = dict(zip(arrays['terms'].tolist(), range(len(arrays['terms']))))
+            vectorizer.idf_ = np.asarray(arrays['idf'])
+        matrix = scipy.sparse.csr_matrix((arrays['data'], arrays['indices'], arrays['indptr']),
+                                         shape=tuple(meta['shape']), copy=False)
+
+        index = cls.__new__(cls)
+        index.vectorizer, index.matrix = vectorizer, matrix
+        index.questions = Texts(arrays['questions_text'], arrays['questions_offsets'])
+        index.answers = Texts(arrays['answers_text'], arrays['answers_offsets'])
+        return index
+
+    @classmethod
+    def open(cls, path="faqs.csv", cache_dir=None):
+        """
+        The index of the CSV at path, loaded from its saved artifact. The artifact is rebuilt only
+        when the CSV changes: it lives in <cache_dir>/<name>.<size>-<mtime_ns>/ and older ones are removed.
+        """
+        stat = os.stat(path)
+        cache_dir = cache_dir or os.path.join(os.path.dirname(os.path.abspath(path)), ".index")
+        name = os.path.basename(path)
+        directory = os.path.join(cache_dir, f"{name}.{stat.st_size}-{stat.st_mtime_ns}")
+        if not os.path.exists(directory):
+            # only finished artifacts of other versions: another process's <directory>.<pid>.tmp build,
+            # or the directory it has just published, must stay
+            finished = re.compile(re.escape(name) + r"\.\d+-\d+")
+            for stale in glob.glob(os.path.join(cache_dir, f"{name}.*")):
+                if stale != directory and finished.fullmatch(os.path.basename(stale)):
+                    shutil.rmtree(stale, ignore_errors=True)
+            # built aside and renamed into place, so a reader never sees a partial artifact
+            temporary = f"{directory}.{os.getpid()}.tmp"
+            cls.from_csv(path).save(temporary)
+            try:
+                os.rename(temporary, directory)
+            except OSError:  # another process published it first
+                shutil.rmtree(temporary, ignore_errors=True)
+        return cls.load(directory)
+
+    def __len__(self):
+        return len(self.questions)
+
+    def scores(self, queries):
+        """Sparse (queries x questions) cosine similarities"""
+        vectors = _l2_normalized(self.vectorizer.transform(queries))
+        return (vectors @ self.matrix).tocsr()
+
+    def search(self, queries, k=1):
+        """
+        Indices and scores of the k most similar questions per query, best first, as (len(queries), k)
+        arrays. Ties go to the earlier question; when fewer than k questions share a term with the
+        query, the rest are the first questions with score 0 (as argmax over all scores would pick).
+        """
+        if k < 1:
+            raise ValueError("k must be >= 1")
+        if isinstance(queries, str):
+            queries = [queries]
+        k = min(k, len(self))
+        if not len(queries):
+            return np.empty((0, k), dtype=np.int64), np.empty((0, k))
+        similarities = self.scores(queries)
+        indices = np.empty((len(queries), k), dtype=np.int64)
+        scores = np.zeros((len(queries), k))
+        for row in range(len(queries)):
+            start, end = similarities.indptr[row], similarities.indptr[row + 1]
+            # TF-IDF weights are non-negative: every stored product is a question sharing a term
+            columns, values = similarities.indices[start:end], similarities.data[start:end]
+            if len(values) > k:
+                # everything tied with the k-th best stays a candidate so ties resolve by index
+                kth = values[np.argpartition(values, len(values) - k)[len(values) - k:]].min()
+                keep = values >= kth
+                columns, values = columns[keep], values[keep]
+            order = np.lexsort((columns, -values))[:k]
+            found = len(order)
+            indices[row, :found], scores[row, :found] = columns[order], values[order]
+            if found < k:
+                unscored = np.setdiff1d(np.arange(min(len(self), k + found)), columns[order])
+                indices[row, found:] = unscored[:k - found]
+        return indices, scores
+
+    def answer(self, query):
+        """Answer of the question closest to query"""
+        indices, _ = self.search([query], k=1)
+        return self.answers[indices[0, 0]]
+
+    def ask(self, queries, k=1):
+        """Per query, the top k as (question, answer, score) tuples"""
+        indices, scores = self.search(queries, k)
+        return [[(self.questions[i], self.answers[i], float(score)) for i, score in zip(row, row_scores)]
+                for row, row_scores in zip(indices, scores)]
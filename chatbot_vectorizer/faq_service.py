@@ -0,0 +1,226 @@
+# faq_service.py - Long-running FAQ chatbot: the index is loaded once and queries are answered in batches
+#
+#   python faq_service.py --http --port 8000            # POST /ask {"query": "...", "k": 3}
+#   python faq_service.py --stdio < questions.txt       # one query per line in, one JSON line out
+#
+# Requests from every connection (or every stdin line) go through one QueryBatcher thread, which
+# collects whatever arrived while the previous batch ran and answers it with a single
+# FAQIndex.search(): one vectorizer call and one sparse matrix product per batch.
+import argparse
+import json
+import queue
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from faq_index import FAQIndex
+
+
+class QueryBatcher:
+    """Answers submitted queries on a background thread, in batches of up to max_batch"""
+
+    def __init__(self, index, max_batch=256, max_wait=0.0):
+        self.index = index
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.queries = queue.Queue()
+        self.batches = self.answered = 0
+        self.thread = threading.Thread(target=self._run, name='query-batcher', daemon=True)
+        self.thread.start()
+
+    @staticmethod
+    def check(query, k):
+        """Raise TypeError or ValueError unless query is a string and k an integer >= 1"""
+        if not isinstance(query, str):
+            raise TypeError("query must be a string")
+        if isinstance(k, bool) or not isinstance(k, int) or k < 1:
+            raise ValueError("k must be an integer >= 1")
+
+    def submit(self, query, k=1):
+        """A Future of the top k as [{"question", "answer", "score"}, ...], best first"""
+        # checked here, so one bad caller cannot fail the other queries of its batch
+        self.check(query, k)
+        future = Future()
+        self.queries.put((query, k, future))
+        return future
+
+    def ask(self, queries, k=1, timeout=None):
+        futures = [self.submit(query, k) for query in queries]
+        return [future.result(timeout) for future in futures]
+
+    def _next_batch(self):
+        batch = [self.queries.get()]
+        # queries that arrived while the previous batch ran are taken at once; max_wait > 0 also
+        # holds the batch open for stragglers, trading single-client latency for larger batches
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self.queries.get(timeout=max(0.0, deadline - time.monotonic())))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                indices, scores = self.index.search([query for query, _, _ in batch],
+                                                    k=max(k for _, k, _ in batch))
+            except Exception as e:
+                for _, _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, k, future), row, row_scores in zip(batch, indices, scores):
+                future.set_result([{'question': self.index.questions[i], 'answer': self.index.answers[i],
+                                    'score': float(score)} for i, score in zip(row[:k], row_scores[:k])])
+            self.batches += 1
+            self.answered += len(batch)
+
+    def stats(self):
+        return {'faqs': len(self.index), 'batches': self.batches, 'queries': self.answered,
+                'mean_batch': self.answered / self.batches if self.batches else 0.0}
+
+
+class FAQHandler(BaseHTTPRequestHandler):
+    """
+    POST /ask     {"query": "...", "k": 3} or {"queries": [...], "k": 3}  ->  {"results": [[...], ...]}
+    GET  /stats   ->  batching counters
+    GET  /health  ->  "ok"
+    """
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True  # headers and body are separate writes; don't let them wait on delayed ACKs
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send_json(200, 'ok')
+        elif self.path == '/stats':
+            self._send_json(200, self.server.batcher.stats())
+        else:
+            self._send_json(404, {'error': f'unknown path {self.path}'})
+
+    def do_POST(self):
+        if self.path != '/ask':
+            self._send_json(404, {'error': f'unknown path {self.path}'})
+            return
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            if not isinstance(request, dict):
+                raise TypeError
+            queries = request['queries'] if 'queries' in request else [request['query']]
+            k = request.get('k', 1)
+            if not isinstance(queries, list):
+                raise TypeError
+            # the whole request is checked before any of it is queued
+            for query in queries:
+                QueryBatcher.check(query, k)
+        except (ValueError, KeyError, TypeError):
+            self._send_json(400, {'error': 'expected a JSON body with "query" (or a "queries" list of strings) '
+                                           'and an optional integer k >= 1'})
+            return
+        try:
+            results = self.server.batcher.ask(queries, k, self.server.timeout)
+        except TimeoutError:
+            self._send_json(503, {'error': f'not answered within {self.server.timeout}s'})
+            return
+        self._send_json(200, {'results': results})
+
+
+class FAQHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256  # the default listen backlog of 5 resets bursts of parallel clients
+
+
+def serve(batcher, host='127.0.0.1', port=8000, timeout=30.0, verbose=False):
+    """Start the HTTP server; call serve_forever() on the result (or run it in a thread)"""
+    server = FAQHTTPServer((host, port), FAQHandler)
+    server.batcher = batcher
+    server.timeout = timeout
+    server.verbose = verbose
+    return server
+
+
+def serve_stdio(batcher, k=1, lines=sys.stdin, out=sys.stdout):
+    """
+    One query per input line (plain text, or JSON {"query": ..., "k": ...}); one JSON line of
+    results per query, in input order. Lines are submitted as they are read, so piped input is batched.
+    """
+    pending = queue.Queue()
+
+    def write():
+        while (future := pending.get()) is not None:
+            try:
+                out.write(json.dumps({'results': future.result()}) + '\n')
+            except Exception as e:
+                out.write(json.dumps({'error': str(e)}) + '\n')
+            out.flush()
+
+    writer = threading.Thread(target=write, name='stdio-writer')
+    writer.start()
+    for line in lines:
+        line = line.rstrip('\n')
+        query, line_k = line, k
+        if line.startswith('{'):
+            try:
+                request = json.loads(line)
+            except ValueError:
+                request = None  # not JSON: the line is the query text
+            if isinstance(request, dict):
+                query, line_k = request.get('query'), request.get('k', k)
+        try:
+            pending.put(batcher.submit(query, line_k))
+        except (ValueError, TypeError):
+            failed = Future()
+            failed.set_exception(ValueError('expected "query" as a string and an optional integer k >= 1'))
+            pending.put(failed)
+    pending.put(None)
+    writer.join()
+
+
+def ask(url, queries, k=1):
+    """Client helper: top-k results per query from a running service"""
+    request = urllib.request.Request(f'{url}/ask', data=json.dumps({'queries': list(queries), 'k': k}).encode(),
+                                     headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())['results']
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Serve FAQ answers from a loaded index')
+    parser.add_argument('--csv', default='faqs.csv', help='FAQ CSV; its saved index is rebuilt only when it changes')
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument('--http', action='store_true', help='serve POST /ask on --host:--port')
+    mode.add_argument('--stdio', action='store_true', help='answer one query per stdin line')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('-k', type=int, default=3, help='answers per query in --stdio mode')
+    parser.add_argument('--max-batch', type=int, default=256)
+    parser.add_argument('--max-wait', type=float, default=0.0, help='seconds a batch waits for more queries')
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    batcher = QueryBatcher(FAQIndex.open(args.csv), args.max_batch, args.max_wait)
+    if args.stdio:
+        serve_stdio(batcher, args.k)
+    else:
+        server = serve(batcher, args.host, args.port, verbose=args.verbose)
+        print(f"{len(batcher.index)} FAQs, serving on http://{args.host}:{args.port}/ask", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            server.server_close()
@@ -1,28 +1,12 @@
-import numpy as np
-import pandas
-from sklearn.feature_extraction.text import TfidfVectorizer 
-from sklearn.metrics.pairwise import cosine_similarity
+from faq_index import FAQIndex
 
-df = pandas.read_csv("faqs.csv")
-df.dropna(inplace=True)
-
-print(df)
-vectorizer = TfidfVectorizer()
-vectorizer.fit(np.concatenate((df.Question,df.Answer)))
-
-vectorized_questions = vectorizer.transform(df.Question)
-print(vectorized_questions)
+# Loads the saved index memory-mapped; it is rebuilt only when faqs.csv has changed (see faq_index.py)
+index = FAQIndex.open("faqs.csv")
+print(f"{len(index)} FAQs indexed")
 
 while True:
     user_input = input()
-    vectorized_user_input = vectorizer.transform([user_input])
-    similarities = cosine_similarity(vectorized_user_input,
-                                       vectorized_questions)
-    closest_question = np.argmax(similarities,
-                                 axis=1)
-    print(similarities)
-    print(closest_question)
-
-    answer = df.Answer.iloc[closest_question].values[0]
-    print("Answer: ", answer)
-    break    
\ No newline at end of file
+    for question, answer, score in index.ask([user_input], k=1)[0]:
+        print(f"Closest question ({score:.3f}): {question}")
+        print("Answer: ", answer)
+    break
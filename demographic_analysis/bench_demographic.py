@@ -0,0 +1,99 @@
+# bench_demographic.py - Crosstab engine vs the original boolean-scan implementation
+#
+#   python bench_demographic.py                 # adult.data.csv replicated to 100M rows
+#   python bench_demographic.py 10000000
+#
+# The original implementation is kept below as the reference: results must be identical.
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from demographic_engine import USED_COLUMNS, load_adult, statistics, tabulate
+
+
+def legacy_statistics(df):
+    """The previous calculate_demographic_data() body (positional [0] written as .iloc[0])"""
+    total_count = len(df)
+    race_count = pd.Series(df['race'].value_counts())
+    average_age_men = df.loc[df['sex'] == 'Male']['age'].mean().round(0)
+    percentage_bachelors = (((df['education'] == 'Bachelors').sum() / total_count) * 100).round(2)
+    higher_ed_df = df[(df['salary'] == '>50K')
+                      & ((df['education'] == 'Bachelors')
+                         | (df['education'] == 'Masters')
+                         | (df['education'] == 'Doctorate'))]
+    lower_ed_df = df[(df['salary'] == '>50K')
+                     & ((df['education'] != 'Bachelors')
+                        & (df['education'] != 'Masters')
+                        & (df['education'] != 'Doctorate'))]
+    min_work_hours = df['hours-per-week'].min()
+    rich_percentage = (df['hours-per-week'] <= min_work_hours & (df['salary'] == '>50K')).sum() / total_count
+    highest_countries = df[(df['salary'] == '>50K')]['native-country'].value_counts()
+    highest_earning_country = highest_countries.index[0]
+    india_occu = df[(df['native-country'] == 'India') & (df['salary'] == '>50K')]
+    return {
+        'race_count': race_count,
+        'average_age_men': average_age_men,
+        'percentage_bachelors': percentage_bachelors,
+        'higher_education_rich': (len(higher_ed_df) / total_count) * 100,
+        'lower_education_rich': (len(lower_ed_df) / total_count) * 100,
+        'min_work_hours': min_work_hours,
+        'rich_percentage': rich_percentage,
+        'highest_earning_country': highest_earning_country,
+        'highest_earning_country_percentage':
+            (highest_countries.iloc[0] / len(df['native-country'] == highest_earning_country)) * 100,
+        'top_IN_occupation': india_occu['occupation'].value_counts().index[0]
+    }
+
+
+def assert_same(result, expected):
+    for key, value in expected.items():
+        if isinstance(value, pd.Series):
+            assert result[key].to_dict() == value.to_dict(), key
+            assert list(result[key].index) == list(value.index), key
+        else:
+            assert result[key] == value, (key, result[key], value)
+
+
+def replicate(df, n_rows):
+    """The dataset tiled to n_rows; categorical columns stay categorical"""
+    repeats = -(-n_rows // len(df))
+    return pd.DataFrame({
+        column: (pd.Categorical.from_codes(np.tile(df[column].cat.codes.to_numpy(), repeats)[:n_rows],
+                                           df[column].cat.categories)
+                 if isinstance(df[column].dtype, pd.CategoricalDtype)
+                 else np.tile(df[column].to_numpy(), repeats)[:n_rows])
+        for column in df.columns
+    })
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+if __name__ == "__main__":
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000_000
+
+    legacy_load, raw = timed(pd.read_csv, 'adult.data.csv')
+    engine_load, adult = timed(load_adult, 'adult.data.csv', USED_COLUMNS)
+    print(f"Load adult.data.csv: original {legacy_load:.3f}s, categorical {engine_load:.3f}s")
+
+    legacy_time, expected = timed(legacy_statistics, raw)
+    engine_time, result = timed(lambda df: statistics(tabulate(df)), adult)
+    assert_same(result, expected)
+    print(f"{len(adult):>12,} rows  original {legacy_time:7.3f}s  crosstab engine {engine_time:7.3f}s  (identical)")
+
+    big = replicate(adult, n_rows)
+    print(f"\nReplicated to {n_rows:,} rows ({big.memory_usage(deep=True).sum() / 1e9:.2f} GB categorical)")
+    engine_time, result = timed(lambda df: statistics(tabulate(df)), big)
+    print(f"{n_rows:>12,} rows  crosstab engine {engine_time:7.3f}s  ({n_rows / engine_time / 1e6:.1f} M rows/s)")
+
+    # the original needs string columns; only run it where it fits comfortably in memory
+    if n_rows <= 10_000_000:
+        big_raw = raw.iloc[np.arange(n_rows) % len(raw)].reset_index(drop=True)
+        legacy_time, expected = timed(legacy_statistics, big_raw)
+        assert_same(result, expected)
+        print(f"{n_rows:>12,} rows  original        {legacy_time:7.3f}s  (identical)")
@@ -0,0 +1,68 @@
+# bench_demographic_cache.py - CSV parse vs Feather cache (cold conversion, warm memory-mapped load)
+#
+#   python bench_demographic_cache.py                 # adult.data.csv and a 100x replica
+#   python bench_demographic_cache.py --copies 1 300
+#
+# Each load runs in a child process so warm loads are not helped by objects left in this one.
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from bench_demographic_streaming import write_replicated
+from demographic_engine import DATA_PATH, USED_COLUMNS, cache_path, load_adult, statistics, tabulate
+
+
+def child(path, cache):
+    start = time.perf_counter()
+    df = load_adult(path, USED_COLUMNS, cache=cache)
+    loaded = time.perf_counter() - start
+    result = statistics(tabulate(df))
+    summary = {key: (value.to_dict() if hasattr(value, 'to_dict') else value.item() if hasattr(value, 'item') else value)
+               for key, value in result.items()}
+    print(json.dumps({'seconds': loaded, 'result': summary}))
+
+
+def run(path, cache):
+    output = subprocess.run([sys.executable, __file__, '--child', path, str(int(cache))],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == '--child':
+        child(sys.argv[2], bool(int(sys.argv[3])))
+        sys.exit(0)
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--copies', nargs='+', type=int, default=[1, 100], help='replications of adult.data.csv')
+    args = parser.parse_args()
+
+    print(f"{'rows':>12} {'CSV MB':>8} {'cache MB':>9} {'parse s':>8} {'cold s':>8} {'warm s':>8} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for copies in args.copies:
+            path = os.path.join(tmp, f'adult_x{copies}.csv')
+            if copies == 1:
+                with open(DATA_PATH, 'rb') as src, open(path, 'wb') as dst:
+                    dst.write(src.read())
+            else:
+                write_replicated(path, copies)
+
+            parsed = run(path, cache=False)
+            cold = run(path, cache=True)   # no cache yet: parse, convert, write, then map
+            warm = run(path, cache=True)
+            assert parsed['result'] == cold['result'] == warm['result'], "cached load changed the result"
+
+            csv_mb = os.path.getsize(path) / 1e6
+            cache_mb = os.path.getsize(cache_path(path)) / 1e6
+            print(f"{32561 * copies:>12,} {csv_mb:>8.1f} {cache_mb:>9.1f} {parsed['seconds']:>8.3f} "
+                  f"{cold['seconds']:>8.3f} {warm['seconds']:>8.3f} {parsed['seconds'] / warm['seconds']:>7.1f}x")
+
+            # touching the source invalidates the cache: the next load converts again
+            os.utime(path, ns=(time.time_ns(), time.time_ns()))
+            assert not os.path.exists(cache_path(path))
+
+    print("\nParsed, cold and warm loads produced the same result dict")
@@ -0,0 +1,49 @@
+# bench_demographic_parallel.py - Scaling of the byte-range parallel demographic report
+#
+#   python bench_demographic_parallel.py                 # ~3 GB replicated CSV, 1..N cores
+#   python bench_demographic_parallel.py --copies 100 --workers 1 2 4
+import argparse
+import os
+import tempfile
+import time
+
+from bench_demographic_streaming import write_replicated
+from demographic_engine import calculate
+
+
+def same_result(a, b):
+    return all(
+        a[key].to_dict() == b[key].to_dict() if hasattr(a[key], 'to_dict') else a[key] == b[key]
+        for key in a
+    )
+
+
+if __name__ == "__main__":
+    cores = os.cpu_count()
+    default_workers = sorted({1, *[2 ** i for i in range(1, cores.bit_length()) if 2 ** i <= cores], cores})
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--copies', type=int, default=850, help='replications of adult.data.csv (850 = ~3 GB)')
+    parser.add_argument('--workers', nargs='+', type=int, default=default_workers)
+    parser.add_argument('--chunk-rows', type=int, default=500_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'adult_replicated.csv')
+        write_replicated(path, args.copies)
+        rows = 32561 * args.copies
+        print(f"{rows:,} rows, {os.path.getsize(path) / 1e9:.2f} GB CSV, {cores} cores\n")
+        print(f"{'workers':>8} {'seconds':>9} {'M rows/s':>9} {'speedup':>8} {'efficiency':>11}")
+
+        baseline = reference = None
+        for workers in args.workers:
+            start = time.perf_counter()
+            result = calculate(path=path, chunk_rows=args.chunk_rows, workers=workers)
+            elapsed = time.perf_counter() - start
+            if reference is None:
+                baseline, reference = elapsed, result
+            assert same_result(result, reference), f"workers={workers} changed the result"
+            speedup = baseline / elapsed
+            print(f"{workers:>8} {elapsed:>9.2f} {rows / elapsed / 1e6:>9.2f} {speedup:>7.2f}x {speedup / workers:>10.0%}")
+
+    print("\nEvery worker count produced the same result dict")
@@ -0,0 +1,44 @@
+# bench_demographic_query.py - Fused declarative query vs one scan per metric
+#
+#   python bench_demographic_query.py                 # adult.data.csv replicated to 10M rows
+#   python bench_demographic_query.py 50000000
+#
+# ANALYZER_QUERY must reproduce the hard-coded analyzer results exactly.
+import sys
+import time
+
+from bench_demographic import assert_same, replicate
+from demographic_engine import USED_COLUMNS, calculate, load_adult, statistics, tabulate
+from demographic_query import ANALYZER_QUERY, Query, analyzer_statistics
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def separate_scans(df):
+    """Each metric as its own query: one pass over the data per metric"""
+    return {name: Query(**{name: metric}).run(df)[name] for name, metric in ANALYZER_QUERY.metrics.items()}
+
+
+if __name__ == "__main__":
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+
+    assert_same(analyzer_statistics(ANALYZER_QUERY.run()), calculate())
+    assert_same(analyzer_statistics(ANALYZER_QUERY.run(chunk_rows=5_000)), calculate())
+    print(ANALYZER_QUERY.explain())
+    print(f"\n{len(ANALYZER_QUERY.metrics)} metrics, {len(ANALYZER_QUERY.tables)} tables, matches the analyzer\n")
+
+    big = replicate(load_adult(columns=USED_COLUMNS), n_rows)
+    expected_time, expected = timed(lambda df: statistics(tabulate(df)), big)
+    fused_time, results = timed(ANALYZER_QUERY.run, big)
+    separate_time, separate = timed(separate_scans, big)
+    assert_same(analyzer_statistics(results), expected)
+    assert_same(analyzer_statistics(separate), expected)
+
+    print(f"{n_rows:,} rows")
+    print(f"  hard-coded crosstab engine  {expected_time:7.3f}s")
+    print(f"  fused query (1 pass)        {fused_time:7.3f}s")
+    print(f"  one pass per metric         {separate_time:7.3f}s  ({separate_time / fused_time:.1f}x the fused query)")
@@ -0,0 +1,79 @@
+# bench_demographic_streaming.py - Peak memory and time of the chunked demographic report
+#
+#   python bench_demographic_streaming.py                    # ~3 GB replicated CSV
+#   python bench_demographic_streaming.py --copies 100 --chunks 100000 1000000
+#
+# Each run happens in a child process so its peak RSS is its own.
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from demographic_engine import DATA_PATH, calculate
+
+
+def write_replicated(path, copies):
+    """adult.data.csv with its data rows repeated copies times"""
+    with open(DATA_PATH, 'rb') as f:
+        header = f.readline()
+        body = f.read()
+    if not body.endswith(b'\n'):
+        body += b'\n'
+    with open(path, 'wb') as f:
+        f.write(header)
+        for _ in range(copies):
+            f.write(body)
+
+
+def child(path, chunk_rows):
+    start = time.perf_counter()
+    result = calculate(path=path, chunk_rows=chunk_rows or None)
+    elapsed = time.perf_counter() - start
+    peak_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    summary = {key: (value.to_dict() if hasattr(value, 'to_dict') else value.item() if hasattr(value, 'item') else value)
+               for key, value in result.items()}
+    print(json.dumps({'seconds': elapsed, 'peak_mb': peak_kib / 1024, 'result': summary}))
+
+
+def run(path, chunk_rows):
+    output = subprocess.run([sys.executable, __file__, '--child', path, str(chunk_rows)],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == '--child':
+        child(sys.argv[2], int(sys.argv[3]))
+        sys.exit(0)
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--copies', type=int, default=850, help='replications of adult.data.csv (850 = ~3 GB)')
+    parser.add_argument('--chunks', nargs='+', type=int, default=[50_000, 250_000, 1_000_000])
+    parser.add_argument('--in-memory', action='store_true', help='also run the whole-file load for comparison')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'adult_replicated.csv')
+        write_replicated(path, args.copies)
+        rows = 32561 * args.copies
+        print(f"{rows:,} rows, {os.path.getsize(path) / 1e9:.2f} GB CSV\n")
+        print(f"{'chunk rows':>12} {'seconds':>9} {'M rows/s':>9} {'peak MB':>9}")
+
+        reference = None
+        for chunk_rows in sorted(args.chunks) + ([0] if args.in_memory else []):
+            stats = run(path, chunk_rows)
+            if reference is None:
+                reference = stats['result']
+            assert stats['result'] == reference, "chunked results differ"
+            label = f"{chunk_rows:,}" if chunk_rows else 'whole file'
+            print(f"{label:>12} {stats['seconds']:>9.2f} {rows / stats['seconds'] / 1e6:>9.2f} {stats['peak_mb']:>9.0f}")
+
+    # Replication multiplies every count by the same factor, so the ratios and labels match the original file
+    original = calculate()
+    for key in ('average_age_men', 'percentage_bachelors', 'highest_earning_country', 'top_IN_occupation'):
+        assert reference[key] == original[key], key
+    print("\nEvery chunk size produced the same result dict")
@@ -1,73 +1,22 @@
-import pandas as pd
+from demographic_engine import calculate
+
+def calculate_demographic_data(print_data=True, chunk_rows=None, workers=None):
+    # Every statistic comes from one pass of categorical crosstabs (see demographic_engine.py);
+    # with chunk_rows the CSV is streamed in chunks and memory stays bounded by the chunk size,
+    # with workers > 1 byte ranges of the CSV are tabulated in parallel processes
+    result = calculate(chunk_rows=chunk_rows, workers=workers)
+
+    race_count = result['race_count']
+    average_age_men = result['average_age_men']
+    percentage_bachelors = result['percentage_bachelors']
+    higher_education_rich = result['higher_education_rich']
+    lower_education_rich = result['lower_education_rich']
+    min_work_hours = result['min_work_hours']
+    rich_percentage = result['rich_percentage']
+    highest_earning_country = result['highest_earning_country']
+    highest_earning_country_percentage = result['highest_earning_country_percentage']
+    top_IN_occupation = result['top_IN_occupation']
 
-def calculate_demographic_data(print_data=True):
-    # Read data from file
-    df = pd.read_csv('adult.data.csv')
-
-    total_count = len(df)
-
-    # How many of each race are represented in this dataset? This should be a Pandas series with race names as the index labels.
-    race_count = pd.Series(df['race'].value_counts())
-    
-    # What is the average age of men?
-    men_age = df.loc[df['sex'] == 'Male']
-    average_age_men = men_age['age'].mean().round(0)
-    
-    # print('\nAvg age men: ', average_age_men)
-
-    # What is the percentage of people who have a Bachelor's degree?
-    # print(df['education'].value_counts().get('Bachelors', 0))
-    # print((df['education'] == 'Bachelors').sum())
-    bachelor_count = (df['education'] == 'Bachelors').sum() / total_count
-    percentage_bachelors = (bachelor_count * 100).round(2)
-    
-    # print(f'percentage_bacherlors: {percentage_bachelors}%')
-
-    # What percentage of people with advanced education (`Bachelors`, `Masters`, or `Doctorate`) make more than 50K?
-    higher_ed_df = df[(df['salary'] == '>50K') \
-        & ((df['education'] == 'Bachelors') \
-            |  (df['education'] == 'Masters') \
-            |  (df['education'] == 'Doctorate'))]
-
-    # with and without `Bachelors`, `Masters`, or `Doctorate`
-    higher_education = ((len(higher_ed_df) / total_count) * 100)
-     
-    # print(f'higher_education: {higher_education}%') 
-
-     # What percentage of people without advanced education make more than 50K?
-    lower_ed_df = df[(df['salary'] == '>50K') \
-        & ((df['education'] != 'Bachelors') \
-            &  (df['education'] != 'Masters') \
-            &  (df['education'] != 'Doctorate'))] 
-    
-    lower_education = ((len(lower_ed_df) / total_count) * 100)
-
-    # print(f'lower_education: {lower_education}%')
-
-    # percentage with salary >50K
-    higher_education_rich = higher_education
-    lower_education_rich = lower_education
-
-    # What is the minimum number of hours a person works per week (hours-per-week feature)?
-    min_work_hours = df['hours-per-week'].min()
-
-    # What percentage of the people who work the minimum number of hours per week have a salary of >50K?
-    num_min_workers = ((df['hours-per-week'] <= min_work_hours & (df['salary'] == '>50K')).sum() / total_count)
-
-    rich_percentage = num_min_workers
-
-    # What country has the highest percentage of people that earn >50K?
-    highest_countries = df[(df['salary'] == '>50K')]['native-country'].value_counts()
-
-    highest_earning_country = highest_countries.index[0]
-
-    highest_earning_country_percentage = (highest_countries[0] / len(df['native-country'] == highest_earning_country)) * 100
-
-    india_occu = df[(df['native-country'] == 'India') & (df['salary'] == '>50K')]
-
-    # Identify the most popular occupation for those who earn >50K in India.
-    top_IN_occupation = india_occu['occupation'].value_counts().index[0]
-    
     # DO NOT MODIFY BELOW THIS LINE
 
     if print_data:
@@ -96,5 +45,6 @@ def calculate_demographic_data(print_data=True):
         'top_IN_occupation': top_IN_occupation
     }
 
-calculate_demographic_data(0)
+if __name__ == "__main__":
+    calculate_demographic_data()
 
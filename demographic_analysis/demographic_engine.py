@@ -0,0 +1,330 @@
+# demographic_engine.py - Demographic statistics from categorical crosstabs
+#
+# The CSV is loaded with categorical dtypes, so every string column is a small array of integer
+# codes. One blocked pass over those codes fills all the count tables the statistics need
+# (race, sex x age, education x salary, hours x salary, country x salary, country x occupation
+# for >50K earners); every statistic is then read off these small tables, with no filtered
+# copies of the data.
+#
+# The tables are labelled partial aggregates, so tables of separate chunks merge into exactly
+# the tables of the whole file: calculate(chunk_rows=...) streams files larger than memory, and
+# calculate(workers=...) tabulates byte ranges of the file in a process pool and merges them.
+#
+# The parsed CSV is cached as an uncompressed Feather file with categorical (dictionary) columns,
+# keyed by the source's size and mtime, so later loads memory-map it instead of parsing text.
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow.feather as feather
+except ImportError:  # optional: without pyarrow every load parses the CSV
+    feather = None
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'adult.data.csv')
+
+CATEGORICAL_COLUMNS = ['workclass', 'education', 'marital-status', 'occupation', 'relationship',
+                       'race', 'sex', 'native-country', 'salary']
+DTYPES = {
+    'age': 'int16',
+    'fnlwgt': 'int32',
+    'education-num': 'int16',
+    'capital-gain': 'int32',
+    'capital-loss': 'int32',
+    'hours-per-week': 'int16',
+    **{column: 'category' for column in CATEGORICAL_COLUMNS}
+}
+# Columns the statistics read
+USED_COLUMNS = ['age', 'education', 'occupation', 'race', 'sex', 'hours-per-week', 'native-country', 'salary']
+
+RICH = '>50K'
+ADVANCED_EDUCATION = ['Bachelors', 'Masters', 'Doctorate']
+BLOCK_ROWS = 1 << 20
+
+
+def parse_adult(path=DATA_PATH, columns=None):
+    """Parse the CSV with categorical string columns and compact integer columns"""
+    # '?' marks unknown values in this dataset and is kept as its own category
+    return pd.read_csv(path, usecols=columns, dtype=DTYPES, na_filter=False)
+
+
+def cache_path(path):
+    """Cache file for the current version of path: <dir>/.cache/<name>.<size>-<mtime_ns>.feather"""
+    stat = os.stat(path)
+    directory, name = os.path.split(os.path.abspath(path))
+    return os.path.join(directory, '.cache', f'{name}.{stat.st_size}-{stat.st_mtime_ns}.feather')
+
+
+def write_cache(path):
+    """Parse the CSV once and store it as Feather; older versions of the cache are removed"""
+    target = cache_path(path)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    # only finished caches of other versions: never target itself, which a concurrent job may have
+    # just published, nor another job's .tmp file
+    for stale in glob.glob(os.path.join(os.path.dirname(target), f'{os.path.basename(path)}.*.feather')):
+        if stale != target:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+    # uncompressed, so loads can memory-map it; written aside and renamed so readers never see half a file
+    temporary = f'{target}.{os.getpid()}.tmp'
+    feather.write_feather(parse_adult(path), temporary, compression='uncompressed')
+    os.replace(temporary, target)
+    return target
+
+
+def load_adult(path=DATA_PATH, columns=None, cache=True):
+    """
+    adult.data.csv with categorical string columns and compact integer columns.
+    The first load converts the CSV into a Feather cache; later loads of the unchanged file
+    memory-map the cache instead of parsing text. When the cache can't be written or read
+    (read-only directory, file removed meanwhile) the CSV is parsed as without a cache.
+    """
+    if not cache or feather is None:
+        return parse_adult(path, columns)
+    try:
+        target = cache_path(path)
+        if not os.path.exists(target):
+            write_cache(path)
+        table = feather.read_table(target, columns=columns, memory_map=True)
+    except OSError:
+        return parse_adult(path, columns)
+    # split_blocks keeps numeric columns as zero-copy views of the mapped file instead of
+    # copying them into consolidated pandas blocks
+    return table.to_pandas(split_blocks=True)
+
+
+@dataclass
+class DemographicTables:
+    """Count tables with labelled axes, everything the statistics are computed from"""
+    race: pd.Series             # rows per race
+    sex_age: pd.DataFrame       # per sex: rows and sum of ages
+    education_salary: pd.DataFrame
+    hours_salary: pd.DataFrame  # index: hours-per-week value
+    country_salary: pd.DataFrame
+    country_occupation_rich: pd.DataFrame  # >50K earners only
+
+    @property
+    def total(self):
+        return int(self.race.sum())
+
+    def merge(self, other):
+        """Tables of the union of both inputs; labels missing on one side count as zero"""
+        merged = {}
+        for table in fields(self):
+            a, b = getattr(self, table.name), getattr(other, table.name)
+            total = a.add(b, fill_value=0)
+            if isinstance(total, pd.DataFrame):
+                total = total.fillna(0)
+            # alignment widens counts to float; integer sums below 2**53 are exact, so cast back
+            merged[table.name] = total.astype({'count': np.int64}) if table.name == 'sex_age' else total.astype(np.int64)
+        return DemographicTables(**merged)
+
+
+def _codes(column):
+    codes = column.cat.codes.to_numpy()
+    if len(codes) and codes.min() < 0:
+        raise ValueError(f"Column {column.name} has missing values; load it with load_adult()")
+    return codes
+
+
+def _bincount(codes, n, weights=None):
+    return np.bincount(codes, weights, minlength=n)
+
+
+def tabulate(df, block_rows=BLOCK_ROWS):
+    """Fill every count table in one pass over the category codes, a block of rows at a time"""
+    categories = {column: df[column].cat.categories for column in
+                  ('education', 'occupation', 'race', 'sex', 'native-country', 'salary')}
+    codes = {column: _codes(df[column]) for column in categories}
+    sizes = {column: len(values) for column, values in categories.items()}
+    age = df['age'].to_numpy()
+    hours = df['hours-per-week'].to_numpy()
+    n_hours = int(hours.max()) + 1 if len(hours) else 1
+    n_salary = sizes['salary']
+    rich = categories['salary'].get_loc(RICH) if RICH in categories['salary'] else -1
+
+    race = np.zeros(sizes['race'], dtype=np.int64)
+    sex_rows = np.zeros(sizes['sex'], dtype=np.int64)
+    sex_age = np.zeros(sizes['sex'])
+    education_salary = np.zeros(sizes['education'] * n_salary, dtype=np.int64)
+    hours_salary = np.zeros(n_hours * n_salary, dtype=np.int64)
+    country_salary = np.zeros(sizes['native-country'] * n_salary, dtype=np.int64)
+    country_occupation = np.zeros(sizes['native-country'] * sizes['occupation'], dtype=np.int64)
+
+    for start in range(0, len(df), block_rows):
+        block = slice(start, start + block_rows)
+        salary = codes['salary'][block].astype(np.intp)
+        sex = codes['sex'][block]
+        country = codes['native-country'][block].astype(np.intp)
+        education = codes['education'][block].astype(np.intp)
+
+        race += _bincount(codes['race'][block], sizes['race'])
+        sex_rows += _bincount(sex, sizes['sex'])
+        sex_age += _bincount(sex, sizes['sex'], age[block])
+        education_salary += _bincount(education * n_salary + salary, len(education_salary))
+        hours_salary += _bincount(hours[block].astype(np.intp) * n_salary + salary, len(hours_salary))
+        country_salary += _bincount(country * n_salary + salary, len(country_salary))
+        # >50K rows get weight 1, everything else 0: no filtered copy of the block
+        country_occupation += _bincount(country * sizes['occupation'] + codes['occupation'][block],
+                                        len(country_occupation), salary == rich).astype(np.int64)
+
+    salary_labels = pd.Index(categories['salary'], name='salary')
+    return DemographicTables(
+        race=pd.Series(race, index=pd.Index(categories['race'], name='race'), name='count'),
+        sex_age=pd.DataFrame({'count': sex_rows, 'age_sum': sex_age}, index=pd.Index(categories['sex'], name='sex')),
+        education_salary=pd.DataFrame(education_salary.reshape(-1, n_salary),
+                                      index=pd.Index(categories['education'], name='education'), columns=salary_labels),
+        hours_salary=pd.DataFrame(hours_salary.reshape(-1, n_salary),
+                                  index=pd.RangeIndex(n_hours, name='hours-per-week'), columns=salary_labels),
+        country_salary=pd.DataFrame(country_salary.reshape(-1, n_salary),
+                                    index=pd.Index(categories['native-country'], name='native-country'),
+                                    columns=salary_labels),
+        country_occupation_rich=pd.DataFrame(country_occupation.reshape(-1, sizes['occupation']),
+                                             index=pd.Index(categories['native-country'], name='native-country'),
+                                             columns=pd.Index(categories['occupation'], name='occupation'))
+    )
+
+
+def _rich(table):
+    return table[RICH] if RICH in table.columns else pd.Series(0, index=table.index)
+
+
+def statistics(tables):
+    """The analyzer's result dict, computed from the count tables"""
+    total = tables.total
+
+    race_count = tables.race[tables.race > 0].sort_values(ascending=False, kind='stable')
+
+    men = tables.sex_age.loc['Male']
+    average_age_men = np.float64(men['age_sum'] / men['count']).round(0)
+
+    education_rows = tables.education_salary.sum(axis=1)
+    bachelors = np.int64(education_rows.get('Bachelors', 0))
+    percentage_bachelors = ((bachelors / total) * 100).round(2)
+
+    rich_by_education = _rich(tables.education_salary)
+    advanced = rich_by_education.index.isin(ADVANCED_EDUCATION)
+    higher_education_rich = (int(rich_by_education[advanced].sum()) / total) * 100
+    lower_education_rich = (int(rich_by_education[~advanced].sum()) / total) * 100
+
+    hours_rows = tables.hours_salary.sum(axis=1)
+    min_work_hours = np.int64(hours_rows.index[hours_rows.to_numpy() > 0][0])
+
+    # Same rows as the original expression `hours <= min_work_hours & is_rich`, where & binds first:
+    # >50K rows are compared with (min_work_hours & 1), all other rows with 0
+    hours = tables.hours_salary.index.to_numpy()
+    not_rich = tables.hours_salary.drop(columns=[RICH], errors='ignore').sum(axis=1).to_numpy()
+    rich_min_workers = _rich(tables.hours_salary).to_numpy()[hours <= (min_work_hours & 1)].sum()
+    rich_percentage = np.int64(rich_min_workers + not_rich[hours <= 0].sum()) / total
+
+    rich_by_country = _rich(tables.country_salary)
+    highest_earning_country = rich_by_country.idxmax()
+    highest_earning_country_percentage = (np.int64(rich_by_country.max()) / total) * 100
+
+    top_IN_occupation = tables.country_occupation_rich.loc['India'].idxmax()
+
+    return {
+        'race_count': race_count,
+        'average_age_men': average_age_men,
+        'percentage_bachelors': percentage_bachelors,
+        'higher_education_rich': higher_education_rich,
+        'lower_education_rich': lower_education_rich,
+        'min_work_hours': min_work_hours,
+        'rich_percentage': rich_percentage,
+        'highest_earning_country': highest_earning_country,
+        'highest_earning_country_percentage': highest_earning_country_percentage,
+        'top_IN_occupation': top_IN_occupation
+    }
+
+
+def read_chunks(path=DATA_PATH, chunk_rows=1_000_000, columns=USED_COLUMNS):
+    """The CSV as a stream of categorical DataFrames of at most chunk_rows rows, used columns only"""
+    return pd.read_csv(path, usecols=columns, dtype=DTYPES, na_filter=False, chunksize=chunk_rows)
+
+
+def tabulate_stream(chunks, tabulate_chunk=tabulate, merge=DemographicTables.merge):
+    """
+    Merge the count tables of every chunk; memory is bounded by one chunk plus the small tables.
+    tabulate_chunk and merge default to DemographicTables; any partial aggregate that merges exactly works.
+    """
+    return reduce(merge, (tabulate_chunk(chunk) for chunk in chunks))
+
+
+class _ByteRange:
+    """Read-only view of bytes [start, end) of an open file, for read_csv"""
+
+    def __init__(self, f, start, end):
+        f.seek(start)
+        self.f = f
+        self.remaining = end - start
+
+    def read(self, size=-1):
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.f.read(size)
+        self.remaining -= len(data)
+        return data
+
+
+def byte_ranges(path, parts):
+    """Split the data lines of a CSV into about equal byte ranges that start and end on line boundaries"""
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        header = f.readline()
+        first = f.tell()
+        bounds = [first]
+        for i in range(1, parts):
+            target = first + (size - first) * i // parts
+            # the line containing target - 1 ends the previous range
+            f.seek(max(target - 1, first))
+            f.readline()
+            bounds.append(max(f.tell(), bounds[-1]))
+        bounds.append(size)
+    columns = header.decode().strip().split(',')
+    return columns, [(start, end) for start, end in zip(bounds[:-1], bounds[1:]) if end > start]
+
+
+def tabulate_range(path, start, end, columns, chunk_rows=1_000_000, used=USED_COLUMNS,
+                   tabulate_chunk=tabulate, merge=DemographicTables.merge):
+    """Count tables of one byte range of the CSV, streamed in chunks"""
+    with open(path, 'rb') as f:
+        chunks = pd.read_csv(_ByteRange(f, start, end), header=None, names=columns, usecols=used,
+                             dtype=DTYPES, na_filter=False, chunksize=chunk_rows)
+        return tabulate_stream(chunks, tabulate_chunk, merge)
+
+
+def tabulate_parallel(path=DATA_PATH, workers=None, chunk_rows=1_000_000, used=USED_COLUMNS,
+                      tabulate_chunk=tabulate, merge=DemographicTables.merge):
+    """
+    Tabulate byte-range partitions of the CSV in a process pool and merge the partial tables.
+    tabulate_chunk and merge are sent to the workers, so they must be picklable.
+    """
+    workers = workers or os.cpu_count()
+    columns, ranges = byte_ranges(path, workers)
+    if len(ranges) <= 1:
+        return tabulate_stream(read_chunks(path, chunk_rows, used), tabulate_chunk, merge)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        partials = executor.map(tabulate_range, *zip(*[(path, start, end, columns, chunk_rows, used,
+                                                        tabulate_chunk, merge) for start, end in ranges]))
+        return reduce(merge, partials)
+
+
+def calculate(df=None, path=DATA_PATH, chunk_rows=None, workers=None):
+    """
+    Every statistic, from a DataFrame, or from the CSV at path: loaded whole, streamed
+    chunk_rows rows at a time, or split across `workers` processes. All give the same result dict.
+    """
+    if df is not None:
+        return statistics(tabulate(df))
+    if workers and workers > 1:
+        return statistics(tabulate_parallel(path, workers, chunk_rows or 1_000_000))
+    if chunk_rows:
+        return statistics(tabulate_stream(read_chunks(path, chunk_rows)))
+    return statistics(tabulate(load_adult(path, USED_COLUMNS)))
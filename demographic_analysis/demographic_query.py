@@ -0,0 +1,332 @@
+# demographic_query.py - Declarative group-by metrics over the adult dataset
+#
+# Callers list the metrics they want instead of writing one scan per question:
+#
+#   query = Query(
+#       rich_share=Share({'salary': '>50K'}, by='sex'),
+#       mean_age=Mean('age', by=['race', 'sex']),
+#       top_jobs=TopK('occupation', by='native-country', k=3, where={'salary': '>50K'}),
+#   )
+#   results = query.run()                    # or run(df), run(chunk_rows=...), run(workers=...)
+#
+# Every metric reduces to a count (or sum) table keyed by its group and condition columns.
+# The planner drops tables that are marginals of a larger table it already fills, then one
+# blocked pass over the category codes fills all remaining tables at once; each metric is read
+# off its table afterwards. Like DemographicTables, the tables are labelled partial aggregates,
+# so chunks and byte ranges merge exactly.
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from demographic_engine import (ADVANCED_EDUCATION, BLOCK_ROWS, DATA_PATH, DTYPES, RICH, _codes, load_adult,
+                                read_chunks, tabulate_parallel, tabulate_stream)
+
+MAX_CELLS = 1 << 24  # largest dense table a single metric may need
+
+
+def _columns(by):
+    if by is None:
+        return ()
+    return (by,) if isinstance(by, str) else tuple(by)
+
+
+@dataclass(frozen=True)
+class Not:
+    """Condition value: every label except these"""
+    values: tuple
+
+    def __init__(self, values):
+        object.__setattr__(self, 'values', _values(values))
+
+
+def _values(values):
+    return (values,) if isinstance(values, str) or not np.iterable(values) else tuple(values)
+
+
+def _conditions(where):
+    """where dict as a hashable, ordered tuple of (column, values-or-Not)"""
+    return tuple(sorted((column, value if isinstance(value, Not) else _values(value))
+                        for column, value in (where or {}).items()))
+
+
+@dataclass(frozen=True)
+class Table:
+    """A crosstab the scan fills: row counts, or sums of `value`, per combination of keys"""
+    keys: tuple
+    value: str = None
+
+    def __str__(self):
+        what = f"sum({self.value})" if self.value else 'count'
+        return f"{what} by {', '.join(self.keys) or '()'}"
+
+
+class Metric(ABC):
+    """A metric names the tables it needs and computes its result from them"""
+
+    @abstractmethod
+    def tables(self):
+        """The Tables this metric is computed from"""
+
+    @abstractmethod
+    def compute(self, lookup):
+        """The result, given lookup(table) -> that table's filled Series"""
+
+    def _keys(self, *extra):
+        keys = _columns(self.by) + tuple(column for column, _ in self.where) + extra
+        return tuple(dict.fromkeys(keys))
+
+    def _filtered(self, table, *extra):
+        """Table restricted to the where conditions and reduced to the group (+ extra) columns"""
+        if self.where:
+            mask = np.ones(len(table), dtype=bool)
+            for column, values in self.where:
+                level = table.index.get_level_values(column)
+                mask &= ~level.isin(values.values) if isinstance(values, Not) else level.isin(values)
+            table = table[mask]
+        return _marginal(table, _columns(self.by) + extra)
+
+
+class Count(Metric):
+    """Rows per group (a scalar without `by`)"""
+
+    def __init__(self, by=None, where=None):
+        self.by, self.where = by, _conditions(where)
+
+    def tables(self):
+        return [Table(self._keys())]
+
+    def compute(self, lookup):
+        return self._filtered(lookup(Table(self._keys())))
+
+
+class Share(Metric):
+    """Fraction of each group's rows that meet `where` (a scalar without `by`)"""
+
+    def __init__(self, where, by=None):
+        if not where:
+            raise ValueError("Share needs a where condition")
+        self.by, self.where = by, _conditions(where)
+
+    def tables(self):
+        return [Table(self._keys())]
+
+    def compute(self, lookup):
+        table = lookup(Table(self._keys()))
+        rows = _marginal(table, _columns(self.by))
+        matching = self._filtered(table)
+        if isinstance(rows, pd.Series):
+            matching = matching.reindex(rows.index, fill_value=0)
+        return matching / rows
+
+
+class Mean(Metric):
+    """Mean of a numeric column per group, over rows that meet `where`"""
+
+    def __init__(self, column, by=None, where=None):
+        self.column, self.by, self.where = column, by, _conditions(where)
+
+    def tables(self):
+        keys = self._keys()
+        return [Table(keys), Table(keys, self.column)]
+
+    def compute(self, lookup):
+        keys = self._keys()
+        return self._filtered(lookup(Table(keys, self.column))) / self._filtered(lookup(Table(keys)))
+
+
+class TopK(Metric):
+    """
+    The k most frequent values of `column` per group, over rows that meet `where`, with their counts.
+    Ties keep label order; values that never occur are left out; k=None keeps every value.
+    """
+
+    def __init__(self, column, by=None, k=1, where=None):
+        self.column, self.by, self.k, self.where = column, by, k, _conditions(where)
+
+    def tables(self):
+        return [Table(self._keys(self.column))]
+
+    def compute(self, lookup):
+        counts = self._filtered(lookup(Table(self._keys(self.column))), self.column)
+        counts = counts[counts > 0]
+        if not self.by:
+            return counts.sort_values(ascending=False, kind='stable').head(self.k)
+        return counts.groupby(level=list(_columns(self.by)), sort=False, group_keys=False).apply(
+            lambda group: group.sort_values(ascending=False, kind='stable').head(self.k))
+
+
+def _marginal(table, keys):
+    """Sum a table over every key not in keys; a scalar when keys is empty"""
+    if not keys:
+        return table.sum()
+    if list(table.index.names) == list(keys):
+        return table
+    return table.groupby(level=list(keys), sort=False, observed=True).sum()
+
+
+def plan(tables):
+    """
+    The tables to fill: duplicates are merged, and a table whose keys are a subset of a larger
+    table of the same kind is left out and read as that table's marginal.
+    Returns (tables to fill, {needed table: the filled table it is read from}).
+    """
+    unique = sorted(dict.fromkeys(tables), key=lambda table: -len(table.keys))
+    filled, source = [], {}
+    for table in unique:
+        for larger in filled:
+            if larger.value == table.value and set(table.keys) <= set(larger.keys):
+                source[table] = larger
+                break
+        else:
+            filled.append(table)
+            source[table] = table
+    return filled, source
+
+
+def _key_codes(df, column):
+    """Non-negative integer codes of a key column and their labels"""
+    if isinstance(df[column].dtype, pd.CategoricalDtype):
+        return _codes(df[column]), df[column].cat.categories
+    values = df[column].to_numpy()
+    if len(values) and values.min() < 0:
+        raise ValueError(f"Key column {column} has negative values")
+    return values, pd.RangeIndex(int(values.max()) + 1 if len(values) else 1)
+
+
+def scan(df, tables, block_rows=BLOCK_ROWS):
+    """Fill every table in one blocked pass over df; each is a labelled Series over all key combinations"""
+    keys = {column for table in tables for column in table.keys}
+    coded = {column: _key_codes(df, column) for column in keys}
+    values = {table.value: df[table.value].to_numpy() for table in tables if table.value}
+    shapes = {table: [len(coded[column][1]) for column in table.keys] for table in tables}
+    for table, shape in shapes.items():
+        if np.prod(shape, dtype=np.float64) > MAX_CELLS:
+            raise ValueError(f"{table} would have {int(np.prod(shape, dtype=np.float64)):,} cells; "
+                             f"group by fewer or smaller columns")
+    sums = {table: np.zeros(int(np.prod(shapes[table])), dtype=np.float64 if table.value else np.int64)
+            for table in tables}
+
+    for start in range(0, len(df), block_rows):
+        block = slice(start, start + block_rows)
+        codes = {column: coded[column][0][block].astype(np.intp) for column in keys}
+        rows = min(block_rows, len(df) - start)
+        flat = {}  # tables with the same keys share their combined index
+        for table in tables:
+            if table.keys not in flat:
+                index = np.zeros(rows, dtype=np.intp)
+                for column, size in zip(table.keys, shapes[table]):
+                    index = index * size + codes[column]
+                flat[table.keys] = index
+            weights = values[table.value][block].astype(np.float64) if table.value else None
+            counts = np.bincount(flat[table.keys], weights, minlength=len(sums[table]))
+            sums[table] += counts if table.value else counts.astype(np.int64)
+
+    filled = {}
+    for table in tables:
+        if table.keys:
+            index = pd.MultiIndex.from_product([coded[column][1] for column in table.keys], names=table.keys)
+            if len(table.keys) == 1:
+                index = index.get_level_values(0)
+        else:
+            index = pd.RangeIndex(1)
+        filled[table] = pd.Series(sums[table], index=index, name=table.value or 'count')
+    return filled
+
+
+def merge(a, b):
+    """Tables of the union of both inputs; labels missing on one side count as zero"""
+    merged = {}
+    for table in a:
+        total = a[table].add(b[table], fill_value=0)
+        # alignment widens counts to float; integer sums below 2**53 are exact, so cast back
+        merged[table] = total if table.value else total.astype(np.int64)
+    return merged
+
+
+class Query:
+    """A named set of metrics, answered together from a single pass over the data"""
+
+    def __init__(self, **metrics):
+        if not metrics:
+            raise ValueError("Query needs at least one metric")
+        self.metrics = metrics
+        self.tables, self.source = plan([table for metric in metrics.values() for table in metric.tables()])
+
+    @property
+    def columns(self):
+        """Columns the scan reads, in file order"""
+        used = {column for table in self.tables for column in table.keys + ((table.value,) if table.value else ())}
+        return [column for column in DTYPES if column in used] or ['salary']
+
+    def explain(self):
+        """The tables filled by the single pass and the metrics read from each"""
+        lines = [f"1 pass over {', '.join(self.columns)}"]
+        for table in self.tables:
+            readers = [name for name, metric in self.metrics.items()
+                       if any(self.source[needed] == table for needed in metric.tables())]
+            lines.append(f"  {table}: {', '.join(readers)}")
+        return '\n'.join(lines)
+
+    def scan(self, df=None, path=DATA_PATH, chunk_rows=None, workers=None):
+        """The filled tables, from a DataFrame or from the CSV: loaded whole, streamed, or split across workers"""
+        if df is not None:
+            return scan(df, self.tables)
+        # the engine's streaming and process-pool drivers, with this query's scan and merge
+        scan_chunk = partial(scan, tables=self.tables)
+        if workers and workers > 1:
+            return tabulate_parallel(path, workers, chunk_rows or 1_000_000, self.columns, scan_chunk, merge)
+        if chunk_rows:
+            return tabulate_stream(read_chunks(path, chunk_rows, self.columns), scan_chunk, merge)
+        return scan(load_adult(path, self.columns), self.tables)
+
+    def results(self, tables):
+        """Every metric's result from filled tables"""
+        lookup = lambda table: tables[self.source[table]]
+        return {name: metric.compute(lookup) for name, metric in self.metrics.items()}
+
+    def run(self, df=None, path=DATA_PATH, chunk_rows=None, workers=None):
+        return self.results(self.scan(df, path, chunk_rows, workers))
+
+
+# The analyzer's questions as metrics; analyzer_statistics() turns the results into its result dict
+ANALYZER_QUERY = Query(
+    race_count=TopK('race', k=None),
+    mean_age=Mean('age', by='sex'),
+    bachelors=Share({'education': 'Bachelors'}),
+    higher_education_rich=Share({'salary': RICH, 'education': ADVANCED_EDUCATION}),
+    lower_education_rich=Share({'salary': RICH, 'education': Not(ADVANCED_EDUCATION)}),
+    hours_salary=Count(by=['hours-per-week', 'salary']),
+    highest_earning_country=TopK('native-country', where={'salary': RICH}),
+    top_occupation=TopK('occupation', by='native-country', where={'salary': RICH}),
+)
+
+
+def analyzer_statistics(results):
+    """ANALYZER_QUERY results as the dict demographic_engine.statistics() returns"""
+    hours_salary = results['hours_salary'].unstack('salary', fill_value=0)
+    total = int(hours_salary.to_numpy().sum())
+    hours_rows = hours_salary.sum(axis=1)
+    min_work_hours = np.int64(hours_rows.index[hours_rows.to_numpy() > 0].min())
+
+    # the original `hours <= min_work_hours & is_rich`: & binds first (see demographic_engine.statistics)
+    hours = hours_salary.index.to_numpy()
+    rich = hours_salary[RICH].to_numpy() if RICH in hours_salary.columns else np.zeros(len(hours), dtype=np.int64)
+    not_rich = hours_salary.drop(columns=[RICH], errors='ignore').sum(axis=1).to_numpy()
+    rich_percentage = np.int64(rich[hours <= (min_work_hours & 1)].sum() + not_rich[hours <= 0].sum()) / total
+
+    country = results['highest_earning_country']
+    return {
+        'race_count': results['race_count'],
+        'average_age_men': np.float64(results['mean_age']['Male']).round(0),
+        'percentage_bachelors': (results['bachelors'] * 100).round(2),
+        'higher_education_rich': float(results['higher_education_rich']) * 100,
+        'lower_education_rich': float(results['lower_education_rich']) * 100,
+        'min_work_hours': min_work_hours,
+        'rich_percentage': rich_percentage,
+        'highest_earning_country': country.index[0],
+        'highest_earning_country_percentage': (np.int64(country.iloc[0]) / total) * 100,
+        'top_IN_occupation': results['top_occupation'].loc['India'].index[0]
+    }
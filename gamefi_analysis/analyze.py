@@ -1,5 +1,5 @@
 # Quick analysis script for any GameFi token
-def quick_gamefi_analysis(token_symbol: str):
+def quick_gamefi_analysis(token_symbol: str, collector, analyzer, simulator):
     """Perform rapid GameFi token assessment"""
     
     # Collect data
@@ -28,13 +28,21 @@ def quick_gamefi_analysis(token_symbol: str):
     }
 
 # Analyze multiple projects
-projects = ['axie-infinity', 'the-sandbox', 'decentraland', 'gala']
-results = {}
-
-for project in projects:
-    try:
-        results[project] = quick_gamefi_analysis(project)
-    except Exception as e:
-        print(f"Error analyzing {project}: {e}")
-
-
+if __name__ == "__main__":
+    import config
+    from data_collector import GameFiDataCollector
+    from player_economics import create_default_simulator
+    from token_analyzer import GameFiTokenAnalyzer
+    
+    collector = GameFiDataCollector(config)
+    analyzer = GameFiTokenAnalyzer(config.OLLAMA_HOST, config.OLLAMA_MODEL)
+    simulator = create_default_simulator()
+    
+    projects = ['axie-infinity', 'the-sandbox', 'decentraland', 'gala']
+    results = {}
+    
+    for project in projects:
+        try:
+            results[project] = quick_gamefi_analysis(project, collector, analyzer, simulator)
+        except Exception as e:
+            print(f"Error analyzing {project}: {e}")
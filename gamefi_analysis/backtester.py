@@ -0,0 +1,229 @@
+# backtester.py - Historical backtesting of GameFi sustainability signals
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from config import ANALYSIS_TIMEFRAME
+
+# Columns required in the stored history (one row per token per day)
+HISTORY_COLUMNS = [
+    'price', 'volume', 'total_supply', 'circulating_supply', 'treasury_balance',
+    'daily_emissions', 'user_retention_7d', 'user_retention_30d'
+]
+
+# Same thresholds as GameFiMonitoringSystem and GameFiTokenAnalyzer._identify_risk_factors
+DEFAULT_THRESHOLDS = {
+    'treasury_runway_critical': 90,  # days
+    'treasury_runway_warning': 180,  # days
+    'retention_rate_critical': 0.2,  # 20% 7-day retention
+    'sustainability_score_warning': 40,  # out of 100
+    'price_drop_alert': 0.2,  # 20% in 24h
+    'inflation_rate_high': 0.5,  # 50% annual inflation
+    'retention_30d_poor': 0.2  # 20% 30-day retention
+}
+
+SIGNALS = [
+    'treasury_critical', 'treasury_warning', 'sustainability_low', 'retention_critical',
+    'price_drop', 'high_inflation', 'poor_retention', 'any_alert'
+]
+
+
+@dataclass
+class BacktestResult:
+    dates: pd.DatetimeIndex
+    tokens: List[str]
+    scores: np.ndarray  # (days, tokens) sustainability score, NaN before listing
+    signals: Dict[str, np.ndarray]  # signal name -> (days, tokens) bool
+    collapse_day: np.ndarray  # (tokens,) index of first collapse day, -1 if none
+    hit_rates: pd.DataFrame = field(default=None)
+
+    def score_frame(self) -> pd.DataFrame:
+        """Daily sustainability scores as a date x token DataFrame"""
+        return pd.DataFrame(self.scores, index=self.dates, columns=self.tokens)
+
+    def alerts(self) -> pd.DataFrame:
+        """Long-format log of every (date, token, signal) that fired"""
+        frames = []
+        for name, fired in self.signals.items():
+            day_idx, token_idx = np.nonzero(fired)
+            frames.append(pd.DataFrame({
+                'date': self.dates[day_idx],
+                'token': np.asarray(self.tokens, dtype=object)[token_idx],
+                'signal': name
+            }))
+        return pd.concat(frames, ignore_index=True).sort_values(['date', 'token'], kind='stable')
+
+    def collapses(self) -> pd.DataFrame:
+        """Tokens that collapsed during the backtest and when"""
+        collapsed = np.nonzero(self.collapse_day >= 0)[0]
+        return pd.DataFrame({
+            'token': [self.tokens[i] for i in collapsed],
+            'collapse_date': self.dates[self.collapse_day[collapsed]]
+        })
+
+
+class GameFiBacktester:
+    def __init__(self, window: int = ANALYSIS_TIMEFRAME, horizon_days: int = 90,
+                 collapse_drawdown: float = 0.8, thresholds: Optional[Dict] = None):
+        self.window = window
+        self.horizon_days = horizon_days  # how far ahead a signal may predict a collapse
+        self.collapse_drawdown = collapse_drawdown  # drawdown from peak that counts as a collapse
+        self.thresholds = dict(DEFAULT_THRESHOLDS, **(thresholds or {}))
+
+    def load_history(self, path: str) -> pd.DataFrame:
+        """Load stored daily history from Parquet or CSV"""
+        if path.endswith('.parquet'):
+            return pd.read_parquet(path)
+        return pd.read_csv(path, parse_dates=['date'])
+
+    def run(self, history: pd.DataFrame) -> BacktestResult:
+        """
+        Replay history day by day, scoring every token on each day
+        Expects columns: token, date and HISTORY_COLUMNS
+        """
+        missing = [c for c in ['token', 'date'] + HISTORY_COLUMNS if c not in history.columns]
+        if missing:
+            raise ValueError(f"History is missing columns: {missing}")
+
+        dates, tokens, panel = self._to_panel(history)
+        scores, signals = self._replay(panel)
+        collapse_day = self._find_collapses(panel['price'])
+
+        result = BacktestResult(dates, tokens, scores, signals, collapse_day)
+        result.hit_rates = self._evaluate(signals, collapse_day, len(dates))
+        return result
+
+    def _to_panel(self, history: pd.DataFrame):
+        """Pivot long history into (days, tokens) float arrays, forward-filling gaps"""
+        history = history.assign(date=pd.to_datetime(history['date']).dt.normalize())
+        wide = history.pivot_table(index='date', columns='token', values=HISTORY_COLUMNS, aggfunc='last')
+        wide = wide.asfreq('D').ffill()
+
+        tokens = list(wide['price'].columns)
+        panel = {col: wide[col].reindex(columns=tokens).to_numpy(dtype=np.float64) for col in HISTORY_COLUMNS}
+        return wide.index, tokens, panel
+
+    def _replay(self, panel: Dict[str, np.ndarray]):
+        """Step through days, updating sliding-window price stats incrementally"""
+        prices = panel['price']
+        n_days, n_tokens = prices.shape
+        window = self.window
+        th = self.thresholds
+
+        scores = np.full((n_days, n_tokens), np.nan)
+        signals = {name: np.zeros((n_days, n_tokens), dtype=bool) for name in SIGNALS}
+
+        # Sliding-window Welford state per token
+        count = np.zeros(n_tokens)
+        mean = np.zeros(n_tokens)
+        m2 = np.zeros(n_tokens)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for day in range(n_days):
+                x_new = prices[day]
+
+                # Drop the price leaving the window
+                if day >= window:
+                    x_old = prices[day - window]
+                    drop = ~np.isnan(x_old)
+                    n_after = count - drop
+                    delta = np.where(drop, x_old - mean, 0.0)
+                    mean = np.where(drop & (n_after > 0), mean - delta / n_after, np.where(n_after > 0, mean, 0.0))
+                    m2 = np.where(drop & (n_after > 0), m2 - delta * (x_old - mean), np.where(n_after > 0, m2, 0.0))
+                    count = n_after
+
+                # Add today's price
+                add = ~np.isnan(x_new)
+                count = count + add
+                delta = np.where(add, x_new - mean, 0.0)
+                mean = np.where(add, mean + delta / np.maximum(count, 1), mean)
+                m2 = np.where(add, m2 + delta * (x_new - mean), m2)
+
+                listed = add & (count > 0)
+                if not listed.any():
+                    continue
+
+                # Same components as GameFiTokenAnalyzer._calculate_sustainability_score
+                supply_ratio = panel['circulating_supply'][day] / panel['total_supply'][day]
+                supply_score = np.minimum(25, (1 - supply_ratio) * 50)
+
+                retention_7d = panel['user_retention_7d'][day]
+                retention_30d = panel['user_retention_30d'][day]
+                retention_score = (retention_7d + retention_30d) * 50
+
+                emissions = panel['daily_emissions'][day]
+                daily_cost = emissions * x_new
+                runway_days = np.where(daily_cost > 0, panel['treasury_balance'][day] * x_new / daily_cost, 365)
+                treasury_score = np.minimum(25, (runway_days / 365) * 25)
+
+                std = np.sqrt(np.maximum(m2, 0) / (count - 1))  # sample std, as pandas
+                volatility = std / mean
+                stability_score = np.maximum(0, 25 - volatility * 100)
+
+                total = supply_score + retention_score + treasury_score + stability_score
+                day_scores = np.clip(total, 0, 100)
+                scores[day] = np.where(listed, day_scores, np.nan)
+
+                # Alert conditions from GameFiMonitoringSystem.check_alert_conditions
+                critical = runway_days < th['treasury_runway_critical']
+                fired = {
+                    'treasury_critical': critical,
+                    'treasury_warning': ~critical & (runway_days < th['treasury_runway_warning']),
+                    'sustainability_low': day_scores < th['sustainability_score_warning'],
+                    'retention_critical': retention_7d < th['retention_rate_critical'],
+                    'high_inflation': (emissions * 365) / panel['circulating_supply'][day] > th['inflation_rate_high'],
+                    'poor_retention': retention_30d < th['retention_30d_poor']
+                }
+                if day > 0:
+                    fired['price_drop'] = (x_new / prices[day - 1] - 1) < -th['price_drop_alert']
+
+                any_alert = np.zeros(n_tokens, dtype=bool)
+                for name, mask in fired.items():
+                    mask = mask & listed
+                    signals[name][day] = mask
+                    any_alert |= mask
+                signals['any_alert'][day] = any_alert
+
+        return scores, signals
+
+    def _find_collapses(self, prices: np.ndarray) -> np.ndarray:
+        """First day each token's price fell collapse_drawdown below its running peak"""
+        peak = np.fmax.accumulate(np.nan_to_num(prices, nan=0.0), axis=0)
+        collapsed = prices < peak * (1 - self.collapse_drawdown)
+        first = collapsed.argmax(axis=0)
+        return np.where(collapsed.any(axis=0), first, -1)
+
+    def _evaluate(self, signals: Dict[str, np.ndarray], collapse_day: np.ndarray, n_days: int) -> pd.DataFrame:
+        """Hit rate, precision and lead time of each signal against collapses"""
+        horizon = self.horizon_days
+        days = np.arange(n_days)[:, None]
+        collapsed = collapse_day >= 0
+
+        # Only days before a token's first collapse count as predictions
+        active = ~collapsed[None, :] | (days < collapse_day[None, :])
+        # Day is "positive" if the token collapses within the horizon
+        positive = collapsed[None, :] & (days >= collapse_day[None, :] - horizon) & active
+
+        rows = []
+        for name, fired in signals.items():
+            fired = fired & active
+            alert_days = int(fired.sum())
+            true_alerts = int((fired & positive).sum())
+
+            # A collapse is caught if the signal fired in the horizon before it
+            caught = (fired & positive).any(axis=0) & collapsed
+            leads = []
+            for token in np.nonzero(caught)[0]:
+                first = np.argmax(fired[:, token] & positive[:, token])
+                leads.append(collapse_day[token] - first)
+
+            rows.append({
+                'signal': name,
+                'alert_days': alert_days,
+                'precision': true_alerts / alert_days if alert_days else np.nan,
+                'hit_rate': caught.sum() / collapsed.sum() if collapsed.any() else np.nan,
+                'false_alarm_tokens': int((fired.any(axis=0) & ~collapsed).sum()),
+                'median_lead_days': float(np.median(leads)) if leads else np.nan
+            })
+
+        return pd.DataFrame(rows).set_index('signal')
@@ -0,0 +1,48 @@
+# bench_market_data.py - Price history parsing on a 500k-point market_chart payload
+import json
+import time
+import numpy as np
+import pandas as pd
+from market_data import parse_market_chart
+
+N_POINTS = 500000
+
+
+def build_payload(n_points: int = N_POINTS) -> bytes:
+    """Minute-granularity market_chart response as raw JSON bytes"""
+    rng = np.random.default_rng(0)
+    timestamps = 1_600_000_000_000 + np.arange(n_points, dtype=np.int64) * 60_000
+    prices = np.exp(np.cumsum(rng.normal(0, 0.001, n_points)))
+    volumes = rng.exponential(1e6, n_points)
+    return json.dumps({
+        'prices': [[int(t), float(p)] for t, p in zip(timestamps, prices)],
+        'total_volumes': [[int(t), float(v)] for t, v in zip(timestamps, volumes)]
+    }).encode()
+
+
+def legacy_parse(raw: bytes) -> pd.DataFrame:
+    """Previous per-element implementation of _get_price_history"""
+    data = json.loads(raw)
+    return pd.DataFrame({
+        'timestamp': [pd.to_datetime(item[0], unit='ms') for item in data['prices']],
+        'price': [item[1] for item in data['prices']],
+        'volume': [item[1] for item in data['total_volumes']]
+    })
+
+
+def timed(label: str, func, raw: bytes):
+    start = time.perf_counter()
+    result = func(raw)
+    print(f"{label:<10} {time.perf_counter() - start:>7.3f}s")
+    return result
+
+
+if __name__ == "__main__":
+    raw = build_payload()
+    print(f"Payload: {N_POINTS:,} points, {len(raw) / 1e6:.1f} MB")
+
+    legacy = timed("legacy", legacy_parse, raw)
+    fast = timed("vectorized", parse_market_chart, raw)
+
+    pd.testing.assert_frame_equal(legacy, fast, check_dtype=False)
+    print("Outputs match")
@@ -0,0 +1,40 @@
+# bench_metrics_provider.py - Lookup latency for 10k tokens across providers
+import os
+import tempfile
+import time
+from metrics_provider import CachedMetricsProvider, MockMetricsProvider, SQLiteMetricsProvider
+
+N_TOKENS = 10000
+
+
+def build_fixture(db_path: str, n_tokens: int = N_TOKENS) -> SQLiteMetricsProvider:
+    """Fill a SQLite fixture with the mock values for n_tokens tokens"""
+    provider = SQLiteMetricsProvider(db_path)
+    tokens = [f'token-{i}' for i in range(n_tokens)]
+    mock = MockMetricsProvider()
+    provider.write_supply_metrics(mock.get_supply_metrics_batch(tokens))
+    provider.write_gaming_metrics(mock.get_gaming_metrics_batch(tokens))
+    return provider
+
+
+def timed(label: str, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<36} {elapsed * 1000:>9.1f} ms  ({elapsed / N_TOKENS * 1e6:.2f} us/token)")
+    return result
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        sqlite_provider = build_fixture(os.path.join(tmp, 'metrics.db'))
+        tokens = [f'token-{i}' for i in range(N_TOKENS)]
+        cached = CachedMetricsProvider(sqlite_provider, refresh_interval=900)
+
+        timed("sqlite, one query per token", lambda: [sqlite_provider.get_supply_metrics(t) for t in tokens])
+        timed("sqlite, batched", lambda: sqlite_provider.get_supply_metrics_batch(tokens))
+        timed("cached, cold (batched refresh)", lambda: cached.get_supply_metrics_batch(tokens))
+        timed("cached, warm batch", lambda: cached.get_supply_metrics_batch(tokens))
+        result = timed("cached, warm per-token", lambda: [cached.get_supply_metrics(t) for t in tokens])
+
+        assert result[0] == MockMetricsProvider.SUPPLY_METRICS
@@ -0,0 +1,87 @@
+# bench_response_parser.py - Parser benchmark over recorded LLM responses
+import json
+import time
+from response_parser import consume_stream, parse_response
+
+CORPUS_PATH = 'recorded_responses.jsonl'
+CHUNK_SIZE = 8  # characters per simulated stream chunk
+REPEATS = 2000
+
+
+def load_corpus(path: str = CORPUS_PATH):
+    """Load recorded responses, one JSON record per line"""
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def stream_chunks(text: str, size: int = CHUNK_SIZE):
+    """Simulate a token stream by slicing the text into small chunks"""
+    for i in range(0, len(text), size):
+        yield text[i:i + size]
+
+
+def legacy_parse(response_text: str) -> dict:
+    """The paragraph parser token_analyzer used before structured output, kept verbatim as the baseline"""
+    sections = response_text.split('\n\n')
+
+    parsed_response = {
+        'overall_assessment': '',
+        'sustainability_outlook': '',
+        'key_strengths': [],
+        'key_weaknesses': [],
+        'recommendations': [],
+        'raw_analysis': response_text
+    }
+
+    for section in sections:
+        if 'sustainability' in section.lower():
+            parsed_response['sustainability_outlook'] = section
+        elif 'strength' in section.lower():
+            parsed_response['key_strengths'] = legacy_bullet_points(section)
+        elif 'weakness' in section.lower() or 'risk' in section.lower():
+            parsed_response['key_weaknesses'] = legacy_bullet_points(section)
+        elif 'recommend' in section.lower():
+            parsed_response['recommendations'] = legacy_bullet_points(section)
+
+    return parsed_response
+
+
+def legacy_bullet_points(text: str) -> list:
+    """The old bullet extraction: fixed prefixes, first two characters dropped"""
+    bullet_points = []
+    for line in text.split('\n'):
+        line = line.strip()
+        if line.startswith(('-', '•', '*', '1.', '2.', '3.', '4.', '5.')):
+            bullet_points.append(line[2:].strip())
+    return bullet_points
+
+
+def fields_recovered(parsed: dict) -> int:
+    """Count non-empty analysis fields, including the 1-5 rating"""
+    keys = ['overall_assessment', 'sustainability_outlook', 'sustainability_rating',
+            'key_strengths', 'key_weaknesses', 'recommendations', 'monitoring_metrics']
+    return sum(1 for key in keys if parsed.get(key) not in (None, '', []))
+
+
+def run_benchmark():
+    corpus = load_corpus()
+    print(f"{'response':<28} {'mode':<11} {'fields':>6} {'legacy':>6} {'read':>6} {'us/parse':>9}")
+
+    for record in corpus:
+        text = record['text']
+
+        start = time.perf_counter()
+        for _ in range(REPEATS):
+            raw, data = consume_stream(stream_chunks(text))
+            parsed = parse_response(raw, data)
+        elapsed_us = (time.perf_counter() - start) / REPEATS * 1e6
+
+        legacy = legacy_parse(text)
+        read_pct = len(raw) / len(text) * 100
+
+        print(f"{record['name']:<28} {parsed['parse_mode']:<11} {fields_recovered(parsed):>6} "
+              f"{fields_recovered(legacy):>6} {read_pct:>5.0f}% {elapsed_us:>9.1f}")
+
+
+if __name__ == "__main__":
+    run_benchmark()
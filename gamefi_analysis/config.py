@@ -15,5 +15,9 @@ ANALYSIS_TIMEFRAME = 30  # Days
 MIN_DAILY_VOLUME = 10000  # USD
 MIN_MARKET_CAP = 1000000  # USD
 
+# Supply/gaming metrics source (SQLite fixture file, or mock data when unset)
+METRICS_DB_PATH = os.getenv('GAMEFI_METRICS_DB')
+METRICS_REFRESH_INTERVAL = 900  # seconds between metric refreshes per token
+
 
 
@@ -3,12 +3,22 @@ import requests
 import pandas as pd
 from datetime import datetime, timedelta
 import time
+from typing import Dict, List
+from market_data import parse_market_chart
+from metrics_provider import CachedMetricsProvider, MetricsProvider, MockMetricsProvider
 
 class GameFiDataCollector:
-    def __init__(self, config):
+    def __init__(self, config, metrics_provider: MetricsProvider = None, refresh_interval: float = None):
         self.config = config
         self.session = requests.Session()
         
+        # Supply/gaming metrics are cached so frequent callers don't refetch them
+        if refresh_interval is None:
+            refresh_interval = config.METRICS_REFRESH_INTERVAL
+        self.metrics_provider = CachedMetricsProvider(
+            metrics_provider or MockMetricsProvider(), refresh_interval
+        )
+        
     def fetch_token_metrics(self, token_address, days=30):
         """
         Fetch comprehensive token metrics for GameFi analysis
@@ -41,47 +51,39 @@ class GameFiDataCollector:
         
         response = self.session.get(url, params=params)
         if response.status_code == 200:
-            data = response.json()
-            
-            # Convert to pandas DataFrame for easier analysis
-            df = pd.DataFrame({
-                'timestamp': [pd.to_datetime(item[0], unit='ms') for item in data['prices']],
-                'price': [item[1] for item in data['prices']],
-                'volume': [item[1] for item in data['total_volumes']]
-            })
-            
-            return df
+            # Decode the raw bytes and build the DataFrame with vectorized conversions
+            return parse_market_chart(response.content)
         
         return None
     
-    def _get_supply_metrics(self, token_address):
-        """Fetch token supply and distribution metrics"""
-        # This would connect to blockchain APIs or smart contract calls
-        # For demonstration, we'll use mock data structure
+    def fetch_metrics_batch(self, token_addresses: List[str]) -> Dict[str, Dict]:
+        """
+        Fetch supply and gaming metrics for many tokens in one provider round-trip
+        Returns: Dictionary of token -> {'supply_metrics', 'gaming_metrics'}
+        """
+        supply = self.metrics_provider.get_supply_metrics_batch(token_addresses)
+        gaming = self.metrics_provider.get_gaming_metrics_batch(token_addresses)
+        
         return {
-            'total_supply': 1000000000,
-            'circulating_supply': 350000000,
-            'burned_tokens': 50000000,
-            'staked_tokens': 200000000,
-            'treasury_balance': 400000000,
-            'daily_emissions': 1000000
+            token: {
+                'supply_metrics': supply.get(token),
+                'gaming_metrics': gaming.get(token)
+            }
+            for token in token_addresses
         }
     
+    def _get_supply_metrics(self, token_address):
+        """Fetch token supply and distribution metrics"""
+        return self.metrics_provider.get_supply_metrics(token_address)
+    
     def _get_gaming_metrics(self, token_address):
         """Fetch gaming-specific metrics"""
-        # This would integrate with gaming platform APIs
-        return {
-            'daily_active_users': 15000,
-            'monthly_active_users': 75000,
-            'average_session_time': 45,  # minutes
-            'tokens_earned_per_hour': 50,
-            'new_user_acquisition': 500,  # daily
-            'user_retention_7d': 0.35,
-            'user_retention_30d': 0.15
-        }
+        return self.metrics_provider.get_gaming_metrics(token_address)
 
 # Usage example
-collector = GameFiDataCollector(config)
-token_data = collector.fetch_token_metrics('axie-infinity')
+if __name__ == "__main__":
+    import config
+    collector = GameFiDataCollector(config)
+    token_data = collector.fetch_token_metrics('axie-infinity')
 
 
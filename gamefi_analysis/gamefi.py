@@ -0,0 +1,270 @@
+# gamefi.py - Command line entry point for batch GameFi analysis
+#
+#   python gamefi.py collect  --token-file tokens.txt --workers 8 --output-dir data/
+#   python gamefi.py analyze  axie-infinity the-sandbox
+#   python gamefi.py simulate --token-price 0.15 --treasury 50000000
+#   python gamefi.py report   --token-file tokens.txt --output-dir reports/
+#   python gamefi.py monitor  --token-file tokens.txt [--schedule]
+#
+# Heavy modules (pandas, matplotlib, ollama) are imported inside the
+# subcommand that needs them, so `--help` and `simulate` start quickly.
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, List
+
+import config
+
+
+class StageTimer:
+    """Accumulates wall time per pipeline stage across worker threads"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.totals = {}
+        self.counts = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.totals[name] = self.totals.get(name, 0.0) + elapsed
+                self.counts[name] = self.counts.get(name, 0) + 1
+
+    def report(self, wall_time: float):
+        """Print per-stage timings to stderr"""
+        print(f"\n{'stage':<10} {'calls':>6} {'total s':>9} {'mean s':>9}", file=sys.stderr)
+        for name, total in self.totals.items():
+            count = self.counts[name]
+            print(f"{name:<10} {count:>6} {total:>9.3f} {total / count:>9.3f}", file=sys.stderr)
+        print(f"{'wall':<10} {'':>6} {wall_time:>9.3f}", file=sys.stderr)
+
+
+class TimedProxy:
+    """Wraps an object so every method call is timed under one stage name"""
+
+    def __init__(self, target, timer: StageTimer, stage: str):
+        self._target = target
+        self._timer = timer
+        self._stage = stage
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return attr
+
+        def timed(*args, **kwargs):
+            with self._timer.stage(self._stage):
+                return attr(*args, **kwargs)
+
+        return timed
+
+
+def read_tokens(args) -> List[str]:
+    """Tokens from the command line plus the token list file (one per line, # comments)"""
+    tokens = list(args.tokens)
+    if args.token_file:
+        with open(args.token_file) as f:
+            for line in f:
+                token = line.split('#', 1)[0].strip()
+                if token:
+                    tokens.append(token)
+    if not tokens:
+        raise SystemExit("No tokens given: pass token ids or --token-file")
+    return list(dict.fromkeys(tokens))
+
+
+def run_batch(tokens: List[str], work, workers: int) -> Dict:
+    """Run work(token) over all tokens on a thread pool, printing failures"""
+
+    def safe_work(token):
+        try:
+            return work(token)
+        except Exception as e:
+            print(f"Error processing {token}: {e}", file=sys.stderr)
+            return None
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        return dict(zip(tokens, executor.map(safe_work, tokens)))
+
+
+def build_collector(args, timer: StageTimer):
+    with timer.stage('import'):
+        from data_collector import GameFiDataCollector
+        from metrics_provider import SQLiteMetricsProvider
+
+    provider = SQLiteMetricsProvider(args.metrics_db) if args.metrics_db else None
+    collector = GameFiDataCollector(config, provider, config.METRICS_REFRESH_INTERVAL)
+    return TimedProxy(collector, timer, 'collect')
+
+
+def build_analyzer(args, timer: StageTimer):
+    with timer.stage('import'):
+        from token_analyzer import GameFiTokenAnalyzer
+
+    analyzer = GameFiTokenAnalyzer(args.ollama_host, args.model)
+    return TimedProxy(analyzer, timer, 'analyze')
+
+
+def build_simulator(args, timer: StageTimer):
+    with timer.stage('import'):
+        from player_economics import create_default_simulator
+
+    with timer.stage('setup'):
+        simulator = create_default_simulator(args.token_price, args.earning_rate)
+    return TimedProxy(simulator, timer, 'simulate')
+
+
+def cmd_collect(args, timer: StageTimer):
+    collector = build_collector(args, timer)
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    def work(token):
+        token_data = collector.fetch_token_metrics(token, days=args.days)
+        price_data = token_data['price_history']
+        if price_data is None:
+            return f"{token}: no price data"
+
+        if args.output_dir:
+            with timer.stage('write'):
+                price_data.to_csv(os.path.join(args.output_dir, f'{token}_prices.csv'), index=False)
+        return f"{token}: {len(price_data)} price points, last price ${price_data['price'].iloc[-1]:.4f}"
+
+    for line in run_batch(read_tokens(args), work, args.workers).values():
+        if line:
+            print(line)
+
+
+def cmd_analyze(args, timer: StageTimer):
+    collector = build_collector(args, timer)
+    analyzer = build_analyzer(args, timer)
+    simulator = build_simulator(args, timer)
+    with timer.stage('import'):
+        from analyze import quick_gamefi_analysis
+
+    run_batch(
+        read_tokens(args),
+        lambda token: quick_gamefi_analysis(token, collector, analyzer, simulator),
+        args.workers
+    )
+
+
+def cmd_simulate(args, timer: StageTimer):
+    simulator = build_simulator(args, timer)
+
+    results = simulator.simulate_earnings_distribution(args.days)
+    sustainability = simulator.analyze_economic_sustainability(args.treasury, results)
+
+    print(f"Treasury runway: {sustainability['treasury_runway_days']:.0f} days")
+    print(f"Daily cost: ${sustainability['daily_emission_cost_usd']:,.2f}")
+    print(f"Status: {sustainability['sustainability_status']}")
+
+
+def cmd_report(args, timer: StageTimer):
+    collector = build_collector(args, timer)
+    analyzer = build_analyzer(args, timer)
+    simulator = build_simulator(args, timer)
+    with timer.stage('import'):
+        from report_generator import GameFiReportGenerator
+
+    generator = GameFiReportGenerator(analyzer, simulator)
+    output_dir = args.output_dir or '.'
+    os.makedirs(output_dir, exist_ok=True)
+
+    def work(token):
+        token_data = collector.fetch_token_metrics(token, days=args.days)
+        output_path = os.path.join(output_dir, f'{token}_report.md')
+        with timer.stage('report'):
+            generator.generate_full_report(token_data, output_path)
+        return output_path
+
+    for token, path in run_batch(read_tokens(args), work, args.workers).items():
+        if path:
+            print(f"{token}: {path}")
+
+
+def cmd_monitor(args, timer: StageTimer):
+    collector = build_collector(args, timer)
+    analyzer = build_analyzer(args, timer)
+    with timer.stage('import'):
+        from monitoring_system import GameFiMonitoringSystem
+
+    tokens = read_tokens(args)
+    monitor = GameFiMonitoringSystem({'monitored_projects': tokens}, collector, analyzer)
+    if args.schedule:
+        monitor.setup_monitoring_schedule()
+        return
+
+    # One health check pass, projects checked in parallel
+    alerts = []
+    for project_alerts in run_batch(tokens, monitor.check_project, args.workers).values():
+        alerts.extend(project_alerts or [])
+    if alerts:
+        monitor.send_alert_notification(alerts)
+    monitor.log_daily_status(alerts)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='gamefi', description='GameFi token analysis batch runner')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    batch = argparse.ArgumentParser(add_help=False)
+    batch.add_argument('tokens', nargs='*', help='token ids, e.g. axie-infinity')
+    batch.add_argument('--token-file', help='file with one token id per line')
+    batch.add_argument('--workers', type=int, default=4, help='tokens processed in parallel')
+    batch.add_argument('--days', type=int, default=config.ANALYSIS_TIMEFRAME, help='days of price history')
+    batch.add_argument('--metrics-db', default=config.METRICS_DB_PATH, help='SQLite metrics fixture')
+
+    llm = argparse.ArgumentParser(add_help=False)
+    llm.add_argument('--ollama-host', default=config.OLLAMA_HOST)
+    llm.add_argument('--model', default=config.OLLAMA_MODEL)
+
+    economics = argparse.ArgumentParser(add_help=False)
+    economics.add_argument('--token-price', type=float, default=0.15)
+    economics.add_argument('--earning-rate', type=float, default=25, help='tokens per hour')
+
+    collect = subparsers.add_parser('collect', parents=[batch], help='fetch price and token metrics')
+    collect.add_argument('--output-dir', help='write <token>_prices.csv files here')
+    collect.set_defaults(func=cmd_collect)
+
+    analyze = subparsers.add_parser('analyze', parents=[batch, llm, economics], help='quick AI + economics assessment')
+    analyze.set_defaults(func=cmd_analyze)
+
+    simulate = subparsers.add_parser('simulate', parents=[economics], help='play-to-earn economics simulation')
+    simulate.add_argument('--days', type=int, default=30)
+    simulate.add_argument('--treasury', type=float, default=50000000, help='treasury balance in tokens')
+    simulate.set_defaults(func=cmd_simulate)
+
+    report = subparsers.add_parser('report', parents=[batch, llm, economics], help='full markdown reports')
+    report.add_argument('--output-dir', help='directory for <token>_report.md files')
+    report.set_defaults(func=cmd_report)
+
+    monitor = subparsers.add_parser('monitor', parents=[batch, llm], help='check alert conditions')
+    monitor.add_argument('--schedule', action='store_true', help='keep running on the monitoring schedule')
+    monitor.set_defaults(func=cmd_monitor)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    timer = StageTimer()
+
+    start = time.perf_counter()
+    try:
+        args.func(args, timer)
+    finally:
+        timer.report(time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# market_data.py - Fast parsing of CoinGecko market_chart payloads
+import itertools
+import json
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:  # optional fast decoder
+    orjson = None
+
+_END = object()
+
+
+def decode_json(raw):
+    """Decode a JSON payload with orjson when installed, else the stdlib"""
+    if isinstance(raw, (dict, list)):
+        return raw
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _series_array(points) -> np.ndarray:
+    """Convert [[timestamp_ms, value], ...] to an (n, 2) float64 array in one shot"""
+    if not points:
+        return np.empty((0, 2))
+    try:
+        # Flat iteration avoids numpy inspecting every nested list
+        flat = itertools.chain.from_iterable(points)
+        array = np.fromiter(flat, dtype=np.float64, count=2 * len(points))
+        if next(flat, _END) is not _END:
+            raise ValueError("ragged pairs")
+        return array.reshape(-1, 2)
+    except (TypeError, ValueError):
+        # Nulls or ragged pairs: let numpy convert (None becomes NaN) and validate the shape
+        array = np.asarray(points, dtype=np.float64)
+    if array.ndim != 2 or array.shape[1] != 2:
+        raise ValueError(f"Expected [[timestamp, value], ...] pairs, got shape {array.shape}")
+    return array
+
+
+def parse_market_chart(raw) -> pd.DataFrame:
+    """
+    Build the price history DataFrame from a market_chart response
+    Volumes are aligned to prices by timestamp (NaN where a volume is missing)
+    Returns: DataFrame with timestamp, price and volume columns
+    """
+    data = decode_json(raw)
+    prices = _series_array(data.get('prices'))
+    volumes = _series_array(data.get('total_volumes'))
+
+    price_ts = prices[:, 0].astype(np.int64)
+    volume_ts = volumes[:, 0].astype(np.int64)
+
+    # Last volume wins for duplicated timestamps, then look up each price timestamp
+    keep = ~pd.Index(volume_ts[::-1]).duplicated()
+    volume_index = pd.Index(volume_ts[::-1][keep])
+    volume_values = volumes[::-1, 1][keep]
+
+    aligned = np.full(len(price_ts), np.nan)
+    positions = volume_index.get_indexer(price_ts)
+    found = positions >= 0
+    aligned[found] = volume_values[positions[found]]
+
+    return pd.DataFrame({
+        'timestamp': pd.to_datetime(price_ts, unit='ms'),
+        'price': prices[:, 1],
+        'volume': aligned
+    })
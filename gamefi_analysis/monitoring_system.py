@@ -2,12 +2,15 @@
 import schedule
 import time
 import smtplib
-from email.mime.text import MimeText
+from email.mime.text import MIMEText
 from datetime import datetime, timedelta
+from typing import Dict, List
 
 class GameFiMonitoringSystem:
-    def __init__(self, config):
+    def __init__(self, config, collector, analyzer):
         self.config = config
+        self.collector = collector
+        self.analyzer = analyzer
         self.alert_thresholds = {
             'treasury_runway_critical': 90,  # days
             'treasury_runway_warning': 180,  # days
@@ -42,22 +45,7 @@ class GameFiMonitoringSystem:
         alerts = []
         
         for project in projects_to_monitor:
-            try:
-                # Collect latest data
-                token_data = collector.fetch_token_metrics(project)
-                analysis = analyzer.analyze_token_sustainability(token_data)
-                
-                # Check alert conditions
-                project_alerts = self.check_alert_conditions(project, analysis, token_data)
-                alerts.extend(project_alerts)
-                
-            except Exception as e:
-                alerts.append({
-                    'project': project,
-                    'type': 'data_error',
-                    'message': f"Failed to analyze {project}: {e}",
-                    'severity': 'medium'
-                })
+            alerts.extend(self.check_project(project))
         
         # Send alerts if any critical issues found
         if alerts:
@@ -65,6 +53,57 @@ class GameFiMonitoringSystem:
         
         # Log daily status
         self.log_daily_status(alerts)
+        
+        return alerts
+    
+    def check_project(self, project: str) -> List[Dict]:
+        """Collect, analyze and check alert conditions for one project"""
+        
+        try:
+            # Collect latest data
+            token_data = self.collector.fetch_token_metrics(project)
+            analysis = self.analyzer.analyze_token_sustainability(token_data)
+            
+            # Check alert conditions
+            return self.check_alert_conditions(project, analysis, token_data)
+            
+        except Exception as e:
+            return [{
+                'project': project,
+                'type': 'data_error',
+                'message': f"Failed to analyze {project}: {e}",
+                'severity': 'medium'
+            }]
+    
+    def daily_summary_report(self):
+        """Print a one-line status per monitored project"""
+        
+        for project in self.config.get('monitored_projects', []):
+            try:
+                token_data = self.collector.fetch_token_metrics(project)
+                runway_days = self.calculate_treasury_runway(token_data)
+                print(f"{project}: treasury runway {runway_days:.0f} days")
+            except Exception as e:
+                print(f"Summary error for {project}: {e}")
+    
+    def weekly_analysis(self):
+        """Weekly deep analysis (full health check across all projects)"""
+        return self.daily_health_check()
+    
+    def calculate_treasury_runway(self, token_data: Dict) -> float:
+        """Days the treasury can fund current emissions"""
+        
+        supply_data = token_data['supply_metrics']
+        if supply_data['daily_emissions'] <= 0:
+            return float('inf')
+        return supply_data['treasury_balance'] / supply_data['daily_emissions']
+    
+    def log_daily_status(self, alerts: List[Dict]):
+        """Log a summary of today's alerts"""
+        
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        projects = self.config.get('monitored_projects', [])
+        print(f"[{timestamp}] Checked {len(projects)} projects, {len(alerts)} alerts")
     
     def check_alert_conditions(self, project: str, analysis: Dict, token_data: Dict) -> List[Dict]:
         """Check various alert conditions for a project"""
@@ -126,7 +165,7 @@ class GameFiMonitoringSystem:
             for project in projects:
                 try:
                     # Get 24-hour price data
-                    price_data = collector.fetch_token_metrics(project, days=1)
+                    price_data = self.collector.fetch_token_metrics(project, days=1)
                     
                     if price_data and len(price_data['price_history']) >= 2:
                         current_price = price_data['price_history']['price'].iloc[-1]
@@ -141,6 +180,16 @@ class GameFiMonitoringSystem:
                 except Exception as e:
                     print(f"Price monitoring error for {project}: {e}")
     
+    def send_price_alert(self, project: str, price: float, change: float, direction: str):
+        """Send an urgent alert for a large 24h price move"""
+        
+        self.send_email_alert([{
+            'project': project,
+            'type': 'price_movement',
+            'message': f"Price {direction} {abs(change)*100:.1f}% in 24h to ${price:.4f}",
+            'severity': 'high'
+        }], urgent=True)
+    
     def send_alert_notification(self, alerts: List[Dict]):
         """Send alert notifications via email/webhook"""
         
@@ -182,9 +231,14 @@ This is an automated alert from your GameFi monitoring system.
 Review the full dashboard for detailed analysis and recommendations.
 """
         
+        # Print instead of emailing when SMTP is not configured
+        if not self.config.get('smtp_server'):
+            print(subject + body)
+            return
+        
         # Send email (configure with your SMTP settings)
         try:
-            msg = MimeText(body)
+            msg = MIMEText(body)
             msg['Subject'] = subject
             msg['From'] = self.config['email_from']
             msg['To'] = self.config['email_to']
@@ -202,17 +256,22 @@ Review the full dashboard for detailed analysis and recommendations.
             print(f"Failed to send email alert: {e}")
 
 # Setup monitoring
-monitoring_config = {
-    'monitored_projects': ['axie-infinity', 'the-sandbox', 'decentraland'],
-    'email_from': 'gamefi-monitor@yours.com',
-    'email_to': 'alerts@yourdomain.com',
-    'smtp_server': 'smtp.gmail.com',
-    'smtp_port': 587,
-    'email_username': 'your-email@gmail.com',
-    'email_password': 'your-app-password'
-}
-
-monitor = GameFiMonitoringSystem(monitoring_config)
-# monitor.setup_monitoring_schedule()  # Uncomment to start monitoring
-
-
+if __name__ == "__main__":
+    import config
+    from data_collector import GameFiDataCollector
+    from token_analyzer import GameFiTokenAnalyzer
+    
+    monitoring_config = {
+        'monitored_projects': ['axie-infinity', 'the-sandbox', 'decentraland'],
+        'email_from': 'gamefi-monitor@yours.com',
+        'email_to': 'alerts@yourdomain.com',
+        'smtp_server': 'smtp.gmail.com',
+        'smtp_port': 587,
+        'email_username': 'your-email@gmail.com',
+        'email_password': 'your-app-password'
+    }
+    
+    collector = GameFiDataCollector(config)
+    analyzer = GameFiTokenAnalyzer(config.OLLAMA_HOST, config.OLLAMA_MODEL)
+    monitor = GameFiMonitoringSystem(monitoring_config, collector, analyzer)
+    # monitor.setup_monitoring_schedule()  # Uncomment to start monitoring
@@ -1,8 +1,7 @@
 # player_economics.py - Play-to-earn economics modeling
 import numpy as np
-import matplotlib.pyplot as plt
 from dataclasses import dataclass
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
 @dataclass
 class PlayerProfile:
@@ -128,25 +127,30 @@ class PlayToEarnSimulator:
         
         return recommendations
 
-# Example usage with different player types
-simulator = PlayToEarnSimulator(token_price=0.15, base_earning_rate=25)
-
-# Add different player cohorts
-casual_players = PlayerProfile(skill_level=0.3, time_investment=1.5, risk_tolerance=0.4, retention_probability=0.6)
-simulator.add_player_cohort(casual_players, 5000)
-
-hardcore_players = PlayerProfile(skill_level=0.8, time_investment=6.0, risk_tolerance=0.7, retention_probability=0.85)
-simulator.add_player_cohort(hardcore_players, 1000)
-
-intermediate_players = PlayerProfile(skill_level=0.5, time_investment=3.0, risk_tolerance=0.5, retention_probability=0.7)
-simulator.add_player_cohort(intermediate_players, 3000)
-
-# Run simulation
-results = simulator.simulate_earnings_distribution(30)
-sustainability = simulator.analyze_economic_sustainability(50000000, results)
-
-print(f"Treasury runway: {sustainability['treasury_runway_days']:.0f} days")
-print(f"Daily cost: ${sustainability['daily_emission_cost_usd']:,.2f}")
-print(f"Status: {sustainability['sustainability_status']}")
-
+def create_default_simulator(token_price: float = 0.15, base_earning_rate: float = 25) -> PlayToEarnSimulator:
+    """Simulator populated with casual, hardcore and intermediate player cohorts"""
+    simulator = PlayToEarnSimulator(token_price=token_price, base_earning_rate=base_earning_rate)
+    
+    # Add different player cohorts
+    casual_players = PlayerProfile(skill_level=0.3, time_investment=1.5, risk_tolerance=0.4, retention_probability=0.6)
+    simulator.add_player_cohort(casual_players, 5000)
+    
+    hardcore_players = PlayerProfile(skill_level=0.8, time_investment=6.0, risk_tolerance=0.7, retention_probability=0.85)
+    simulator.add_player_cohort(hardcore_players, 1000)
+    
+    intermediate_players = PlayerProfile(skill_level=0.5, time_investment=3.0, risk_tolerance=0.5, retention_probability=0.7)
+    simulator.add_player_cohort(intermediate_players, 3000)
+    
+    return simulator
 
+# Example usage with different player types
+if __name__ == "__main__":
+    simulator = create_default_simulator(token_price=0.15, base_earning_rate=25)
+    
+    # Run simulation
+    results = simulator.simulate_earnings_distribution(30)
+    sustainability = simulator.analyze_economic_sustainability(50000000, results)
+    
+    print(f"Treasury runway: {sustainability['treasury_runway_days']:.0f} days")
+    print(f"Daily cost: ${sustainability['daily_emission_cost_usd']:,.2f}")
+    print(f"Status: {sustainability['sustainability_status']}")
@@ -3,6 +3,7 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime
 import pandas as pd
+from typing import Dict, List
 
 class GameFiReportGenerator:
     def __init__(self, analyzer, simulator):
@@ -278,8 +279,16 @@ financial professionals before making investment decisions.
         return full_report
 
 # Generate comprehensive report
-report_generator = GameFiReportGenerator(analyzer, simulator)
-full_report = report_generator.generate_full_report(token_data, 'gamefi_analysis_report.md')
-print("Report generated successfully!")
+if __name__ == "__main__":
+    import config
+    from data_collector import GameFiDataCollector
+    from player_economics import create_default_simulator
+    from token_analyzer import GameFiTokenAnalyzer
+    
+    token_data = GameFiDataCollector(config).fetch_token_metrics('axie-infinity')
+    analyzer = GameFiTokenAnalyzer(config.OLLAMA_HOST, config.OLLAMA_MODEL)
+    report_generator = GameFiReportGenerator(analyzer, create_default_simulator())
+    full_report = report_generator.generate_full_report(token_data, 'gamefi_analysis_report.md')
+    print("Report generated successfully!")
 
 
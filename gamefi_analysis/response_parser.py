@@ -0,0 +1,234 @@
+# response_parser.py - Structured and heuristic parsing of LLM analyses
+import json
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# JSON schema sent to Ollama via the `format` parameter
+ANALYSIS_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'overall_assessment': {'type': 'string'},
+        'sustainability_outlook': {'type': 'string'},
+        'sustainability_rating': {'type': 'integer', 'minimum': 1, 'maximum': 5},
+        'key_strengths': {'type': 'array', 'items': {'type': 'string'}},
+        'key_weaknesses': {'type': 'array', 'items': {'type': 'string'}},
+        'recommendations': {'type': 'array', 'items': {'type': 'string'}},
+        'monitoring_metrics': {'type': 'array', 'items': {'type': 'string'}}
+    },
+    'required': [
+        'overall_assessment', 'sustainability_outlook', 'sustainability_rating',
+        'key_strengths', 'key_weaknesses', 'recommendations'
+    ]
+}
+
+BULLET_PATTERN = re.compile(r'^\s*(?:[-•*]|\d+[.)])\s+(.*\S)')
+RATING_PATTERN = re.compile(r'\b([1-5])(?:\.\d+)?\s*(?:/|out of)\s*5\b', re.IGNORECASE)
+
+
+class JSONStreamValidator:
+    """Incrementally check that a streamed response is a single JSON object"""
+
+    PENDING = 'pending'
+    COMPLETE = 'complete'
+    INVALID = 'invalid'
+
+    def __init__(self):
+        self.buffer = []
+        self.state = self.PENDING
+        self._prefix = ''
+        self._started = False
+        self._stack = []
+        self._in_string = False
+        self._escaped = False
+        self._start = None
+        self._end = None
+        self._consumed = 0
+
+    def feed(self, chunk: str) -> str:
+        """Consume the next chunk and return the validator state"""
+        if self.state != self.PENDING:
+            return self.state
+
+        self.buffer.append(chunk)
+        offset = self._consumed
+        self._consumed += len(chunk)
+        for position, char in enumerate(chunk, offset):
+            if not self._started:
+                if char == '{':
+                    self._started = True
+                    self._stack.append('}')
+                    self._start = position
+                    continue
+                self._prefix += char
+                # Allow whitespace and a markdown code fence before the object
+                if self._prefix.strip() not in ('', '`', '``', '```', '```j', '```js',
+                                                '```jso', '```json'):
+                    self.state = self.INVALID
+                    return self.state
+                continue
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in '{[':
+                self._stack.append('}' if char == '{' else ']')
+            elif char in '}]':
+                if not self._stack or self._stack.pop() != char:
+                    self.state = self.INVALID
+                    return self.state
+                if not self._stack:
+                    self._end = position + 1
+                    self.state = self.COMPLETE
+                    return self.state
+
+        return self.state
+
+    @property
+    def json_text(self) -> str:
+        """Text of the JSON object seen so far"""
+        if self._start is None:
+            return ''
+        return self.raw_text[self._start:self._end]
+
+    @property
+    def raw_text(self) -> str:
+        """Everything fed to the validator"""
+        return ''.join(self.buffer)
+
+
+def consume_stream(chunks: Iterable[str]) -> Tuple[str, Optional[Dict]]:
+    """
+    Read streamed chunks, stopping as soon as a complete JSON object arrives
+    Returns: (raw_text, decoded object or None)
+    """
+    validator = JSONStreamValidator()
+    chunks = iter(chunks)
+
+    for chunk in chunks:
+        state = validator.feed(chunk)
+        if state == JSONStreamValidator.COMPLETE:
+            try:
+                return validator.raw_text, json.loads(validator.json_text)
+            except ValueError:
+                return validator.raw_text, None
+        if state == JSONStreamValidator.INVALID:
+            break
+
+    # Not JSON (or truncated) - keep the full text for the heuristic parser
+    remaining = ''.join(chunks)
+    return validator.raw_text + remaining, None
+
+
+def validate_structured_response(data) -> Optional[Dict]:
+    """Check decoded JSON against ANALYSIS_SCHEMA, returning a normalized dict"""
+    if not isinstance(data, dict):
+        return None
+
+    properties = ANALYSIS_SCHEMA['properties']
+    for key in ANALYSIS_SCHEMA['required']:
+        if key not in data:
+            return None
+
+    result = {}
+    for key, spec in properties.items():
+        if key not in data:
+            result[key] = [] if spec['type'] == 'array' else None
+            continue
+        value = data[key]
+        if spec['type'] == 'string':
+            if not isinstance(value, str):
+                return None
+            result[key] = value.strip()
+        elif spec['type'] == 'array':
+            if not isinstance(value, list):
+                return None
+            result[key] = [str(item).strip() for item in value if str(item).strip()]
+        elif spec['type'] == 'integer':
+            try:
+                rating = int(round(float(value)))
+            except (TypeError, ValueError):
+                return None
+            if not spec['minimum'] <= rating <= spec['maximum']:
+                return None
+            result[key] = rating
+
+    return result
+
+
+def parse_structured_response(response_text: str, data: Optional[Dict] = None) -> Optional[Dict]:
+    """Parse a JSON-mode response; returns None if it does not match the schema"""
+    if data is None:
+        _, data = consume_stream([response_text])
+    validated = validate_structured_response(data)
+    if validated is None:
+        return None
+
+    validated['raw_analysis'] = response_text
+    validated['parse_mode'] = 'structured'
+    return validated
+
+
+def extract_bullet_points(text: str) -> List[str]:
+    """Extract bullet points (-, •, * or any 'N.'/'N)' numbering) from text"""
+    bullet_points = []
+
+    for line in text.split('\n'):
+        match = BULLET_PATTERN.match(line)
+        if match:
+            bullet_points.append(match.group(1).strip())
+
+    return bullet_points
+
+
+def extract_rating(text: str) -> Optional[int]:
+    """Find a '4/5' or '4 out of 5' style rating in free text"""
+    match = RATING_PATTERN.search(text)
+    return int(match.group(1)) if match else None
+
+
+def parse_heuristic_response(response_text: str) -> Dict:
+    """Parse free-form AI response by keyword-matching paragraph sections"""
+
+    sections = response_text.split('\n\n')
+
+    parsed_response = {
+        'overall_assessment': '',
+        'sustainability_outlook': '',
+        'sustainability_rating': extract_rating(response_text),
+        'key_strengths': [],
+        'key_weaknesses': [],
+        'recommendations': [],
+        'monitoring_metrics': [],
+        'raw_analysis': response_text,
+        'parse_mode': 'heuristic'
+    }
+
+    # Extract structured information from AI response
+    for section in sections:
+        lowered = section.lower()
+        if 'sustainability' in lowered:
+            parsed_response['sustainability_outlook'] = section
+        elif 'strength' in lowered:
+            parsed_response['key_strengths'] = extract_bullet_points(section)
+        elif 'weakness' in lowered or 'risk' in lowered:
+            parsed_response['key_weaknesses'] = extract_bullet_points(section)
+        elif 'monitor' in lowered:
+            parsed_response['monitoring_metrics'] = extract_bullet_points(section)
+        elif 'recommend' in lowered:
+            parsed_response['recommendations'] = extract_bullet_points(section)
+
+    return parsed_response
+
+
+def parse_response(response_text: str, data: Optional[Dict] = None) -> Dict:
+    """Try structured parsing first, then fall back to the paragraph heuristics"""
+    structured = parse_structured_response(response_text, data)
+    if structured is not None:
+        return structured
+    return parse_heuristic_response(response_text)
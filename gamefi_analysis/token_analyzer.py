@@ -1,12 +1,17 @@
 # token_analyzer.py - AI-powered GameFi token analysis
 import ollama
 import json
+from contextlib import closing
 from typing import Dict, List
+from response_parser import (
+    ANALYSIS_SCHEMA, consume_stream, extract_bullet_points, parse_heuristic_response, parse_response
+)
 
 class GameFiTokenAnalyzer:
-    def __init__(self, ollama_host, model_name):
+    def __init__(self, ollama_host, model_name, structured_output: bool = True):
         self.client = ollama.Client(host=ollama_host)
         self.model = model_name
+        self.structured_output = structured_output
         
     def analyze_token_sustainability(self, token_data: Dict) -> Dict:
         """
@@ -17,17 +22,18 @@ class GameFiTokenAnalyzer:
         # Prepare data for AI analysis
         analysis_prompt = self._create_analysis_prompt(token_data)
         
-        # Get AI analysis
-        response = self.client.chat(
-            model=self.model,
-            messages=[{
-                'role': 'user',
-                'content': analysis_prompt
-            }]
-        )
-        
-        # Parse and structure the response
-        analysis_result = self._parse_ai_response(response['message']['content'])
+        # Get AI analysis and parse it into structured data
+        if self.structured_output:
+            analysis_result = self._get_structured_analysis(analysis_prompt)
+        else:
+            response = self.client.chat(
+                model=self.model,
+                messages=[{
+                    'role': 'user',
+                    'content': analysis_prompt
+                }]
+            )
+            analysis_result = self._parse_ai_response(response['message']['content'])
         
         # Add quantitative scoring
         analysis_result['sustainability_score'] = self._calculate_sustainability_score(token_data)
@@ -74,50 +80,57 @@ class GameFiTokenAnalyzer:
         6. Recommended monitoring metrics
         7. Risk mitigation suggestions
 
-        Format response as structured analysis with clear sections.
+        {self._format_instructions()}
         """
         
         return prompt
     
+    def _format_instructions(self) -> str:
+        """Output format part of the prompt"""
+        
+        if not self.structured_output:
+            return "Format response as structured analysis with clear sections."
+        
+        return (
+            "Respond ONLY with a JSON object matching this schema, no other text:\n"
+            f"        {json.dumps(ANALYSIS_SCHEMA)}\n"
+            "        Use sustainability_rating for the 1-5 outlook score and put each "
+            "strength, weakness, recommendation and monitoring metric in its own list item."
+        )
+    
+    def _get_structured_analysis(self, analysis_prompt: str) -> Dict:
+        """
+        Stream a JSON-mode analysis, validating it as chunks arrive
+        Falls back to the paragraph heuristics if the model does not return valid JSON
+        """
+        
+        stream = self.client.chat(
+            model=self.model,
+            messages=[{
+                'role': 'user',
+                'content': analysis_prompt
+            }],
+            format=ANALYSIS_SCHEMA,
+            stream=True
+        )
+        
+        # Stop reading as soon as the JSON object is closed; closing the stream
+        # then drops the rest of the response instead of leaving the connection open
+        with closing(stream):
+            chunks = (chunk['message']['content'] for chunk in stream)
+            response_text, data = consume_stream(chunks)
+        
+        return parse_response(response_text, data)
+    
     def _parse_ai_response(self, response_text: str) -> Dict:
         """Parse AI response into structured data"""
         
-        # This is a simplified parser - in production, you'd want more robust parsing
-        sections = response_text.split('\n\n')
-        
-        parsed_response = {
-            'overall_assessment': '',
-            'sustainability_outlook': '',
-            'key_strengths': [],
-            'key_weaknesses': [],
-            'recommendations': [],
-            'raw_analysis': response_text
-        }
-        
-        # Extract structured information from AI response
-        for section in sections:
-            if 'sustainability' in section.lower():
-                parsed_response['sustainability_outlook'] = section
-            elif 'strength' in section.lower():
-                parsed_response['key_strengths'] = self._extract_bullet_points(section)
-            elif 'weakness' in section.lower() or 'risk' in section.lower():
-                parsed_response['key_weaknesses'] = self._extract_bullet_points(section)
-            elif 'recommend' in section.lower():
-                parsed_response['recommendations'] = self._extract_bullet_points(section)
-        
-        return parsed_response
+        # Free-form responses only go through the paragraph heuristics
+        return parse_heuristic_response(response_text)
     
     def _extract_bullet_points(self, text: str) -> List[str]:
         """Extract bullet points from text"""
-        lines = text.split('\n')
-        bullet_points = []
-        
-        for line in lines:
-            line = line.strip()
-            if line.startswith(('-', '•', '*', '1.', '2.', '3.', '4.', '5.')):
-                bullet_points.append(line[2:].strip())
-        
-        return bullet_points
+        return extract_bullet_points(text)
     
     def _calculate_sustainability_score(self, token_data: Dict) -> float:
         """Calculate quantitative sustainability score (0-100)"""
@@ -186,7 +199,11 @@ class GameFiTokenAnalyzer:
         return risks
 
 # Usage example
-analyzer = GameFiTokenAnalyzer(OLLAMA_HOST, OLLAMA_MODEL)
-analysis_result = analyzer.analyze_token_sustainability(token_data)
+if __name__ == "__main__":
+    import config
+    from data_collector import GameFiDataCollector
+    token_data = GameFiDataCollector(config).fetch_token_metrics('axie-infinity')
+    analyzer = GameFiTokenAnalyzer(config.OLLAMA_HOST, config.OLLAMA_MODEL)
+    analysis_result = analyzer.analyze_token_sustainability(token_data)
 
 
@@ -0,0 +1,38 @@
+# bench_mean_var_std.py - calculate() per matrix vs calculate_batch() over N matrices
+#
+#   python bench_mean_var_std.py              # N = 10M 3x3 matrices
+#   python bench_mean_var_std.py 1000000
+import sys
+import time
+
+import numpy as np
+
+from mean_var_std import STATISTICS, batch_item, calculate, calculate_batch
+
+LOOP_SAMPLE = 100_000  # calculate() is timed on a sample and extrapolated to N
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    readings = np.random.default_rng(42).normal(20, 5, size=(n, 9))
+
+    sample = min(n, LOOP_SAMPLE)
+    start = time.perf_counter()
+    expected = [calculate(row) for row in readings[:sample]]
+    loop_time = (time.perf_counter() - start) * n / sample
+
+    start = time.perf_counter()
+    result = calculate_batch(readings)
+    batch_time = time.perf_counter() - start
+
+    for i in range(0, sample, max(1, sample // 1000)):
+        item = batch_item(result, i)
+        for stat in STATISTICS:
+            for got, want in zip(item[stat], expected[i][stat]):
+                assert np.allclose(got, want, rtol=1e-12, atol=1e-12), (stat, i)
+
+    print(f"{n:,} matrices ({readings.nbytes / 1e9:.2f} GB float64)")
+    print(f"  calculate() loop   {loop_time:9.2f}s  {n / loop_time / 1e6:8.3f} M matrices/s"
+          f"  (extrapolated from {sample:,})")
+    print(f"  calculate_batch()  {batch_time:9.2f}s  {n / batch_time / 1e6:8.3f} M matrices/s"
+          f"  ({loop_time / batch_time:.0f}x, same values)")
@@ -0,0 +1,90 @@
+# bench_running_stats.py - RunningStats against NumPy on large random matrices
+#
+#   python bench_running_stats.py                        # 20M x 8, offset 1e6, 4 workers
+#   python bench_running_stats.py --rows 1000000 --columns 50 --chunk-rows 10000
+#
+# The data is generated chunk by chunk from a seed, so workers can rebuild their share
+# without it ever being held whole, and NumPy then checks the same matrix in memory.
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+
+import numpy as np
+
+from mean_var_std import STATISTICS
+from running_stats import RunningStats
+
+
+def chunk(seed, index, rows, columns, offset):
+    rng = np.random.default_rng([seed, index])
+    # a large offset with a small spread is where naive sum-of-squares variance breaks down
+    return offset + rng.normal(0, 1, size=(rows, columns)) * rng.uniform(0.1, 10, size=columns)
+
+
+def accumulate(indices, args):
+    stats = RunningStats(keep_rows=args.keep_rows)
+    for index in indices:
+        stats.update(chunk(args.seed, index, args.chunk_rows, args.columns, args.offset))
+    return stats
+
+
+def max_relative_error(got, want):
+    got, want = np.asarray(got, dtype=np.float64), np.asarray(want, dtype=np.float64)
+    return float(np.max(np.abs(got - want) / np.maximum(np.abs(want), np.finfo(np.float64).tiny)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=20_000_000)
+    parser.add_argument('--columns', type=int, default=8)
+    parser.add_argument('--chunk-rows', type=int, default=250_000)
+    parser.add_argument('--offset', type=float, default=1e6)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--keep-rows', action='store_true', help='also check per-row results')
+    args = parser.parse_args()
+
+    n_chunks = args.rows // args.chunk_rows
+    print(f"{n_chunks * args.chunk_rows:,} x {args.columns} in {n_chunks} chunks, offset {args.offset:g}\n")
+
+    start = time.perf_counter()
+    streamed = accumulate(range(n_chunks), args)
+    stream_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    shares = [range(worker, n_chunks, args.workers) for worker in range(args.workers)]
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        partials = list(executor.map(accumulate, shares, [args] * args.workers))
+    merged = reduce(RunningStats.merge, partials, RunningStats(keep_rows=args.keep_rows))
+    parallel_time = time.perf_counter() - start
+
+    matrix = np.concatenate([chunk(args.seed, index, args.chunk_rows, args.columns, args.offset)
+                             for index in range(n_chunks)])
+    start = time.perf_counter()
+    axes = [0, 1, None] if args.keep_rows else [0, None]
+    expected = {axis: {'mean': matrix.mean(axis=axis), 'variance': matrix.var(axis=axis),
+                       'standard deviation': matrix.std(axis=axis), 'max': matrix.max(axis=axis),
+                       'min': matrix.min(axis=axis), 'sum': matrix.sum(axis=axis)} for axis in axes}
+    numpy_time = time.perf_counter() - start
+
+    print(f"{'axis':>5} {'statistic':<20} {'streamed':>10} {'merged':>10}   max relative error vs NumPy")
+    worst = 0.0
+    for axis in axes:
+        for stat in STATISTICS:
+            want = expected[axis][stat]
+            if axis == 1 and args.keep_rows:
+                # merged workers saw interleaved chunks, so their rows come out in worker order
+                order = np.concatenate([np.arange(i * args.chunk_rows, (i + 1) * args.chunk_rows)
+                                        for share in shares for i in share])
+                errors = (max_relative_error(streamed.result(axis)[stat], want),
+                          max_relative_error(merged.result(axis)[stat], want[order]))
+            else:
+                errors = (max_relative_error(streamed.result(axis)[stat], want),
+                          max_relative_error(merged.result(axis)[stat], want))
+            worst = max(worst, *errors)
+            print(f"{str(axis):>5} {stat:<20} {errors[0]:>10.2e} {errors[1]:>10.2e}")
+
+    assert worst < 1e-9, f"relative error {worst:.2e}"
+    print(f"\nstreamed {stream_time:.2f}s, {args.workers} merged workers {parallel_time:.2f}s, "
+          f"NumPy on the whole matrix {numpy_time:.2f}s ({matrix.nbytes / 1e9:.2f} GB)")
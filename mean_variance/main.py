@@ -1,5 +1,5 @@
 import numpy as np
-from mean_var_std import calculate
+from mean_var_std import batch_item, calculate, calculate_batch
 
 # Example usage
 if __name__ == "__main__":
@@ -8,3 +8,9 @@ if __name__ == "__main__":
     result = calculate(my_list)
     
     print("\nResult:\n", result)
+
+    # Many matrices at once: arrays per statistic, batch_item() gives calculate()'s format
+    readings = np.arange(27).reshape(3, 3, 3)
+    batch = calculate_batch(readings)
+    print("\nBatch means of whole matrices:", batch['mean'][2])
+    print("Second matrix:\n", batch_item(batch, 1))
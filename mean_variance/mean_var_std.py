@@ -29,3 +29,82 @@ def calculate(list_input):
     
     return calculations
     
+
+STATISTICS = ['mean', 'variance', 'standard deviation', 'max', 'min', 'sum']
+BLOCK_ITEMS = 1 << 15
+
+
+def calculate_batch(batch, block_items=BLOCK_ITEMS):
+    """
+    The statistics of calculate() for N matrices at once. batch is an (N, 9) or (N, 3, 3) array.
+    Each statistic maps to [per column (N, 3), per row (N, 3), whole matrix (N,)] arrays.
+    Works through the batch in blocks, so the temporaries stay small and in cache.
+    """
+    batch = np.asarray(batch)
+    if batch.ndim == 2 and batch.shape[1] == 9:
+        batch = batch.reshape(-1, 3, 3)
+    if batch.ndim != 3 or batch.shape[1:] != (3, 3):
+        raise ValueError("Batch must have shape (N, 9) or (N, 3, 3).")
+
+    n = len(batch)
+    dtypes = {'mean': np.float64, 'variance': np.float64, 'standard deviation': np.float64,
+              'max': batch.dtype, 'min': batch.dtype, 'sum': np.zeros(0, batch.dtype).sum().dtype}
+    # per column (N, 3), per row (N, 3), whole matrix (N,)
+    result = {stat: [np.empty((n, 3), dtype), np.empty((n, 3), dtype), np.empty(n, dtype)]
+              for stat, dtype in dtypes.items()}
+    # Axes of length 3 are unrolled into elementwise ufunc calls on whole blocks: numpy's axis
+    # reductions are slow on such short axes
+    for start in range(0, n, block_items):
+        block = batch[start:start + block_items]
+        items = slice(start, start + len(block))
+        values = block.astype(np.float64)
+        along_columns = [block[:, i, :] for i in range(3)]  # each (B, 3): one row of every matrix
+        along_rows = [block[:, :, i] for i in range(3)]
+
+        columns, rows, whole = (out[items] for out in result['sum'])
+        addends = block.astype(columns.dtype, copy=False)  # bool + bool would be logical or
+        np.add(addends[:, 0, :], addends[:, 1, :], out=columns)
+        columns += addends[:, 2, :]
+        np.add(addends[:, :, 0], addends[:, :, 1], out=rows)
+        rows += addends[:, :, 2]
+        np.add(columns[:, 0], columns[:, 1], out=whole)
+        whole += columns[:, 2]
+
+        # each mean is computed once and shared by the variance and the standard deviation
+        column_mean, row_mean, mean = (out[items] for out in result['mean'])
+        np.divide(columns, 3, out=column_mean)
+        np.divide(rows, 3, out=row_mean)
+        np.divide(whole, 9, out=mean)
+        column_var, row_var, var = (out[items] for out in result['variance'])
+        squares = np.subtract(values, column_mean[:, None, :])
+        squares **= 2
+        np.add(squares[:, 0, :], squares[:, 1, :], out=column_var)
+        column_var += squares[:, 2, :]
+        column_var /= 3
+        np.subtract(values, row_mean[:, :, None], out=squares)
+        squares **= 2
+        np.add(squares[:, :, 0], squares[:, :, 1], out=row_var)
+        row_var += squares[:, :, 2]
+        row_var /= 3
+        np.subtract(values, mean[:, None, None], out=squares)
+        squares **= 2
+        np.sum(squares.reshape(-1, 9), axis=1, out=var)
+        var /= 9
+        for out, variance in zip(result['standard deviation'], (column_var, row_var, var)):
+            np.sqrt(variance, out=out[items])
+
+        for stat, pick in (('max', np.maximum), ('min', np.minimum)):
+            columns, rows, whole = (out[items] for out in result[stat])
+            pick(pick(along_columns[0], along_columns[1]), along_columns[2], out=columns)
+            pick(pick(along_rows[0], along_rows[1]), along_rows[2], out=rows)
+            pick(pick(columns[:, 0], columns[:, 1]), columns[:, 2], out=whole)
+
+    return result
+
+
+def batch_item(result, i):
+    """Item i of a calculate_batch() result, in the list format calculate() returns"""
+    return {
+        stat: [columns[i].tolist(), rows[i].tolist(), whole[i]]
+        for stat, (columns, rows, whole) in result.items()
+    }
@@ -0,0 +1,116 @@
+import math
+
+import numpy as np
+
+from mean_var_std import STATISTICS
+
+
+class RunningStats:
+    """
+    calculate()'s statistics for an N x M matrix whose rows arrive in chunks.
+
+    Columns keep a count, mean and sum of squared deviations (M2) that are merged chunk by chunk
+    with Chan's parallel form of Welford's update, plus running min, max and a compensated sum.
+    Each row is complete within its chunk, so per-row statistics are computed as chunks arrive
+    (keep_rows=False drops them when only column and whole-matrix results are needed).
+    Accumulators fed by different workers merge into the accumulator of all their rows.
+    Results are float64.
+    """
+
+    def __init__(self, keep_rows=True):
+        self.keep_rows = keep_rows
+        self.count = 0
+        self.mean = self.m2 = self.min = self.max = self.sum = self.compensation = None
+        self.rows = []
+
+    def update(self, chunk):
+        """Add rows: a (rows, M) array, or one row of M values"""
+        chunk = np.asarray(chunk, dtype=np.float64)
+        if chunk.ndim == 1:
+            chunk = chunk[None, :]
+        if chunk.ndim != 2:
+            raise ValueError("Chunks must be 1-D rows or 2-D (rows, columns) arrays.")
+        if not len(chunk):
+            return self
+
+        mean = chunk.mean(axis=0)
+        part = RunningStats(self.keep_rows)
+        part.count = len(chunk)
+        part.mean = mean
+        part.m2 = ((chunk - mean) ** 2).sum(axis=0)
+        part.min, part.max = chunk.min(axis=0), chunk.max(axis=0)
+        part.sum, part.compensation = chunk.sum(axis=0), np.zeros(chunk.shape[1])
+        if self.keep_rows:
+            row_mean = chunk.mean(axis=1)
+            row_var = ((chunk - row_mean[:, None]) ** 2).mean(axis=1)
+            part.rows = [{'mean': row_mean, 'variance': row_var, 'standard deviation': np.sqrt(row_var),
+                          'max': chunk.max(axis=1), 'min': chunk.min(axis=1), 'sum': chunk.sum(axis=1)}]
+        return self.merge(part)
+
+    def merge(self, other):
+        """Fold in another accumulator's rows, which come after this one's; returns self"""
+        if not other.count:
+            return self
+        if self.keep_rows and not other.keep_rows:
+            raise ValueError("Cannot merge an accumulator without per-row statistics (keep_rows=False) "
+                             "into one that keeps them.")
+        if not self.count:
+            self.count, self.mean, self.m2 = other.count, other.mean.copy(), other.m2.copy()
+            self.min, self.max = other.min.copy(), other.max.copy()
+            self.sum, self.compensation = other.sum.copy(), other.compensation.copy()
+            self.rows = list(other.rows) if self.keep_rows else []
+            return self
+        if other.mean.shape != self.mean.shape:
+            raise ValueError(f"Cannot merge {other.mean.shape[0]} columns into {self.mean.shape[0]}.")
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * (other.count / count)
+        self.m2 = self.m2 + other.m2 + delta ** 2 * (self.count * other.count / count)
+        self.count = count
+        np.minimum(self.min, other.min, out=self.min)
+        np.maximum(self.max, other.max, out=self.max)
+
+        # Kahan-Babuska summation keeps the running sum exact to rounding of the final value
+        total = self.sum + other.sum
+        self.compensation += np.where(np.abs(self.sum) >= np.abs(other.sum),
+                                      (self.sum - total) + other.sum, (other.sum - total) + self.sum)
+        self.compensation += other.compensation
+        self.sum = total
+
+        if self.keep_rows:
+            self.rows.extend(other.rows)
+        return self
+
+    def _columns(self):
+        variance = self.m2 / self.count
+        return {'mean': self.mean.copy(), 'variance': variance, 'standard deviation': np.sqrt(variance),
+                'max': self.max.copy(), 'min': self.min.copy(), 'sum': self.sum + self.compensation}
+
+    def _whole(self):
+        # all columns have the same count: pooled M2 is the within-column M2 plus the spread of column means
+        mean = self.mean.mean()
+        variance = (self.m2.sum() + self.count * ((self.mean - mean) ** 2).sum()) / (self.count * len(self.mean))
+        return {'mean': mean, 'variance': variance, 'standard deviation': np.sqrt(variance),
+                'max': self.max.max(), 'min': self.min.min(),
+                'sum': np.float64(math.fsum(np.concatenate([self.sum, self.compensation])))}
+
+    def _rows(self):
+        if not self.keep_rows:
+            raise ValueError("Per-row statistics were not kept (keep_rows=False).")
+        return {stat: np.concatenate([part[stat] for part in self.rows]) for stat in STATISTICS}
+
+    def result(self, axis=None):
+        """Statistics per column (axis=0), per row (axis=1) or of the whole matrix (axis=None)"""
+        if not self.count:
+            raise ValueError("No rows have been added.")
+        if axis is None:
+            return self._whole()
+        if axis in (0, 1):
+            return self._columns() if axis == 0 else self._rows()
+        raise ValueError("axis must be 0, 1 or None.")
+
+    def calculate(self):
+        """All statistics in calculate()'s layout: [per column, per row, whole matrix], as arrays"""
+        columns, rows, whole = self.result(0), self.result(1), self.result()
+        return {stat: [columns[stat], rows[stat], whole[stat]] for stat in STATISTICS}
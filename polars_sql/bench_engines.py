@@ -0,0 +1,198 @@
+#
+# pandas vs Polars (eager, lazy, streaming) on the same indicator + quarterly workload,
+# across data sizes and thread counts, with output checks and a JSON report
+#
+#   python bench_engines.py                                   # 1M and 10M rows, 1 and all threads
+#   python bench_engines.py --sizes 1000000 --threads 1 2 4 --output engines.json
+#
+# Every measurement runs in a fresh process: POLARS_MAX_THREADS only applies at import,
+# and peak RSS is then the run's own.
+#
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ENGINES = ['pandas', 'polars_eager', 'polars_lazy', 'polars_streaming']
+KEYS = ['ticker', 'year', 'quarter']
+
+
+def pandas_pipeline(pdf):
+    """The indicator and quarterly workload written the way a pandas user would"""
+    pdf = pdf.sort_values(['ticker', 'timestamp'], kind='stable').reset_index(drop=True)
+    pdf['year'] = pdf['timestamp'].dt.year
+    pdf['quarter'] = pdf['timestamp'].dt.quarter
+
+    prices = pdf.groupby('ticker', observed=True, sort=False)['price']
+    pdf['sma_20'] = prices.rolling(20).mean().reset_index(level=0, drop=True)
+    pdf['volatility_20'] = prices.rolling(20).std().reset_index(level=0, drop=True)
+    pdf['ema_12'] = prices.ewm(span=12, adjust=True).mean().reset_index(level=0, drop=True)
+    pdf['price_diff'] = prices.diff()
+    pdf['dollar_volume'] = pdf['volume'] * pdf['price']
+
+    diffs = pdf.groupby('ticker', observed=True, sort=False)['price_diff']
+    pdf['rsi_up'] = diffs.transform(lambda s: s.clip(lower=0).rolling(14).mean())
+    pdf['rsi_down'] = diffs.transform(lambda s: s.abs().rolling(14).mean())
+    pdf['bb_position'] = pdf['price'] - pdf['sma_20']
+    pdf['rsi'] = 100 - (100 / (1 + pdf['rsi_up'] / pdf['rsi_down']))
+
+    rows = pdf[(pdf['price'] > 10) & (pdf['volume'] > 100000) & pdf['sma_20'].notna()]
+    rows = rows.assign(above_sma=rows['price'] > rows['sma_20'])
+    quarterly = rows.groupby(KEYS, observed=True).agg(
+        avg_price=('price', 'mean'),
+        price_volatility=('price', 'std'),
+        min_price=('price', 'min'),
+        max_price=('price', 'max'),
+        # Polars' default 'nearest' quantile rounds a half index up, i.e. pandas' 'higher' at q=0.5
+        median_price=('price', lambda s: s.quantile(0.5, interpolation='higher')),
+        total_volume=('volume', 'sum'),
+        total_dollar_volume=('dollar_volume', 'sum'),
+        avg_rsi=('rsi', 'mean'),
+        avg_volatility=('volatility_20', 'mean'),
+        bollinger_deviation=('bb_position', 'std'),
+        trading_days=('price', 'size'),
+        sectors_count=('sector', 'nunique'),
+        above_sma_ratio=('above_sma', 'mean'),
+    ).reset_index()
+    quarterly['price_range_pct'] = (quarterly['max_price'] - quarterly['min_price']) / quarterly['min_price']
+    quarterly['volume_rank'] = quarterly['total_dollar_volume'].rank(method='first', ascending=False)
+    quarterly['volatility_rank'] = quarterly['price_volatility'].rank(method='first', ascending=False)
+    quarterly = quarterly[quarterly['trading_days'] >= 10]
+    return quarterly.sort_values(KEYS).reset_index(drop=True)
+
+
+def polars_eager(df):
+    """The same stages on DataFrames, each executed immediately with no query optimizer"""
+    import polars as pl
+    from pipeline import finalize_quarters, indicator_expressions, quarterly_aggregations, quarterly_filter
+
+    df = df.sort(['ticker', 'timestamp'], maintain_order=True).set_sorted('ticker')
+    for stage in indicator_expressions():
+        df = df.with_columns(stage)
+    quarterly = df.drop('_row').filter(quarterly_filter()).group_by(KEYS).agg(quarterly_aggregations())
+    return finalize_quarters(quarterly)
+
+
+def run_engine(engine, n_records, seed):
+    """Generate the data, run one engine and return (seconds, result as a Polars DataFrame)"""
+    import polars as pl
+    from generator import mock_market_data
+    from pipeline import build_indicator_pipeline
+
+    data = mock_market_data(n_records, seed=seed)
+    if engine == 'pandas':
+        import pandas as pd
+        pdf = pd.DataFrame(data).astype({'ticker': 'category', 'sector': 'category'})
+        start = time.perf_counter()
+        result = pl.from_pandas(pandas_pipeline(pdf))
+    else:
+        df = pl.DataFrame(data).with_columns(pl.col('ticker', 'sector').cast(pl.Categorical))
+        start = time.perf_counter()
+        if engine == 'polars_eager':
+            result = polars_eager(df)
+        else:
+            plan = build_indicator_pipeline(df.lazy())
+            result = plan.collect(engine='streaming' if engine == 'polars_streaming' else 'in-memory')
+    return time.perf_counter() - start, result
+
+
+def child(args):
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    seconds, result = run_engine(args.engine, args.size, args.seed)
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # KiB on Linux
+    result.write_parquet(args.result)
+    print(json.dumps({'seconds': seconds, 'peak_rss_mb': peak_rss / 1024, 'start_rss_mb': baseline_rss / 1024}))
+
+
+def compare_results(result, expected, rtol=1e-9):
+    """Quarterly outputs must agree on keys and every value column"""
+    import numpy as np
+    import polars as pl
+
+    result = result.with_columns(pl.col('ticker').cast(pl.String)).sort(KEYS)
+    expected = expected.with_columns(pl.col('ticker').cast(pl.String)).sort(KEYS)
+    if result.select(KEYS).cast(pl.String).to_dicts() != expected.select(KEYS).cast(pl.String).to_dicts():
+        return 'group keys differ'
+    for column in expected.columns:
+        if column in KEYS:
+            continue
+        a = result[column].cast(pl.Float64).to_numpy()
+        b = expected[column].cast(pl.Float64).to_numpy()
+        if not np.allclose(a, b, rtol=rtol, atol=0, equal_nan=True):
+            return f'{column} differs (max abs diff {np.nanmax(np.abs(a - b)):.3g})'
+    return None
+
+
+def measure(engine, size, threads, seed, tmp):
+    result_path = os.path.join(tmp, f'{engine}_{size}_{threads}.parquet')
+    env = dict(os.environ, POLARS_MAX_THREADS=str(threads))
+    output = subprocess.run(
+        [sys.executable, __file__, '--child', '--engine', engine, '--size', str(size), '--seed', str(seed),
+         '--result', result_path],
+        env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1]), result_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='pandas vs Polars engine benchmark')
+    parser.add_argument('--sizes', nargs='+', type=int, default=[1_000_000, 10_000_000])
+    parser.add_argument('--threads', nargs='+', type=int, default=[1, os.cpu_count()])
+    parser.add_argument('--engines', nargs='+', choices=ENGINES, default=ENGINES)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default=os.path.join(tempfile.gettempdir(), 'bench_engines.json'),
+                        help='JSON report path (default: in the system temp directory, not the source tree)')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--engine', help=argparse.SUPPRESS)
+    parser.add_argument('--size', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--result', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args)
+        sys.exit(0)
+
+    import platform
+
+    import pandas as pd
+    import polars as pl
+
+    runs = []
+    mismatches = 0
+    threads = sorted(set(args.threads))
+    print(f"{'engine':<18} {'rows':>12} {'threads':>8} {'seconds':>9} {'M rows/s':>9} {'peak MB':>9}  check")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            reference = None
+            for engine in args.engines:
+                # pandas runs on one core whatever POLARS_MAX_THREADS says
+                for n_threads in threads[:1] if engine == 'pandas' else threads:
+                    stats, result_path = measure(engine, size, n_threads, args.seed, tmp)
+                    result = pl.read_parquet(result_path)
+                    if reference is None:
+                        reference, reference_engine = result, engine
+                        check = 'reference'
+                    else:
+                        error = compare_results(result, reference)
+                        mismatches += error is not None
+                        check = f'MISMATCH vs {reference_engine}: {error}' if error else 'ok'
+                    runs.append(dict(engine=engine, rows=size, threads=n_threads, groups=result.height,
+                                     matches_reference=check in ('ok', 'reference'), **stats))
+                    print(f"{engine:<18} {size:>12,} {n_threads:>8} {stats['seconds']:>9.3f} "
+                          f"{size / stats['seconds'] / 1e6:>9.2f} {stats['peak_rss_mb']:>9.0f}  {check}")
+
+    report = {
+        'machine': {'python': platform.python_version(), 'cpus': os.cpu_count(), 'platform': platform.platform()},
+        'polars': pl.__version__,
+        'pandas': pd.__version__,
+        'runs': runs
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nReport written to {args.output}")
+    sys.exit(1 if mismatches else 0)
@@ -0,0 +1,65 @@
+#
+# Export formats: write throughput, file size and read-back time per format and setting,
+# plus the cost of handing a frame to pandas
+#
+#   python bench_export.py [n_records]
+#
+
+import os
+import sys
+import tempfile
+import time
+
+import polars as pl
+
+from export import read_ipc_mapped, to_pandas, write_ipc, write_ndjson, write_parquet
+from generator import mock_market_data
+from pipeline import add_indicators
+
+FORMATS = [
+    ('parquet zstd-3 128k', '.parquet', lambda df, p: write_parquet(df, p), pl.read_parquet),
+    ('parquet zstd-3 64k', '.parquet', lambda df, p: write_parquet(df, p, row_group_size=64_000), pl.read_parquet),
+    ('parquet zstd-3 1M', '.parquet', lambda df, p: write_parquet(df, p, row_group_size=1_000_000), pl.read_parquet),
+    ('parquet zstd-9 128k', '.parquet', lambda df, p: write_parquet(df, p, compression_level=9), pl.read_parquet),
+    ('parquet snappy 128k', '.parquet',
+     lambda df, p: write_parquet(df, p, compression='snappy', compression_level=None), pl.read_parquet),
+    ('parquet lz4 128k', '.parquet',
+     lambda df, p: write_parquet(df, p, compression='lz4', compression_level=None), pl.read_parquet),
+    ('ipc uncompressed (mmap)', '.arrow', lambda df, p: write_ipc(df, p), read_ipc_mapped),
+    ('ipc lz4', '.arrow', lambda df, p: write_ipc(df, p, compression='lz4'), pl.read_ipc),
+    ('ipc zstd', '.arrow', lambda df, p: write_ipc(df, p, compression='zstd'), pl.read_ipc),
+    ('ndjson', '.ndjson', lambda df, p: write_ndjson(df, p), pl.read_ndjson),
+]
+
+
+def best_of(fn, repeats=3):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+if __name__ == "__main__":
+    n_records = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    df = add_indicators(pl.LazyFrame(mock_market_data(n_records))).collect()
+    in_memory_mb = df.estimated_size() / 1e6
+    print(f"{n_records:,} feature rows, {in_memory_mb:.0f} MB in memory\n")
+
+    print(f"{'format':<26} {'write s':>8} {'MB/s':>8} {'file MB':>8} {'ratio':>6} {'read s':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, suffix, write, read in FORMATS:
+            path = os.path.join(tmp, label.replace(' ', '_') + suffix)
+            write_time, _ = best_of(lambda: write(df, path))
+            size_mb = os.path.getsize(path) / 1e6
+            read_time, loaded = best_of(lambda: read(path))
+            assert loaded.height == df.height
+            print(f"{label:<26} {write_time:>8.3f} {in_memory_mb / write_time:>8.0f} {size_mb:>8.1f} "
+                  f"{in_memory_mb / size_mb:>6.1f} {read_time:>8.3f}")
+
+    print("\npandas handoff:")
+    copy_time, _ = best_of(lambda: df.to_pandas())
+    arrow_time, pdf = best_of(lambda: to_pandas(df))
+    print(f"  to_pandas() NumPy copy        {copy_time:8.3f}s")
+    print(f"  Arrow-backed dtypes           {arrow_time:8.3f}s  ({pdf.dtypes.iloc[2]})")
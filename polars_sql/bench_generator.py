@@ -0,0 +1,35 @@
+#
+# Generator throughput: rows/sec per core writing partitioned Parquet
+#
+#   python bench_generator.py /tmp/gen-bench --tickers 20 --days 30 --rows-per-day 50000
+#
+
+import argparse
+import os
+import shutil
+import time
+
+from generator import ticker_universe, write_dataset
+
+
+def timed_write(path, workers, args):
+    shutil.rmtree(path, ignore_errors=True)
+    start = time.perf_counter()
+    n_rows = write_dataset(path, ticker_universe(args.tickers), days=args.days,
+                           rows_per_day=args.rows_per_day, workers=workers)
+    elapsed = time.perf_counter() - start
+    print(f"workers={workers:<3} {n_rows:>13,} rows  {elapsed:7.2f}s  "
+          f"{n_rows / elapsed / 1e6:7.2f} M rows/s  {n_rows / elapsed / workers / 1e6:7.2f} M rows/s/core")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('path')
+    parser.add_argument('--tickers', type=int, default=20)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--rows-per-day', type=int, default=50_000)
+    args = parser.parse_args()
+
+    for workers in sorted({1, os.cpu_count()}):
+        timed_write(args.path, workers, args)
+    shutil.rmtree(args.path, ignore_errors=True)
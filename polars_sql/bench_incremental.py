@@ -0,0 +1,80 @@
+#
+# Incremental indicator updates: appended batches must reproduce a full recompute bit for bit,
+# agree with the Polars pipeline, and cost time proportional to the new rows only
+#
+#   python bench_incremental.py [history_rows] [batch_rows]
+#
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import polars as pl
+
+from generator import mock_market_data
+from incremental import INDICATOR_COLUMNS, IncrementalIndicators
+from pipeline import add_indicators, build_indicator_pipeline
+
+
+def check_correctness(n_records=60_000, n_batches=7):
+    df = pl.DataFrame(mock_market_data(n_records, seed=11))
+
+    # Before any rows: an empty frame with the pipeline's schema
+    expected = build_indicator_pipeline(df.clear().lazy()).collect()
+    assert IncrementalIndicators().quarterly().equals(expected), "quarterly() before any update differs"
+
+    full = IncrementalIndicators()
+    full_features = full.update(df)
+
+    # Uneven batch boundaries, including batches shorter than the windows
+    cuts = np.unique(np.r_[0, np.random.default_rng(3).integers(1, n_records, n_batches), 5, 17, n_records])
+    engine = IncrementalIndicators()
+    parts = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for start, end in zip(cuts[:-1], cuts[1:]):
+            parts.append(engine.update(df.slice(start, end - start)))
+            engine.save(os.path.join(tmp, 'state.pkl'))
+            engine = IncrementalIndicators.load(os.path.join(tmp, 'state.pkl'))
+    incremental = pl.concat(parts).sort(['ticker', 'timestamp'], maintain_order=True)
+
+    assert incremental.equals(full_features), "incremental features differ from the full recompute"
+    assert engine.quarterly().equals(full.quarterly()), "incremental quarterly aggregates differ"
+    print(f"{len(cuts) - 1} appended batches == full recompute, bit for bit ({n_records:,} rows)")
+
+    expected = add_indicators(df.lazy()).collect()
+    for column in INDICATOR_COLUMNS:
+        np.testing.assert_allclose(full_features[column].to_numpy(), expected[column].to_numpy(),
+                                   rtol=1e-9, atol=1e-9, equal_nan=True, err_msg=column)
+
+    expected = build_indicator_pipeline(df.lazy()).collect()
+    result = full.quarterly()
+    assert result.select('ticker', 'year', 'quarter').equals(expected.select('ticker', 'year', 'quarter'))
+    for column in expected.columns[3:]:
+        np.testing.assert_allclose(result[column].to_numpy().astype(float), expected[column].to_numpy().astype(float),
+                                   rtol=1e-9, err_msg=column)
+    print("Features and quarterly aggregates match the Polars pipeline")
+
+
+def time_it(label, fn):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<36} {elapsed:8.3f}s")
+    return elapsed
+
+
+if __name__ == "__main__":
+    check_correctness()
+
+    history_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    batch_rows = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+    df = pl.DataFrame(mock_market_data(history_rows + batch_rows))
+    history, batch = df.slice(0, history_rows), df.slice(history_rows)
+
+    print(f"\n{history_rows:,} rows of history, appending {batch_rows:,}:")
+    engine = IncrementalIndicators()
+    time_it("build state from history", lambda: engine.update(history))
+    time_it("recompute pipeline (history+batch)", lambda: build_indicator_pipeline(df.lazy()).collect())
+    time_it("incremental update + quarterly", lambda: (engine.update(batch), engine.quarterly()))
@@ -0,0 +1,50 @@
+#
+# Benchmark harness: time collect() of the indicator pipeline at several data sizes
+#
+#   python bench_pipeline.py                 # 100k, 10M and 100M rows
+#   python bench_pipeline.py 100000 1000000  # custom sizes
+#
+
+import sys
+import time
+
+import numpy as np
+import polars as pl
+
+from generator import mock_market_data
+from pipeline import build_indicator_pipeline
+
+DEFAULT_SIZES = [100_000, 10_000_000, 100_000_000]
+
+
+def mock_frame(n_records, seed=42):
+    """App-shaped mock data with categorical ticker/sector columns"""
+    return pl.LazyFrame(mock_market_data(n_records, seed=seed)).with_columns(
+        pl.col('ticker', 'sector').cast(pl.Categorical)
+    )
+
+
+def bench(n_records, repeats=3):
+    lf = mock_frame(n_records)
+
+    start = time.perf_counter()
+    plan = build_indicator_pipeline(lf)
+    build_time = time.perf_counter() - start
+
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        df = plan.collect()
+        timings.append(time.perf_counter() - start)
+
+    best = min(timings)
+    print(f"{n_records:>12,} rows  build {build_time * 1000:7.2f} ms  "
+          f"collect best {best:8.3f}s  median {np.median(timings):8.3f}s  "
+          f"{n_records / best / 1e6:7.2f} M rows/s  -> {df.height} groups")
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    print(f"Polars {pl.__version__}, {pl.thread_pool_size()} threads")
+    for n in sizes:
+        bench(n)
@@ -0,0 +1,91 @@
+#
+# Query server under concurrent load: many HTTP clients on one machine, each running a mix
+# of point lookups and aggregations, decoded from Arrow IPC
+#
+#   python bench_query_server.py [n_records] [requests_per_client]
+#
+
+import sys
+import threading
+import time
+
+import numpy as np
+import polars as pl
+
+from generator import mock_market_data
+from pipeline import build_indicator_pipeline
+from query_server import QueryService, query, serve
+
+QUERIES = [
+    "SELECT ticker, COUNT(*) AS n, AVG(price) AS avg_price FROM ticks GROUP BY ticker ORDER BY ticker",
+    "SELECT * FROM ticks WHERE ticker = 'AAPL' AND volume > 2000000 LIMIT 100",
+    "SELECT sector, SUM(volume * price) AS dollar_volume FROM ticks GROUP BY sector",
+    "SELECT * FROM quarterly ORDER BY total_dollar_volume DESC LIMIT 10",
+]
+
+
+def check_behaviour(url):
+    df, truncated = query(url, "SELECT * FROM ticks", max_rows=1000)
+    assert df.height == 1000 and truncated
+    df, truncated = query(url, QUERIES[0])
+    assert df.height == 5 and not truncated
+    try:
+        query(url, "SELECT COUNT(*) AS n FROM (SELECT price FROM ticks LIMIT 30000) a "
+                   "CROSS JOIN (SELECT price AS other FROM ticks LIMIT 30000) b WHERE price > other", timeout=0.2)
+        raise AssertionError("expected a timeout")
+    except RuntimeError as e:
+        assert str(e).startswith('504'), e
+    try:
+        query(url, "SELECT missing_column FROM ticks")
+        raise AssertionError("expected a bad request")
+    except RuntimeError as e:
+        assert str(e).startswith('400'), e
+    print("Row limit, timeout (504) and error (400) handling OK")
+
+
+def run_clients(url, n_clients, requests_per_client):
+    latencies = [[] for _ in range(n_clients)]
+
+    def client(i):
+        for j in range(requests_per_client):
+            sql = QUERIES[(i + j) % len(QUERIES)]
+            start = time.perf_counter()
+            query(url, sql)
+            latencies[i].append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(n_clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    ms = np.concatenate(latencies) * 1000
+    print(f"{n_clients:>8} {len(ms) / elapsed:>10.1f} {np.percentile(ms, 50):>9.2f} "
+          f"{np.percentile(ms, 95):>9.2f} {np.percentile(ms, 99):>9.2f}")
+
+
+if __name__ == "__main__":
+    n_records = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    requests_per_client = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    ticks = pl.DataFrame(mock_market_data(n_records))
+    service = QueryService(default_timeout=60)
+    service.register('ticks', ticks)
+    # materialize the quarterly table so the benchmark measures serving, not the pipeline
+    service.register('quarterly', build_indicator_pipeline(ticks.lazy()).collect())
+
+    server = serve(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_address[1]}'
+
+    check_behaviour(url)
+
+    print(f"\n{n_records:,} rows, {requests_per_client} requests per client")
+    print(f"{'clients':>8} {'req/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for n_clients in (1, 4, 16, 64):
+        run_clients(url, n_clients, requests_per_client)
+
+    server.shutdown()
+    service.shutdown()
@@ -0,0 +1,98 @@
+#
+# SQL service layer: rollup answers against the base table, then cache hit rate and latency
+# for a dashboard-like workload that repeats a small set of queries
+#
+#   python bench_sql_service.py [n_records] [n_queries]
+#
+
+import sys
+import time
+
+import numpy as np
+import polars as pl
+
+from generator import mock_market_data
+from pipeline import add_indicators
+from sql_service import SQLService
+
+DASHBOARD_QUERIES = [
+    """SELECT ticker, year, quarter, AVG(price) AS avg_price, SUM(dollar_volume) AS total_dollar_volume,
+              COUNT(*) AS trading_days
+       FROM ticks GROUP BY ticker, year, quarter ORDER BY ticker, year, quarter""",
+    """SELECT ticker, MIN(price) AS low, MAX(price) AS high, SUM(volume) AS volume
+       FROM ticks WHERE year >= 2024 GROUP BY ticker ORDER BY volume DESC""",
+    """SELECT year, quarter, AVG(rsi) AS avg_rsi, COUNT(rsi) AS rsi_rows
+       FROM ticks GROUP BY year, quarter ORDER BY year, quarter""",
+    """SELECT ticker, SUM(dollar_volume) AS dollar_volume FROM ticks
+       WHERE quarter IN (1, 2) GROUP BY ticker HAVING SUM(dollar_volume) > 0 ORDER BY ticker""",
+    # needs raw rows: runs on the base table
+    """SELECT ticker, AVG(price) AS avg_price FROM ticks WHERE volume > 100000 GROUP BY ticker ORDER BY ticker""",
+]
+
+
+def check_rollups(service):
+    """Every rewritten query must agree with the same query on the base table"""
+    direct = pl.SQLContext(frames={'ticks': service.tables['ticks']})
+    for sql in DASHBOARD_QUERIES:
+        rewritten = service.explain_rewrite(sql)
+        result = service.query(sql)
+        expected = direct.execute(sql, eager=True)
+        assert result.columns == expected.columns, sql
+        for column in result.columns:
+            if result[column].dtype.is_numeric():
+                np.testing.assert_allclose(result[column].to_numpy().astype(float),
+                                           expected[column].to_numpy().astype(float), rtol=1e-9, err_msg=column)
+            else:
+                assert result[column].equals(expected[column]), column
+        print(f"{'rollup' if rewritten else 'base  '}  {' '.join(sql.split())[:90]}")
+    service.clear_cache()
+    service.reset_stats()
+
+
+def time_uncached(service, sql, repeats=5):
+    timings = []
+    for _ in range(repeats):
+        service.clear_cache()
+        start = time.perf_counter()
+        service.query(sql)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+if __name__ == "__main__":
+    n_records = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    n_queries = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+
+    ticks = add_indicators(pl.LazyFrame(mock_market_data(n_records))).collect()
+    service = SQLService()
+    service.register('ticks', ticks)
+    service.add_rollup('ticks', ['ticker', 'year', 'quarter'])
+
+    print(f"Rollup substitution on {n_records:,} rows:")
+    check_rollups(service)
+
+    plain = SQLService()
+    plain.register('ticks', ticks)
+    print("\nUncached latency (ms):     base table    with rollup")
+    for i, sql in enumerate(DASHBOARD_QUERIES):
+        print(f"  query {i}              {time_uncached(plain, sql) * 1000:12.2f} {time_uncached(service, sql) * 1000:14.2f}")
+    service.clear_cache()
+    service.reset_stats()
+
+    # Dashboard traffic: skewed repeats of the same queries, with a data refresh every 500 queries
+    rng = np.random.default_rng(0)
+    picks = rng.zipf(1.5, n_queries) % len(DASHBOARD_QUERIES)
+    start = time.perf_counter()
+    for i, pick in enumerate(picks):
+        if i and i % 500 == 0:
+            service.register('ticks', ticks)
+        service.query(DASHBOARD_QUERIES[pick])
+    elapsed = time.perf_counter() - start
+
+    stats = service.stats()
+    print(f"\n{n_queries:,} dashboard queries in {elapsed:.2f}s, cache hit rate {stats['hit_rate']:.1%}")
+    for kind in ('hit', 'rollup', 'miss'):
+        entry = stats[kind]
+        if entry['count']:
+            print(f"  {kind:<7} {entry['count']:>6}  mean {entry['mean_ms']:8.3f} ms  "
+                  f"p50 {entry['p50_ms']:8.3f} ms  p95 {entry['p95_ms']:8.3f} ms")
@@ -0,0 +1,93 @@
+#
+# Peak memory and throughput of the streaming pipeline on generated on-disk datasets of growing size:
+# peak RSS should stay flat as the rows per ticker grow
+#
+#   python bench_streaming.py --dataset /data/ticks --rows 1200000000   # ~50 GB of Parquet
+#   python bench_streaming.py --dataset /tmp/ticks --rows 2000000 10000000 20000000
+#
+# Each size is generated once under <dataset>/<rows>/ and reused by later runs.
+#
+
+import argparse
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import time
+
+import polars as pl
+
+from generator import TICKERS, write_dataset
+
+ROWS_PER_DAY = 20_000
+
+
+def generate_dataset(path, n_records, seed=42):
+    """Ticker/date-partitioned Parquet from the generator, one partition per process task"""
+    days = max(1, n_records // (len(TICKERS) * ROWS_PER_DAY))
+    write_dataset(path, TICKERS, days=days, rows_per_day=n_records // (len(TICKERS) * days), seed=seed)
+
+
+def dataset_size(path):
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, files in os.walk(path) for name in files
+    )
+
+
+def run_child(path, output_path, chunk_rows):
+    """
+    Measured run, executed in a separate process so its peak RSS is isolated. The peak is read
+    here with RUSAGE_SELF: the parent's RUSAGE_CHILDREN would also cover the generator's workers.
+    """
+    from streaming import run_streaming
+    run_streaming(path, output_path, chunk_rows=chunk_rows)
+    print(f"peak_rss_kib={resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}")
+
+
+def measure(path, output_path, chunk_rows):
+    """Seconds and peak RSS in bytes of one run_streaming() in a fresh process"""
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, __file__, '--dataset', path, '--output', output_path,
+                             '--chunk-rows', str(chunk_rows), '--child'],
+                            check=True, capture_output=True, text=True).stdout
+    elapsed = time.perf_counter() - start
+    return elapsed, int(output.strip().splitlines()[-1].split('=')[1]) * 1024  # Linux reports KiB
+
+
+if __name__ == "__main__":
+    from streaming import CHUNK_ROWS
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--dataset', required=True)
+    parser.add_argument('--rows', nargs='+', type=int, default=[2_000_000, 10_000_000, 20_000_000])
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS, help='rows per time range of a ticker')
+    parser.add_argument('--output', default=None)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.dataset, args.output, args.chunk_rows)
+        sys.exit(0)
+
+    # every dataset is generated before this process runs a Polars query: the generator's
+    # workers are forked, and a fork of a process whose Polars thread pool is busy can deadlock
+    for rows in args.rows:
+        path = os.path.join(args.dataset, str(rows))
+        if not os.path.isdir(path):
+            # written aside and renamed, so an interrupted run never leaves a partial dataset to reuse
+            shutil.rmtree(f'{path}.tmp', ignore_errors=True)
+            generate_dataset(f'{path}.tmp', rows)
+            os.rename(f'{path}.tmp', path)
+
+    print(f"{'rows':>14} {'rows/ticker':>12} {'GB':>7} {'seconds':>8} {'M rows/s':>9} {'peak MB':>8}")
+    for rows in args.rows:
+        path = os.path.join(args.dataset, str(rows))
+        output_path = args.output or os.path.join(args.dataset, f'quarterly-{rows}.parquet')
+
+        n_rows = pl.scan_parquet(os.path.join(path, '**', '*.parquet')).select(pl.len()).collect().item()
+        size = dataset_size(path)
+        elapsed, peak_rss = measure(path, output_path, args.chunk_rows)
+        print(f"{n_rows:>14,} {n_rows // len(TICKERS):>12,} {size / 1e9:>7.2f} {elapsed:>8.1f} "
+              f"{n_rows / elapsed / 1e6:>9.2f} {peak_rss / 1e6:>8.0f}")
@@ -0,0 +1,93 @@
+#
+# Export layer: Parquet, Arrow IPC (Feather v2) and NDJSON writers, memory-mapped reads
+# and copy-free handoff to pandas through Arrow-backed dtypes
+#
+
+import os
+
+import polars as pl
+import pyarrow as pa
+
+# Chosen with bench_export.py: zstd level 3 gives files as small as level 9 while writing faster;
+# snappy/lz4 write 2-3x faster for ~10% larger files, worth it for short-lived intermediates.
+# File size is flat from 64k to 1M rows per group, so groups stay small enough for
+# statistics-based pruning of ticker/date ranges and bounded writer memory.
+PARQUET_COMPRESSION = 'zstd'
+PARQUET_COMPRESSION_LEVEL = 3
+PARQUET_ROW_GROUP_SIZE = 128_000
+
+FORMATS = {'.parquet': 'parquet', '.arrow': 'ipc', '.ipc': 'ipc', '.feather': 'ipc',
+           '.ndjson': 'ndjson', '.jsonl': 'ndjson'}
+
+
+def _prepare(path):
+    if isinstance(path, (str, os.PathLike)):
+        os.makedirs(os.path.dirname(os.fspath(path)) or '.', exist_ok=True)
+
+
+def write_parquet(frame, path, compression=PARQUET_COMPRESSION, compression_level=PARQUET_COMPRESSION_LEVEL,
+                  row_group_size=PARQUET_ROW_GROUP_SIZE):
+    """Parquet with tuned compression and row groups; LazyFrames are streamed with sink_parquet"""
+    _prepare(path)
+    options = dict(compression=compression, compression_level=compression_level, row_group_size=row_group_size)
+    if isinstance(frame, pl.LazyFrame):
+        frame.sink_parquet(path, **options)
+    else:
+        frame.write_parquet(path, **options)
+
+
+def write_ipc(frame, path, compression='uncompressed', record_batch_size=None):
+    """
+    Arrow IPC file (the Feather v2 format). Leave it uncompressed to read it back memory-mapped
+    without a copy; lz4/zstd make smaller files that have to be decompressed on read.
+    """
+    _prepare(path)
+    if isinstance(frame, pl.LazyFrame):
+        frame.sink_ipc(path, compression=None if compression == 'uncompressed' else compression,
+                       record_batch_size=record_batch_size)
+    else:
+        frame.write_ipc(path, compression=compression, record_batch_size=record_batch_size)
+
+
+def write_ndjson(frame, path_or_file, batch_rows=100_000):
+    """
+    Newline-delimited JSON. LazyFrames stream through sink_ndjson; DataFrames are written
+    slice by slice, so a file object (socket, stdout) receives output as it is produced.
+    """
+    if isinstance(frame, pl.LazyFrame):
+        _prepare(path_or_file)
+        frame.sink_ndjson(path_or_file)
+        return
+    if isinstance(path_or_file, (str, os.PathLike)):
+        _prepare(path_or_file)
+        with open(path_or_file, 'wb') as f:
+            write_ndjson(frame, f, batch_rows)
+        return
+    for part in frame.iter_slices(batch_rows):
+        part.write_ndjson(path_or_file)
+
+
+def export(frame, path, **options):
+    """Write frame in the format implied by the file extension (.parquet, .arrow/.ipc/.feather, .ndjson/.jsonl)"""
+    fmt = FORMATS.get(os.path.splitext(os.fspath(path))[1].lower())
+    if fmt is None:
+        raise ValueError(f"Unknown export format for {path}; expected one of {', '.join(FORMATS)}")
+    {'parquet': write_parquet, 'ipc': write_ipc, 'ndjson': write_ndjson}[fmt](frame, path, **options)
+
+
+def read_ipc_mapped(path, columns=None):
+    """
+    Memory-map an uncompressed Arrow IPC file: columns point into the page cache, so loading
+    costs no copy and only the pages that are touched are read from disk.
+    """
+    table = pa.ipc.open_file(pa.memory_map(os.fspath(path), 'r')).read_all()
+    if columns is not None:
+        table = table.select(columns)
+    return pl.from_arrow(table, rechunk=False)
+
+
+def to_pandas(frame):
+    """pandas DataFrame backed by the same Arrow buffers (ArrowDtype columns) instead of a NumPy copy"""
+    if isinstance(frame, pl.LazyFrame):
+        frame = frame.collect()
+    return frame.to_pandas(use_pyarrow_extension_array=True)
@@ -0,0 +1,115 @@
+#
+# Synthetic market data: vectorized, reproducible per partition, written as ticker/date-partitioned Parquet
+#
+#   python generator.py /data/ticks --tickers 500 --days 730 --rows-per-day 10000 --workers 8
+#
+
+import argparse
+import os
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import polars as pl
+
+TICKERS = ['AAPL', 'GOOGL', 'MSFT', 'TSLA', 'AMZN']
+SECTORS = ['Tech', 'Finance', 'Healthcare', 'Energy']
+
+SESSION_OPEN = np.timedelta64(9 * 3600 + 1800, 's')  # 09:30
+SESSION_LENGTH_US = 23400 * 1_000_000  # 6.5 hour trading session
+
+
+def ticker_key(ticker):
+    """Stable integer for a ticker (Python's hash() differs between processes)"""
+    return zlib.crc32(ticker.encode())
+
+
+def sector_for(ticker):
+    """Each ticker always belongs to the same sector"""
+    return SECTORS[ticker_key(ticker) % len(SECTORS)]
+
+
+def ticker_universe(n_tickers):
+    """The five demo tickers, padded with synthetic symbols for load tests"""
+    return TICKERS[:n_tickers] + [f'T{i:05d}' for i in range(len(TICKERS), n_tickers)]
+
+
+def mock_market_data(n_records, tickers=TICKERS, seed=42):
+    """In-memory mock records: 100 rows per day, tickers drawn at random, as a dict of columns"""
+    rng = np.random.default_rng(seed)
+    ticker_idx = rng.integers(0, len(tickers), n_records)
+    sectors = np.array([sector_for(t) for t in tickers])
+
+    return {
+        'timestamp': np.datetime64('2024-01-01', 'us') + (np.arange(n_records) // 100).astype('timedelta64[D]'),
+        'ticker': np.asarray(tickers)[ticker_idx],
+        'price': rng.lognormal(4, 0.3, n_records),
+        'volume': rng.exponential(1000000, n_records).astype(np.int64),
+        'bid_ask_spread': rng.exponential(0.01, n_records),
+        'market_cap': rng.lognormal(25, 1, n_records),
+        'sector': sectors[ticker_idx]
+    }
+
+
+def generate_partition(ticker, day, rows, seed=42):
+    """
+    One ticker's ticks for one day, spread evenly over the trading session.
+    The RNG is seeded from (seed, ticker, day), so any process produces the same partition.
+    """
+    day = np.datetime64(day, 'D')
+    day_number = int(day.astype(np.int64))
+    rng = np.random.default_rng([seed, ticker_key(ticker), day_number])
+
+    step = np.timedelta64(SESSION_LENGTH_US // max(rows, 1), 'us')
+    start = day.astype('datetime64[us]') + SESSION_OPEN
+
+    return pl.DataFrame({
+        'timestamp': start + np.arange(rows) * step,
+        'price': rng.lognormal(4, 0.3, rows),
+        'volume': rng.exponential(1000000, rows).astype(np.int64),
+        'bid_ask_spread': rng.exponential(0.01, rows),
+        'market_cap': rng.lognormal(25, 1, rows),
+    }).with_columns(pl.lit(sector_for(ticker)).alias('sector'))
+
+
+def _write_partition(task):
+    path, ticker, day, rows, seed = task
+    directory = os.path.join(path, f'ticker={ticker}', f'date={day}')
+    os.makedirs(directory, exist_ok=True)
+    generate_partition(ticker, day, rows, seed).write_parquet(os.path.join(directory, 'part-0.parquet'))
+    return rows
+
+
+def write_dataset(path, tickers=TICKERS, start='2024-01-01', days=365, rows_per_day=100,
+                  seed=42, workers=None):
+    """
+    Write path/ticker=<T>/date=<YYYY-MM-DD>/part-0.parquet for every ticker and day.
+    Partitions are independent, so they are generated in parallel across processes.
+    Returns the number of rows written.
+    """
+    dates = np.datetime64(start, 'D') + np.arange(days)
+    tasks = [(path, ticker, str(day), rows_per_day, seed) for ticker in tickers for day in dates]
+
+    if workers == 1:
+        return sum(map(_write_partition, tasks))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return sum(executor.map(_write_partition, tasks, chunksize=max(1, len(tasks) // 256)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Write a synthetic partitioned market dataset')
+    parser.add_argument('path')
+    parser.add_argument('--tickers', type=int, default=len(TICKERS))
+    parser.add_argument('--start', default='2024-01-01')
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--rows-per-day', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    begin = time.perf_counter()
+    n_rows = write_dataset(args.path, ticker_universe(args.tickers), args.start, args.days,
+                           args.rows_per_day, args.seed, args.workers)
+    elapsed = time.perf_counter() - begin
+    print(f"Wrote {n_rows:,} rows in {elapsed:.1f}s ({n_rows / elapsed / 1e6:.2f} M rows/s)")
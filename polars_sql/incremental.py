@@ -0,0 +1,307 @@
+#
+# Incremental indicator updates: extend features and quarterly aggregates in O(new rows)
+#
+# Every kernel here is either window-local (each window summed left to right on its own values)
+# or a sequential fold whose state is persisted (EMA, running sums). Feeding the history in one
+# call or in any number of appended batches therefore gives bit-for-bit identical results.
+#
+
+import pickle
+from dataclasses import dataclass, field
+
+import numpy as np
+import polars as pl
+from scipy.signal import lfilter
+
+from pipeline import finalize_quarters
+
+INDICATOR_COLUMNS = [
+    'sma_20', 'volatility_20', 'ema_12', 'price_diff', 'dollar_volume',
+    'rsi_up', 'rsi_down', 'bb_position', 'rsi'
+]
+
+# Columns and types of aggregate_quarters() output, which quarterly() rebuilds from the per-quarter state
+QUARTERLY_SCHEMA = {
+    'ticker': pl.String, 'year': pl.Int32, 'quarter': pl.Int8,
+    'avg_price': pl.Float64, 'price_volatility': pl.Float64, 'min_price': pl.Float64, 'max_price': pl.Float64,
+    'median_price': pl.Float64, 'total_volume': pl.Int64, 'total_dollar_volume': pl.Float64,
+    'avg_rsi': pl.Float64, 'avg_volatility': pl.Float64, 'bollinger_deviation': pl.Float64,
+    'trading_days': pl.UInt32, 'sectors_count': pl.UInt32, 'above_sma_ratio': pl.Float64,
+    'price_range_pct': pl.Float64
+}
+
+
+def _fold(start, values):
+    """Sequential left-fold sum (cumsum adds in order), so it can be continued exactly later"""
+    if len(values) == 0:
+        return start
+    return float(np.cumsum(np.concatenate(([start], values)))[-1])
+
+
+def _window_sums(values, window):
+    """Sum of every full window, each added left to right independently of the array length"""
+    windows = np.lib.stride_tricks.sliding_window_view(values, window)
+    total = windows[:, 0].copy()
+    for k in range(1, window):
+        total += windows[:, k]
+    return total, windows
+
+
+def _rolling_mean_std(values, window, need_std=True):
+    """Window-local mean (and sample std) for every full window of values"""
+    if len(values) < window:
+        return np.empty(0), np.empty(0)
+    total, windows = _window_sums(values, window)
+    mean = total / window
+    if not need_std:
+        return mean, None
+    squares = (windows[:, 0] - mean) ** 2
+    for k in range(1, window):
+        squares += (windows[:, k] - mean) ** 2
+    return mean, np.sqrt(squares / (window - 1))
+
+
+def _align(window_values, n_new):
+    """Results of the full windows ending on the new rows, NaN where no full window exists yet"""
+    out = np.full(n_new, np.nan)
+    n = min(n_new, len(window_values))
+    if n:
+        out[n_new - n:] = window_values[len(window_values) - n:]
+    return out
+
+
+@dataclass
+class QuarterState:
+    """Mergeable partial aggregates for one (ticker, year, quarter)"""
+    count: int = 0
+    price_shift: float = None
+    price_sum: float = 0.0  # sum of (price - price_shift)
+    price_sumsq: float = 0.0
+    price_min: float = np.inf
+    price_max: float = -np.inf
+    prices: list = field(default_factory=list)  # only kept while the quarter is open, for the exact median
+    closed_median: float = None
+    total_volume: int = 0
+    dollar_sum: float = 0.0
+    rsi_sum: float = 0.0
+    rsi_count: int = 0
+    volatility_sum: float = 0.0
+    volatility_count: int = 0
+    bb_shift: float = None
+    bb_sum: float = 0.0
+    bb_sumsq: float = 0.0
+    bb_count: int = 0
+    above_sma: int = 0
+    sectors: set = field(default_factory=set)
+
+    def add(self, price, volume, dollar_volume, rsi, rsi_valid, volatility, bb, sma, sectors):
+        """Fold a batch of filtered rows (in time order) into the partial aggregates"""
+        if len(price) == 0:
+            return
+        if self.price_shift is None:
+            self.price_shift = float(price[0])
+        shifted = price - self.price_shift
+        self.count += len(price)
+        self.price_sum = _fold(self.price_sum, shifted)
+        self.price_sumsq = _fold(self.price_sumsq, shifted * shifted)
+        self.price_min = min(self.price_min, float(price.min()))
+        self.price_max = max(self.price_max, float(price.max()))
+        self.prices.append(price)
+        self.total_volume += int(volume.sum())
+        self.dollar_sum = _fold(self.dollar_sum, dollar_volume)
+
+        self.rsi_sum = _fold(self.rsi_sum, rsi[rsi_valid])
+        self.rsi_count += int(rsi_valid.sum())
+        valid_volatility = volatility[~np.isnan(volatility)]
+        self.volatility_sum = _fold(self.volatility_sum, valid_volatility)
+        self.volatility_count += len(valid_volatility)
+
+        if self.bb_shift is None:
+            self.bb_shift = float(bb[0])
+        bb_shifted = bb - self.bb_shift
+        self.bb_sum = _fold(self.bb_sum, bb_shifted)
+        self.bb_sumsq = _fold(self.bb_sumsq, bb_shifted * bb_shifted)
+        self.bb_count += len(bb)
+
+        self.above_sma += int((price > sma).sum())
+        self.sectors.update(np.unique(sectors).tolist())
+
+    def close(self):
+        """Drop the raw prices once the median can no longer change"""
+        if self.prices:
+            self.prices = [np.concatenate(self.prices)]
+        self.closed_median = self.median()
+        self.prices = []
+
+    def median(self):
+        if not self.prices:
+            return self.closed_median
+        return pl.Series(np.concatenate(self.prices)).quantile(0.5)
+
+    def row(self):
+        n = self.count
+        mean_shifted = self.price_sum / n
+        variance = (self.price_sumsq - self.price_sum * mean_shifted) / (n - 1) if n > 1 else None
+        bb_variance = (self.bb_sumsq - self.bb_sum * self.bb_sum / self.bb_count) / (self.bb_count - 1) \
+            if self.bb_count > 1 else None
+        return {
+            'avg_price': self.price_shift + mean_shifted,
+            'price_volatility': float(np.sqrt(max(variance, 0.0))) if variance is not None else None,
+            'min_price': self.price_min,
+            'max_price': self.price_max,
+            'median_price': self.median(),
+            'total_volume': self.total_volume,
+            'total_dollar_volume': self.dollar_sum,
+            'avg_rsi': self.rsi_sum / self.rsi_count if self.rsi_count else None,
+            'avg_volatility': self.volatility_sum / self.volatility_count if self.volatility_count else None,
+            'bollinger_deviation': float(np.sqrt(max(bb_variance, 0.0))) if bb_variance is not None else None,
+            'trading_days': n,
+            'sectors_count': len(self.sectors),
+            'above_sma_ratio': self.above_sma / n,
+            'price_range_pct': (self.price_max - self.price_min) / self.price_min
+        }
+
+
+@dataclass
+class TickerState:
+    """Everything needed to extend one ticker's features: price tail, EMA fold and open quarters"""
+    rows: int = 0
+    last_timestamp: np.datetime64 = None
+    tail: np.ndarray = field(default_factory=lambda: np.empty(0))
+    ema_num: float = 0.0  # adjust=True EMA numerator/denominator folds, pre-multiplied by the decay
+    ema_den: float = 0.0
+    quarters: dict = field(default_factory=dict)  # (year, quarter) -> QuarterState
+
+
+class IncrementalIndicators:
+    """
+    Per-ticker indicator state that grows with appended ticks.
+
+        engine = IncrementalIndicators()
+        engine.update(history)          # full recompute = update from empty state
+        engine.save('state.pkl')
+        ...
+        engine = IncrementalIndicators.load('state.pkl')
+        features = engine.update(todays_rows)
+        quarterly = engine.quarterly()
+    """
+
+    def __init__(self, sma_window=20, rsi_window=14, ema_span=12,
+                 min_price=10, min_volume=100000, min_trading_days=10):
+        self.sma_window = sma_window
+        self.rsi_window = rsi_window
+        self.decay = 1 - 2 / (ema_span + 1)
+        self.min_price = min_price
+        self.min_volume = min_volume
+        self.min_trading_days = min_trading_days
+        self.tail_length = max(sma_window - 1, rsi_window)
+        self.tickers = {}
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            pickle.dump(self, f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+    def update(self, new_rows):
+        """Extend the state with appended rows and return their indicator columns"""
+        df = new_rows.sort(['ticker', 'timestamp'], maintain_order=True).with_columns([
+            pl.col('timestamp').dt.year().alias('year'),
+            pl.col('timestamp').dt.month().alias('month'),
+            pl.col('timestamp').dt.weekday().alias('weekday'),
+            pl.col('timestamp').dt.quarter().alias('quarter')
+        ])
+
+        features = [self._update_ticker(ticker, part) for (ticker,), part in df.group_by('ticker', maintain_order=True)]
+        if not features:
+            return df.with_columns([pl.lit(None, dtype=pl.Float64).alias(c) for c in INDICATOR_COLUMNS])
+        return pl.concat(features).select(df.columns + INDICATOR_COLUMNS)
+
+    def _update_ticker(self, ticker, part):
+        state = self.tickers.setdefault(ticker, TickerState())
+        timestamps = part['timestamp'].to_numpy()
+        if state.last_timestamp is not None and timestamps[0] < state.last_timestamp:
+            raise ValueError(f"Rows for {ticker} start before the last processed timestamp {state.last_timestamp}")
+
+        price = part['price'].to_numpy().astype(np.float64)
+        n_new = len(price)
+        values = np.concatenate((state.tail, price))
+
+        sma, volatility = _rolling_mean_std(values, self.sma_window)
+        sma = _align(sma, n_new)
+        volatility = _align(volatility, n_new)
+
+        # EMA (adjust=True): weighted sums folded with lfilter, continued from the saved state
+        ema_num, num_state = lfilter([1.0], [1.0, -self.decay], price, zi=[state.ema_num])
+        ema_den, den_state = lfilter([1.0], [1.0, -self.decay], np.ones(n_new), zi=[state.ema_den])
+        ema = ema_num / ema_den
+
+        # Differences over tail+new values. Index 0 is either the ticker's first row (no diff) or lies
+        # outside every RSI window the new rows need, since the tail holds at least rsi_window prices
+        diffs = np.full(len(values), np.nan)
+        diffs[1:] = np.diff(values)
+        price_diff = diffs[-n_new:]
+
+        # NaN propagates, so windows touching the first row's missing diff stay empty as in the pipeline
+        up, _ = _rolling_mean_std(np.clip(diffs, 0, None), self.rsi_window, need_std=False)
+        down, _ = _rolling_mean_std(np.abs(diffs), self.rsi_window, need_std=False)
+        rsi_up = _align(up, n_new)
+        rsi_down = _align(down, n_new)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi = 100 - (100 / (1 + rsi_up / rsi_down))
+        volume = part['volume'].to_numpy()
+        dollar_volume = volume * price
+        bb_position = price - sma
+
+        # Quarterly partial aggregates over the pipeline's row filter
+        keep = (price > self.min_price) & (volume > self.min_volume) & ~np.isnan(sma)
+        rsi_valid = ~np.isnan(rsi_up) & ~np.isnan(rsi_down)
+        years = part['year'].to_numpy()
+        quarters = part['quarter'].to_numpy()
+        sectors = part['sector'].to_numpy()
+        period = years.astype(np.int64) * 10 + quarters
+        for key in np.unique(period):
+            rows = keep & (period == key)
+            quarter_key = (int(key // 10), int(key % 10))
+            quarter_state = state.quarters.setdefault(quarter_key, QuarterState())
+            quarter_state.add(price[rows], volume[rows], dollar_volume[rows], rsi[rows], rsi_valid[rows],
+                              volatility[rows], bb_position[rows], sma[rows], sectors[rows])
+
+        # Quarters before the latest one are final: keep only their median
+        latest = max(state.quarters)
+        for quarter_key, quarter_state in state.quarters.items():
+            if quarter_key < latest and quarter_state.prices:
+                quarter_state.close()
+
+        state.rows += n_new
+        state.last_timestamp = timestamps[-1]
+        state.tail = values[-self.tail_length:].copy()
+        state.ema_num = float(num_state[0])
+        state.ema_den = float(den_state[0])
+
+        return part.with_columns([
+            pl.Series('sma_20', sma, nan_to_null=True),
+            pl.Series('volatility_20', volatility, nan_to_null=True),
+            pl.Series('ema_12', ema),
+            pl.Series('price_diff', price_diff, nan_to_null=True),
+            pl.Series('dollar_volume', dollar_volume),
+            pl.Series('rsi_up', rsi_up, nan_to_null=True),
+            pl.Series('rsi_down', rsi_down, nan_to_null=True),
+            pl.Series('bb_position', bb_position, nan_to_null=True),
+            pl.Series('rsi', np.where(rsi_valid, rsi, np.nan), nan_to_null=True),
+        ])
+
+    def quarterly(self):
+        """Quarterly aggregates for everything seen so far, finalized exactly like the pipeline"""
+        records = []
+        for ticker, state in self.tickers.items():
+            for (year, quarter), quarter_state in state.quarters.items():
+                if quarter_state.count:
+                    records.append({'ticker': ticker, 'year': year, 'quarter': quarter, **quarter_state.row()})
+        # explicit types: no quarter yet (or a column of nulls) must not change the schema
+        quarterly = pl.DataFrame(records, schema=QUARTERLY_SCHEMA)
+        return finalize_quarters(quarterly.lazy(), self.min_trading_days).collect()
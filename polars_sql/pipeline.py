@@ -0,0 +1,179 @@
+#
+# Reusable stock indicator pipeline: rolling indicators, quarterly aggregates and ticker ranking
+#
+
+from functools import lru_cache
+
+import polars as pl
+
+
+def _row_in_ticker():
+    """Position of each row within its ticker's run; rows must be sorted by ticker"""
+    index = pl.int_range(pl.len(), dtype=pl.Int64)
+    first_row = (pl.col('ticker') != pl.col('ticker').shift(1)).fill_null(True)
+    return index - pl.when(first_row).then(index).forward_fill()
+
+
+def _rolling(column, method, window, min_position=0):
+    """
+    Per-ticker rolling statistic on rows sorted by (ticker, timestamp).
+    Row-count windows use the sorted fast path: one pass over the whole column, then windows
+    that reach back into the previous ticker are nulled. Duration windows ('20d') roll by timestamp.
+    """
+    if isinstance(window, str):
+        return getattr(column, f'{method}_by')('timestamp', window_size=window).over('ticker')
+    return pl.when(pl.col('_row') >= window - 1 + min_position).then(getattr(column, method)(window))
+
+
+@lru_cache(maxsize=None)
+def indicator_expressions(sma_window=20, rsi_window=14, ema_span=12):
+    """
+    Expression stages for the indicator columns, built once per window setting.
+    Windows are row counts, or duration strings such as '20d' for time-based windows.
+    """
+    calendar = [
+        pl.col('timestamp').dt.year().alias('year'),
+        pl.col('timestamp').dt.month().alias('month'),
+        pl.col('timestamp').dt.weekday().alias('weekday'),
+        pl.col('timestamp').dt.quarter().alias('quarter'),
+        _row_in_ticker().alias('_row')
+    ]
+
+    price = pl.col('price')
+    rolling = [
+        _rolling(price, 'rolling_mean', sma_window).alias('sma_20'),
+        _rolling(price, 'rolling_std', sma_window).alias('volatility_20'),
+
+        price.ewm_mean(span=ema_span).over('ticker').alias('ema_12'),
+
+        pl.when(pl.col('_row') > 0).then(price.diff()).alias('price_diff'),
+
+        (pl.col('volume') * price).alias('dollar_volume')
+    ]
+
+    # price_diff is null on each ticker's first row, so full RSI windows start one row later
+    momentum = [
+        _rolling(pl.col('price_diff').clip(0, None), 'rolling_mean', rsi_window, 1).alias('rsi_up'),
+        _rolling(pl.col('price_diff').abs(), 'rolling_mean', rsi_window, 1).alias('rsi_down'),
+
+        (price - pl.col('sma_20')).alias('bb_position')
+    ]
+
+    rsi = [
+        (100 - (100 / (1 + pl.col('rsi_up') / pl.col('rsi_down')))).alias('rsi')
+    ]
+
+    return calendar, rolling, momentum, rsi
+
+
+@lru_cache(maxsize=None)
+def quarterly_aggregations():
+    """Per (ticker, year, quarter) aggregate expressions"""
+    return [
+        pl.col('price').mean().alias('avg_price'),
+        pl.col('price').std().alias('price_volatility'),
+        pl.col('price').min().alias('min_price'),
+        pl.col('price').max().alias('max_price'),
+        pl.col('price').quantile(0.5).alias('median_price'),
+
+        pl.col('volume').sum().alias('total_volume'),
+        pl.col('dollar_volume').sum().alias('total_dollar_volume'),
+
+        pl.col('rsi').filter(pl.col('rsi').is_not_null()).mean().alias('avg_rsi'),
+        pl.col('volatility_20').mean().alias('avg_volatility'),
+        pl.col('bb_position').std().alias('bollinger_deviation'),
+
+        pl.len().alias('trading_days'),
+        pl.col('sector').n_unique().alias('sectors_count'),
+
+        (pl.col('price') > pl.col('sma_20')).mean().alias('above_sma_ratio'),
+
+        ((pl.col('price').max() - pl.col('price').min()) / pl.col('price').min())
+          .alias('price_range_pct')
+    ]
+
+
+def add_indicators(source, sma_window=20, rsi_window=14, ema_span=12, presorted=False):
+    """
+    Calendar, rolling, EMA and RSI columns for any LazyFrame with timestamp/ticker/price/volume.
+    Columns keep their default names (sma_20, ema_12, ...) whatever the windows, so aggregates and SQL stay stable.
+    Pass presorted=True when the source is already ordered by (ticker, timestamp) to skip the sort.
+    """
+    # Sort once so every per-ticker window sees its rows in time order
+    lf = source if presorted else source.sort(['ticker', 'timestamp'], maintain_order=True)
+    lf = lf.set_sorted('ticker')
+    for stage in indicator_expressions(sma_window, rsi_window, ema_span):
+        lf = lf.with_columns(stage)
+    return lf.drop('_row')
+
+
+def quarterly_filter(min_price=10, min_volume=100000):
+    """Rows that enter the quarterly aggregates: liquid, above the price floor, with a full SMA window"""
+    return (
+        (pl.col('price') > min_price) &
+        (pl.col('volume') > min_volume) &
+        (pl.col('sma_20').is_not_null())
+    )
+
+
+def aggregate_quarters(source, sma_window=20, rsi_window=14, ema_span=12,
+                       min_price=10, min_volume=100000):
+    """
+    Indicators, row filters and the per (ticker, year, quarter) aggregation.
+    Every group depends on one ticker only, so tickers can be aggregated separately and concatenated.
+    """
+    return (
+        add_indicators(source, sma_window, rsi_window, ema_span)
+
+        .filter(quarterly_filter(min_price, min_volume))
+
+        .group_by(['ticker', 'year', 'quarter'])
+        .agg(quarterly_aggregations())
+    )
+
+
+def finalize_quarters(quarterly, min_trading_days=10):
+    """Cross-ticker ranks, minimum trading days filter and final ordering of the quarterly aggregates"""
+    return (
+        quarterly
+        .with_columns([
+            pl.col('total_dollar_volume').rank(method='ordinal', descending=True).alias('volume_rank'),
+            pl.col('price_volatility').rank(method='ordinal', descending=True).alias('volatility_rank')
+        ])
+
+        .filter(pl.col('trading_days') >= min_trading_days)
+        .sort(['ticker', 'year', 'quarter'])
+    )
+
+
+def build_indicator_pipeline(source, sma_window=20, rsi_window=14, ema_span=12,
+                             min_price=10, min_volume=100000, min_trading_days=10):
+    """
+    Build the indicator and quarterly aggregate plan from a LazyFrame source.
+    Nothing is executed until the returned LazyFrame is collected.
+    """
+    quarterly = aggregate_quarters(source, sma_window, rsi_window, ema_span, min_price, min_volume)
+    return finalize_quarters(quarterly, min_trading_days)
+
+
+def rank_tickers(quarterly):
+    """Per-ticker performance ranking from the quarterly aggregates (DataFrame or LazyFrame)"""
+    return (
+        quarterly.group_by('ticker')
+        .agg([
+            pl.col('avg_price').mean().alias('overall_avg_price'),
+            pl.col('price_volatility').mean().alias('overall_volatility'),
+            pl.col('total_dollar_volume').sum().alias('lifetime_volume'),
+            pl.col('above_sma_ratio').mean().alias('momentum_score'),
+            pl.col('price_range_pct').mean().alias('avg_range_pct')
+        ])
+        .with_columns([
+            (pl.col('overall_avg_price') / pl.col('overall_volatility')).alias('risk_adj_score'),
+
+            (pl.col('momentum_score') * 0.4 +
+             pl.col('avg_range_pct') * 0.3 +
+             (pl.col('lifetime_volume') / pl.col('lifetime_volume').max()) * 0.3)
+             .alias('composite_score')
+        ])
+        .sort('composite_score', descending=True)
+    )
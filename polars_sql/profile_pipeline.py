@@ -0,0 +1,197 @@
+#
+# Per-stage profiling of the indicator pipeline, JSON baselines and a regression check
+#
+#   python profile_pipeline.py profile 1000000                  # stage timings + explain() plans
+#   python profile_pipeline.py baseline -o baseline.json 100000 1000000
+#   python profile_pipeline.py check -b baseline.json --threshold 0.25   # exits 1 on a regression
+#
+# Each stage runs on the materialized output of the previous one, so its time is its own.
+# Per-node timings come from LazyFrame.profile() on Polars versions that still have it.
+#
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+import polars as pl
+
+from generator import mock_market_data
+from pipeline import (build_indicator_pipeline, finalize_quarters, indicator_expressions,
+                      quarterly_aggregations, quarterly_filter)
+
+DEFAULT_SIZES = [100_000, 1_000_000]
+
+
+def stage_plans(sma_window=20, rsi_window=14, ema_span=12, min_price=10, min_volume=100000,
+                min_trading_days=10):
+    """The pipeline split into named stages, each a function from the previous stage's LazyFrame"""
+    calendar, rolling, momentum, rsi = indicator_expressions(sma_window, rsi_window, ema_span)
+    return [
+        ('sort', lambda lf: lf.sort(['ticker', 'timestamp'], maintain_order=True)),
+        ('calendar', lambda lf: lf.set_sorted('ticker').with_columns(calendar)),
+        ('rolling_windows', lambda lf: lf.with_columns(rolling)),
+        ('momentum_windows', lambda lf: lf.with_columns(momentum)),
+        ('rsi', lambda lf: lf.with_columns(rsi).drop('_row')),
+        ('filter', lambda lf: lf.filter(quarterly_filter(min_price, min_volume))),
+        ('group_by', lambda lf: lf.group_by(['ticker', 'year', 'quarter']).agg(quarterly_aggregations())),
+        ('rank', lambda lf: finalize_quarters(lf, min_trading_days)),
+    ]
+
+
+def mock_source(n_records, seed=42):
+    """App-shaped mock data with categorical ticker/sector columns"""
+    return pl.DataFrame(mock_market_data(n_records, seed=seed)).with_columns(
+        pl.col('ticker', 'sector').cast(pl.Categorical)
+    )
+
+
+def _best_time(plan, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = plan.collect()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def node_timings(plan):
+    """Per-node (start, end) microseconds from LazyFrame.profile(), or None where Polars has removed it"""
+    try:
+        _, timings = plan.profile()
+    except AttributeError:
+        return None
+    return [{'node': node, 'start_us': start, 'end_us': end} for node, start, end in timings.iter_rows()]
+
+
+def profile_stages(source, repeats=3, **params):
+    """Best-of-repeats seconds, optimized plan and node timings for every stage, plus the fused end-to-end run"""
+    report = {'rows': source.height, 'stages': {}, 'plans': {}, 'nodes': {}}
+    current = source
+    for name, build in stage_plans(**params):
+        plan = build(current.lazy())
+        report['plans'][name] = plan.explain()
+        report['stages'][name], current = _best_time(plan, repeats)
+        nodes = node_timings(plan)
+        if nodes is not None:
+            report['nodes'][name] = nodes
+
+    full = build_indicator_pipeline(source.lazy(), **params)
+    report['end_to_end'], _ = _best_time(full, repeats)
+    report['plans']['end_to_end'] = full.explain()
+    return report
+
+
+def run_suite(sizes, repeats=3, **params):
+    return {
+        'polars': pl.__version__,
+        'threads': pl.thread_pool_size(),
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'params': params,
+        'sizes': {str(n): profile_stages(mock_source(n), repeats, **params) for n in sizes}
+    }
+
+
+def compare(current, baseline, threshold=0.25, min_seconds=0.005):
+    """
+    Stages slower than baseline by more than threshold (0.25 = 25%) at any size both runs share.
+    Stages under min_seconds in both runs are timer noise and never count.
+    """
+    regressions = []
+    for size, report in current['sizes'].items():
+        base = baseline['sizes'].get(size)
+        if base is None:
+            continue
+        stages = dict(report['stages'], end_to_end=report['end_to_end'])
+        base_stages = dict(base['stages'], end_to_end=base['end_to_end'])
+        for stage, seconds in stages.items():
+            before = base_stages.get(stage)
+            if before is None or max(seconds, before) < min_seconds:
+                continue
+            ratio = seconds / max(before, 1e-9)
+            if ratio > 1 + threshold:
+                regressions.append({'rows': int(size), 'stage': stage, 'baseline_s': before,
+                                    'current_s': seconds, 'ratio': ratio})
+    return regressions
+
+
+def print_report(suite, baseline=None, show_plans=False):
+    print(f"Polars {suite['polars']}, {suite['threads']} threads")
+    for size, report in suite['sizes'].items():
+        base = baseline['sizes'].get(size) if baseline else None
+        total = sum(report['stages'].values())
+        print(f"\n{int(size):,} rows")
+        print(f"  {'stage':<18} {'seconds':>9} {'share':>7}" + (f" {'baseline':>9} {'change':>8}" if base else ''))
+        rows = list(report['stages'].items()) + [('end_to_end', report['end_to_end'])]
+        for stage, seconds in rows:
+            line = f"  {stage:<18} {seconds:>9.4f} {seconds / total:>7.1%}"
+            if base:
+                before = base['stages'].get(stage, base['end_to_end'] if stage == 'end_to_end' else None)
+                if before:
+                    line += f" {before:>9.4f} {seconds / before - 1:>+8.1%}"
+            print(line)
+        for stage, nodes in report['nodes'].items():
+            slowest = max(nodes, key=lambda node: node['end_us'] - node['start_us'])
+            print(f"  {stage}: slowest node {slowest['node']} "
+                  f"({(slowest['end_us'] - slowest['start_us']) / 1000:.2f} ms)")
+    if show_plans:
+        last = suite['sizes'][max(suite['sizes'], key=int)]
+        for stage, plan in last['plans'].items():
+            print(f"\n--- {stage} ---\n{plan}")
+
+
+def load_baseline(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(suite, path):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(suite, f, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Profile the indicator pipeline stage by stage')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('sizes', nargs='*', type=int, help='row counts (default: 100k and 1M)')
+    common.add_argument('--repeats', type=int, default=3)
+
+    profile = subparsers.add_parser('profile', parents=[common], help='print stage timings and plans')
+    profile.add_argument('--no-plans', action='store_true')
+
+    baseline = subparsers.add_parser('baseline', parents=[common], help='write a JSON baseline')
+    baseline.add_argument('-o', '--output', default='baselines/pipeline_profile.json')
+
+    check = subparsers.add_parser('check', parents=[common], help='fail if a stage regressed against a baseline')
+    check.add_argument('-b', '--baseline', default='baselines/pipeline_profile.json')
+    check.add_argument('--threshold', type=float, default=0.25, help='allowed slowdown, 0.25 = 25%%')
+    check.add_argument('--min-seconds', type=float, default=0.005, help='ignore stages faster than this')
+    check.add_argument('--output', help='also write the current run as JSON')
+
+    args = parser.parse_args()
+
+    if args.command == 'check':
+        reference = load_baseline(args.baseline)
+        sizes = args.sizes or [int(size) for size in reference['sizes']]
+        suite = run_suite(sizes, args.repeats, **reference.get('params', {}))
+        print_report(suite, reference)
+        if args.output:
+            save_baseline(suite, args.output)
+        regressions = compare(suite, reference, args.threshold, args.min_seconds)
+        for r in regressions:
+            print(f"REGRESSION {r['rows']:,} rows {r['stage']}: {r['baseline_s']:.4f}s -> "
+                  f"{r['current_s']:.4f}s ({r['ratio'] - 1:+.1%})", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
+
+    suite = run_suite(args.sizes or DEFAULT_SIZES, args.repeats)
+    if args.command == 'baseline':
+        save_baseline(suite, args.output)
+        print_report(suite)
+        print(f"\nBaseline written to {args.output}")
+    else:
+        print_report(suite, show_plans=not args.no_plans)
@@ -0,0 +1,365 @@
+#
+# HTTP SQL query service over registered LazyFrames, answering with Arrow IPC streams
+#
+#   python query_server.py --data /data/ticks --port 8080 --workers 8
+#   curl -s localhost:8080/query -d '{"sql": "SELECT ticker, COUNT(*) AS n FROM ticks GROUP BY ticker"}' > out.arrows
+#
+# Queries run in a pool of worker processes, each holding the registered tables. Each query has
+# a deadline: a worker still busy when it passes is killed, which stops the query and frees its
+# memory, and a fresh worker takes its place. Results are capped at a row limit.
+#
+
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import polars as pl
+import pyarrow as pa
+
+ARROW_STREAM = 'application/vnd.apache.arrow.stream'
+# Workers are spawned, not forked: a fork of a process with a running Polars thread pool can deadlock
+_processes = multiprocessing.get_context('spawn')
+
+
+class QueryTimeout(Exception):
+    """The query did not finish before its deadline and was stopped"""
+
+
+class WorkerError(Exception):
+    """The worker process running a query exited without answering"""
+
+
+def _serve_queries(conn, frames):
+    """Worker process loop: (sql, row limit) in, (True, DataFrame) or (False, exception) out"""
+    context = pl.SQLContext(frames)
+    conn.send('ready')
+    while True:
+        try:
+            sql, limit = conn.recv()
+        except EOFError:
+            return
+        try:
+            conn.send((True, context.execute(sql, eager=False).limit(limit).collect()))
+        except Exception as e:
+            try:
+                conn.send((False, e))
+            except Exception:  # the exception itself does not pickle
+                conn.send((False, RuntimeError(str(e))))
+
+
+class _Worker:
+    """A query process and the connection to it; version is the table registry it was started with"""
+
+    def __init__(self, frames, version):
+        self.version = version
+        self.conn, child = _processes.Pipe()
+        self.process = _processes.Process(target=_serve_queries, args=(child, frames),
+                                          name='query-worker', daemon=True)
+        self.process.start()
+        child.close()
+
+    def wait_ready(self):
+        return self.conn.recv()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class QueryService:
+    """
+    A pl.SQLContext of registered LazyFrames, executed in worker processes with timeouts and row limits.
+    Queries are planned here first, so SQL errors are reported without taking a worker.
+    """
+
+    def __init__(self, workers=None, default_timeout=30.0, max_rows=1_000_000):
+        self.context = pl.SQLContext()
+        self.default_timeout = default_timeout
+        self.max_rows = max_rows
+        self.workers = workers or os.cpu_count()
+        self.frames = {}
+        self.version = 0  # bumped by register(): workers started before it hold stale tables
+        self.idle = queue.Queue()
+        self.running = set()
+        self.started = self.closed = False
+        self._lock = threading.Lock()
+
+    def register(self, name, frame):
+        with self._lock:
+            self.context.register(name, frame.lazy())
+            self.frames[name] = frame.lazy()
+            self.version += 1
+
+    def tables(self):
+        """Registered tables and their column types"""
+        with self._lock:
+            names = self.context.tables()
+            plans = {name: self.context.execute(f'SELECT * FROM "{name}"', eager=False) for name in names}
+        return {name: {column: str(dtype) for column, dtype in plan.collect_schema().items()}
+                for name, plan in plans.items()}
+
+    def start(self):
+        """Start the worker processes with the tables registered so far; run() does it on first use"""
+        with self._lock:
+            if self.started:
+                return
+            self.started = True
+        for worker in [self._spawn() for _ in range(self.workers)]:
+            worker.wait_ready()
+            self.idle.put(worker)
+
+    def _spawn(self):
+        with self._lock:
+            frames, version = dict(self.frames), self.version
+        # outside the lock: starting a process sends it every table, which takes a while for large frames
+        worker = _Worker(frames, version)
+        with self._lock:
+            if self.closed:
+                worker.kill()
+                raise WorkerError("the query service was shut down")
+            self.running.add(worker)
+        return worker
+
+    def _replace(self, worker):
+        """Kill a worker and start another in the background; it joins the pool once its tables are loaded"""
+        worker.kill()
+        with self._lock:
+            self.running.discard(worker)
+
+        def restart():
+            try:
+                replacement = self._spawn()
+                replacement.wait_ready()
+            except (WorkerError, EOFError, OSError):  # shut down meanwhile
+                return
+            self.idle.put(replacement)
+        threading.Thread(target=restart, name='query-worker-start', daemon=True).start()
+
+    def _acquire(self, deadline):
+        while True:
+            try:
+                worker = self.idle.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                raise QueryTimeout("query timed out waiting for a worker") from None
+            if worker.version == self.version:
+                return worker
+            self._replace(worker)
+
+    def run(self, sql, timeout=None, max_rows=None):
+        """
+        Execute a query and return (DataFrame, truncated).
+        Raises QueryTimeout when the deadline passes, including time spent waiting for a worker.
+        """
+        timeout = self.default_timeout if timeout is None else timeout
+        max_rows = self.max_rows if max_rows is None else min(max_rows, self.max_rows)
+        deadline = time.monotonic() + timeout
+
+        with self._lock:
+            self.context.execute(sql, eager=False)
+        self.start()
+        worker = self._acquire(deadline)
+        try:
+            # one extra row tells whether the limit cut the result
+            worker.conn.send((sql, max_rows + 1))
+            if not worker.conn.poll(max(deadline - time.monotonic(), 0)):
+                # cancelling a collect does not stop it; ending the process does
+                self._replace(worker)
+                raise QueryTimeout("query exceeded its timeout and was stopped")
+            ok, result = worker.conn.recv()
+        except (EOFError, OSError):
+            self._replace(worker)
+            raise WorkerError("the query worker exited without a result") from None
+        self.idle.put(worker)
+
+        if not ok:
+            raise result
+        return result.head(max_rows), result.height > max_rows
+
+    def shutdown(self):
+        with self._lock:
+            self.closed = True
+            workers = list(self.running)
+            self.running.clear()
+        for worker in workers:
+            worker.kill()
+
+
+class _ChunkedWriter:
+    """File-like wrapper writing HTTP/1.1 chunked transfer encoding"""
+
+    def __init__(self, wfile):
+        self.wfile = wfile
+        self.closed = False
+
+    def write(self, data):
+        if data:
+            self.wfile.write(b'%x\r\n' % len(data))
+            self.wfile.write(data)
+            self.wfile.write(b'\r\n')
+        return len(data)
+
+    def flush(self):
+        self.wfile.flush()
+
+    def finish(self):
+        self.wfile.write(b'0\r\n\r\n')
+        self.wfile.flush()
+
+
+def _invalid_request(sql, timeout, max_rows):
+    """Why the request fields can't be run, or None"""
+    if not isinstance(sql, str):
+        return '"sql" must be a string'
+    # bool is an int subclass; true/false are not numbers here
+    if timeout is not None and (isinstance(timeout, bool) or not isinstance(timeout, (int, float)) or not timeout > 0):
+        return '"timeout" must be a positive number of seconds'
+    if max_rows is not None and (isinstance(max_rows, bool) or not isinstance(max_rows, int) or max_rows < 0):
+        return '"max_rows" must be an integer >= 0'
+    return None
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    """
+    POST /query   {"sql": ..., "timeout": seconds, "max_rows": n}  ->  Arrow IPC stream
+    GET  /tables  ->  JSON table schemas
+    GET  /health  ->  "ok"
+    """
+
+    protocol_version = 'HTTP/1.1'
+    batch_rows = 65536
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send_json(200, 'ok')
+        elif self.path == '/tables':
+            self._send_json(200, self.server.service.tables())
+        else:
+            self._send_json(404, {'error': f'unknown path {self.path}'})
+
+    def do_POST(self):
+        if self.path != '/query':
+            self._send_json(404, {'error': f'unknown path {self.path}'})
+            return
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            sql = request['sql']
+        except (ValueError, KeyError, TypeError):
+            self._send_json(400, {'error': 'expected a JSON body with an "sql" field'})
+            return
+        error = _invalid_request(sql, request.get('timeout'), request.get('max_rows'))
+        if error:
+            self._send_json(400, {'error': error})
+            return
+
+        try:
+            df, truncated = self.server.service.run(sql, request.get('timeout'), request.get('max_rows'))
+        except QueryTimeout as e:
+            self._send_json(504, {'error': str(e)})
+            return
+        except WorkerError as e:
+            self._send_json(500, {'error': str(e)})
+            return
+        except (pl.exceptions.PolarsError, ValueError) as e:
+            self._send_json(400, {'error': str(e)})
+            return
+
+        table = df.to_arrow()
+        self.send_response(200)
+        self.send_header('Content-Type', ARROW_STREAM)
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.send_header('X-Rows', str(df.height))
+        self.send_header('X-Truncated', 'true' if truncated else 'false')
+        self.end_headers()
+
+        sink = _ChunkedWriter(self.wfile)
+        try:
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                for batch in table.to_batches(max_chunksize=self.batch_rows):
+                    writer.write_batch(batch)
+            sink.finish()
+        except (BrokenPipeError, ConnectionResetError):
+            # the client went away mid-stream
+            self.close_connection = True
+
+
+class QueryHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256  # the default listen backlog of 5 resets bursts of parallel clients
+
+
+def serve(service, host='127.0.0.1', port=8080, verbose=False):
+    """Start the HTTP server; call serve_forever() on the result (or run it in a thread)"""
+    server = QueryHTTPServer((host, port), QueryHandler)
+    server.service = service
+    server.verbose = verbose
+    return server
+
+
+def query(url, sql, timeout=None, max_rows=None):
+    """Client helper: run sql against a query server and return (DataFrame, truncated)"""
+    payload = {'sql': sql, 'timeout': timeout, 'max_rows': max_rows}
+    request = urllib.request.Request(f'{url}/query', data=json.dumps(payload).encode(),
+                                     headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(request) as response:
+            truncated = response.headers.get('X-Truncated') == 'true'
+            table = pa.ipc.open_stream(response).read_all()
+            response.read()  # consume the end of the chunked body
+            return pl.from_arrow(table), truncated
+    except urllib.error.HTTPError as e:
+        raise RuntimeError(f"{e.code}: {json.loads(e.read()).get('error')}") from None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Serve SQL queries over market data as Arrow IPC')
+    parser.add_argument('--data', help='Parquet/CSV file or ticker-partitioned directory (default: mock data)')
+    parser.add_argument('--records', type=int, default=1_000_000, help='mock rows when --data is not given')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='query processes, each with its own copy of the tables')
+    parser.add_argument('--timeout', type=float, default=30.0, help='default per-query timeout in seconds')
+    parser.add_argument('--max-rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    from pipeline import add_indicators, build_indicator_pipeline
+
+    if args.data:
+        from streaming import scan_source
+        source = scan_source(args.data)
+    else:
+        from generator import mock_market_data
+        source = pl.LazyFrame(mock_market_data(args.records))
+
+    service = QueryService(args.workers, args.timeout, args.max_rows)
+    service.register('ticks', source)
+    service.register('features', add_indicators(source))
+    service.register('quarterly', build_indicator_pipeline(source))
+
+    server = serve(service, args.host, args.port, verbose=True)
+    print(f"Serving tables {', '.join(service.tables())} on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.shutdown()
@@ -0,0 +1,276 @@
+#
+# SQL service layer: named tables, a versioned result cache and materialized (ticker, year, quarter) rollups
+#
+#   service = SQLService()
+#   service.register('ticks', add_indicators(lf))
+#   service.add_rollup('ticks', ['ticker', 'year', 'quarter'])
+#   service.query("SELECT ticker, SUM(dollar_volume) AS volume FROM ticks GROUP BY ticker")
+#
+
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import polars as pl
+
+AGGREGATE = re.compile(r'\b(SUM|AVG|MIN|MAX|COUNT)\s*\(\s*(\*|"?[A-Za-z_][A-Za-z0-9_]*"?)\s*\)', re.IGNORECASE)
+IDENTIFIER = re.compile(r'"[^"]+"|[A-Za-z_][A-Za-z0-9_]*')
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+QUOTED = re.compile(r"'(?:[^']|'')*'|\"[^\"]*\"")
+COMMENT = re.compile(r'--[^\n]*|/\*.*?\*/', re.DOTALL)
+ROLLUP_QUERY = re.compile(
+    r'^select\s+(?P<select>.+?)\s+from\s+(?P<table>"?[A-Za-z_][A-Za-z0-9_]*"?)'
+    r'(?:\s+where\s+(?P<where>.+?))?\s+group\s+by\s+(?P<group>.+?)'
+    r'(?P<rest>\s+(?:having|order\s+by|limit)\s+.*)?$',
+    re.IGNORECASE | re.DOTALL
+)
+
+
+KEYWORDS = {
+    'SELECT', 'FROM', 'WHERE', 'GROUP', 'BY', 'HAVING', 'ORDER', 'LIMIT', 'OFFSET', 'AS', 'AND', 'OR', 'NOT',
+    'IN', 'IS', 'NULL', 'BETWEEN', 'LIKE', 'ASC', 'DESC', 'DISTINCT', 'JOIN', 'ON', 'LEFT', 'RIGHT', 'INNER',
+    'OUTER', 'UNION', 'ALL', 'CASE', 'WHEN', 'THEN', 'ELSE', 'END', 'WITH', 'TRUE', 'FALSE', 'CAST',
+    'SUM', 'AVG', 'MIN', 'MAX', 'COUNT', 'STDDEV', 'VARIANCE', 'ROUND', 'ABS', 'NULLS', 'FIRST', 'LAST'
+}
+
+
+def normalize_sql(sql):
+    """Cache key form of a query: comments dropped, whitespace collapsed, keywords lowercased, quoted text untouched"""
+    quoted = []
+
+    def stash(match):
+        quoted.append(match.group(0))
+        return f'\0{len(quoted) - 1}\0'
+
+    text = QUOTED.sub(stash, sql)
+    text = COMMENT.sub(' ', text)
+    text = re.sub(r'\s+', ' ', text).strip().rstrip(';').strip()
+    text = re.sub(r'\s*,\s*', ',', text)
+    text = re.sub(r'(\w)\s+\(|\(\s+', lambda m: (m.group(1) or '') + '(', text)
+    text = re.sub(r'\s+\)', ')', text)
+    # keywords and function names are case-insensitive; identifiers are not
+    text = re.sub(r'[A-Za-z_]+', lambda m: m.group(0).lower() if m.group(0).upper() in KEYWORDS else m.group(0), text)
+    return re.sub(r'\0(\d+)\0', lambda m: quoted[int(m.group(1))], text)
+
+
+def _split_top_level(text):
+    """Split a select list on commas that are not inside parentheses"""
+    parts, depth, start = [], 0, 0
+    for i, char in enumerate(text):
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            parts.append(text[start:i].strip())
+            start = i + 1
+    parts.append(text[start:].strip())
+    return parts
+
+
+class Rollup:
+    """
+    Materialized partial aggregates of a table over key columns: row count plus sum/count/min/max
+    of every numeric column. SUM, MIN, MAX, COUNT and AVG over any subset of the keys are answered
+    by re-aggregating these partials, which is exact for MIN/MAX/COUNT and equal up to float
+    rounding for SUM/AVG.
+    """
+
+    def __init__(self, table, keys):
+        self.table = table
+        self.keys = list(keys)
+        self.name = f'{table}__rollup'
+        self.frame = None
+        self.version = None
+
+    def measures(self, schema):
+        """Numeric non-key columns, the ones with partial aggregates"""
+        return [name for name, dtype in schema.items() if name not in self.keys and dtype.is_numeric()]
+
+    def materialize(self, source, version):
+        aggregations = [pl.len().cast(pl.Int64).alias('__rows')]
+        for name in self.measures(source.collect_schema()):
+            column = pl.col(name)
+            aggregations += [
+                column.sum().alias(f'{name}__sum'),
+                column.count().cast(pl.Int64).alias(f'{name}__count'),
+                column.min().alias(f'{name}__min'),
+                column.max().alias(f'{name}__max')
+            ]
+        self.frame = source.group_by(self.keys).agg(aggregations).collect()
+        self.version = version
+        return self.frame
+
+    def rewrite(self, sql, schema):
+        """The query rewritten against the rollup, or None if the rollup cannot answer it"""
+        measures = set(self.measures(schema))
+        if len(re.findall(r'\bselect\b', sql, re.IGNORECASE)) != 1:
+            return None
+        match = ROLLUP_QUERY.match(sql.strip().rstrip(';'))
+        if not match or match.group('table').strip('"') != self.table:
+            return None
+
+        group = [name.strip().strip('"') for name in match.group('group').split(',')]
+        if not set(group) <= set(self.keys):
+            return None
+
+        def aggregate(call):
+            function, column = call.group(1).upper(), call.group(2).strip('"')
+            if column == '*':
+                return 'SUM("__rows")' if function == 'COUNT' else None
+            if column not in measures:
+                return None
+            if function == 'AVG':
+                return f'(SUM("{column}__sum") / SUM("{column}__count"))'
+            if function == 'COUNT':
+                return f'SUM("{column}__count")'
+            return f'{function}("{column}__{function.lower()}")'
+
+        # Every aggregate in the select list needs an alias, so output names do not depend on the rewrite
+        select, aliases = [], set()
+        for item in _split_top_level(match.group('select')):
+            alias = re.search(r'\bas\s+("?\w+"?)$', item, re.IGNORECASE)
+            if AGGREGATE.search(item) and not alias:
+                return None
+            if alias:
+                aliases.add(alias.group(1).strip('"'))
+            select.append(item)
+
+        failed = []
+
+        def substitute(text):
+            def replace(call):
+                rewritten = aggregate(call)
+                if rewritten is None:
+                    failed.append(call.group(0))
+                    return call.group(0)
+                return rewritten
+            return AGGREGATE.sub(replace, text)
+
+        select = substitute(', '.join(select))
+        where = match.group('where') or ''
+        rest = substitute(match.group('rest') or '')
+        if failed:
+            return None
+
+        # Anything left that names a non-key column of the base table needed the raw rows;
+        # after the select list, output aliases may be referenced as well
+        def needs_rows(text, allowed):
+            text = STRING_LITERAL.sub("''", text)
+            text = re.sub(r'\bas\s+"?\w+"?', ' ', text, flags=re.IGNORECASE)
+            text = re.sub(r'"\w+__\w+"', ' ', text)
+            return any(token.strip('"') in schema and token.strip('"') not in allowed
+                       for token in IDENTIFIER.findall(text))
+
+        keys = set(self.keys)
+        if needs_rows(select, keys) or needs_rows(where, keys) or needs_rows(rest, keys | aliases):
+            return None
+
+        rewritten = f"SELECT {select} FROM {self.name}"
+        if where:
+            rewritten += f" WHERE {where}"
+        return rewritten + f" GROUP BY {match.group('group')}{rest}"
+
+
+class SQLService:
+    """
+    Named LazyFrame tables behind one SQLContext, with a result cache keyed on the normalized SQL
+    and the versions of the tables it reads, and automatic rollup substitution for GROUP BY queries.
+    """
+
+    def __init__(self, max_cache_entries=256):
+        self.context = pl.SQLContext()
+        self.tables = {}
+        self.versions = {}
+        self.rollups = {}
+        self.max_cache_entries = max_cache_entries
+        self.cache = OrderedDict()
+        self.latencies = {'hit': [], 'rollup': [], 'miss': []}
+        self._lock = threading.RLock()
+
+    def register(self, name, frame):
+        """Register or replace a table; replacing it bumps its version, so cached results go stale"""
+        lf = frame.lazy()
+        with self._lock:
+            self.tables[name] = lf
+            self.versions[name] = self.versions.get(name, 0) + 1
+            self.context.register(name, lf)
+
+    def add_rollup(self, table, keys=('ticker', 'year', 'quarter')):
+        """Materialize partial aggregates of a table over keys (refreshed when the table changes)"""
+        with self._lock:
+            self.rollups[table] = Rollup(table, keys)
+
+    def _rollup_for(self, table):
+        rollup = self.rollups[table]
+        if rollup.version != self.versions[table]:
+            self.context.register(rollup.name, rollup.materialize(self.tables[table], self.versions[table]).lazy())
+        return rollup
+
+    def _referenced_tables(self, sql):
+        return sorted({token for token in IDENTIFIER.findall(STRING_LITERAL.sub("''", sql)) if token in self.tables})
+
+    def query(self, sql):
+        """Run a query, answering from the cache or a rollup when possible; returns a DataFrame"""
+        start = time.perf_counter()
+        key = normalize_sql(sql)
+        with self._lock:
+            tables = self._referenced_tables(key)
+            cache_key = (key, tuple((name, self.versions[name]) for name in tables))
+            if cache_key in self.cache:
+                self.cache.move_to_end(cache_key)
+                result = self.cache[cache_key]
+                self.latencies['hit'].append(time.perf_counter() - start)
+                return result
+
+            kind, plan = 'miss', key
+            for table in tables:
+                if table in self.rollups:
+                    rewritten = self.rollups[table].rewrite(key, self.tables[table].collect_schema())
+                    if rewritten:
+                        self._rollup_for(table)
+                        kind, plan = 'rollup', rewritten
+                        break
+            lazy = self.context.execute(plan, eager=False)
+
+        result = lazy.collect()
+        with self._lock:
+            self.cache[cache_key] = result
+            if len(self.cache) > self.max_cache_entries:
+                self.cache.popitem(last=False)
+            self.latencies[kind].append(time.perf_counter() - start)
+        return result
+
+    def explain_rewrite(self, sql):
+        """The SQL that would run against a rollup, or None if the query runs on the base table"""
+        key = normalize_sql(sql)
+        for table in self._referenced_tables(key):
+            if table in self.rollups:
+                rewritten = self.rollups[table].rewrite(key, self.tables[table].collect_schema())
+                if rewritten:
+                    return rewritten
+        return None
+
+    def stats(self):
+        """Cache hit rate and latency percentiles (ms) per path: cache hit, rollup, base table"""
+        total = sum(len(values) for values in self.latencies.values())
+        report = {'queries': total, 'hit_rate': len(self.latencies['hit']) / total if total else 0.0}
+        for kind, values in self.latencies.items():
+            ms = np.asarray(values) * 1000
+            report[kind] = {
+                'count': len(values),
+                'mean_ms': float(ms.mean()) if len(ms) else None,
+                'p50_ms': float(np.percentile(ms, 50)) if len(ms) else None,
+                'p95_ms': float(np.percentile(ms, 95)) if len(ms) else None
+            }
+        return report
+
+    def reset_stats(self):
+        with self._lock:
+            self.latencies = {kind: [] for kind in self.latencies}
+
+    def clear_cache(self):
+        with self._lock:
+            self.cache.clear()
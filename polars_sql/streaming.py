@@ -0,0 +1,139 @@
+#
+# Out-of-core execution of the indicator pipeline over Parquet/CSV datasets larger than memory
+#
+
+import glob
+import os
+
+import numpy as np
+import polars as pl
+
+from incremental import IncrementalIndicators
+from pipeline import add_indicators, aggregate_quarters, finalize_quarters
+
+CHUNK_ROWS = 250_000  # about this many rows of one ticker are in memory at a time
+
+
+def scan_source(path):
+    """
+    Lazily scan a dataset: a Parquet file, a CSV file, a glob, or a hive-partitioned
+    directory such as data/ticker=AAPL/date=2024-01-01/part.parquet
+    """
+    if os.path.isdir(path):
+        if glob.glob(os.path.join(path, '**', '*.csv'), recursive=True):
+            return pl.scan_csv(os.path.join(path, '**', '*.csv'), try_parse_dates=True)
+        return pl.scan_parquet(os.path.join(path, '**', '*.parquet'), hive_partitioning=True)
+    if path.endswith('.csv'):
+        return pl.scan_csv(path, try_parse_dates=True)
+    return pl.scan_parquet(path, hive_partitioning=True)
+
+
+def ticker_partitions(path):
+    """Ticker values of a ticker=<value> hive layout, or None if the dataset is not partitioned that way"""
+    if not os.path.isdir(path):
+        return None
+    tickers = [
+        name.split('=', 1)[1] for name in sorted(os.listdir(path))
+        if name.startswith('ticker=') and os.path.isdir(os.path.join(path, name))
+    ]
+    return tickers or None
+
+
+def _ticker_source(path, ticker):
+    """One ticker's rows; partition pruning means only its files are read"""
+    return scan_source(path).filter(pl.col('ticker') == ticker)
+
+
+def time_ranges(source, chunk_rows=CHUNK_ROWS):
+    """
+    Half-open [start, end) timestamp ranges covering a source, each holding about chunk_rows rows
+    when ticks are spread evenly over time. Only the row count and timestamp bounds are read.
+    """
+    n_rows, first, last = source.select(
+        pl.len(), pl.col('timestamp').min().alias('first'), pl.col('timestamp').max().alias('last')
+    ).collect(engine='streaming').row(0)
+    if not n_rows:
+        return []
+    first, last = np.datetime64(first, 'us'), np.datetime64(last, 'us') + np.timedelta64(1, 'us')
+    n_ranges = -(-n_rows // chunk_rows)
+    bounds = first + (last - first) // n_ranges * np.arange(n_ranges + 1)
+    bounds[-1] = last
+    return [(start, end) for start, end in zip(bounds[:-1], bounds[1:]) if end > start]
+
+
+def run_streaming(path, output_path=None, features_dir=None, min_trading_days=10,
+                  chunk_rows=CHUNK_ROWS, **params):
+    """
+    Run the quarterly indicator pipeline without loading the whole dataset.
+
+    With a ticker-partitioned layout each ticker is read in time ranges of about chunk_rows rows
+    and fed to IncrementalIndicators, which carries the rolling-window tails, the EMA fold and the
+    per-quarter aggregates from one range to the next. Peak memory is then one range plus the
+    prices of each ticker's open quarter (kept for the exact median), whatever the dataset size.
+    Other layouts, and duration windows such as '20d', run as one plan on the streaming engine.
+    Returns the quarterly DataFrame, or None when it was sunk to output_path.
+    """
+    tickers = ticker_partitions(path)
+
+    if tickers is None:
+        plan = finalize_quarters(aggregate_quarters(scan_source(path), **params), min_trading_days)
+        if output_path:
+            plan.sink_parquet(output_path)
+            return None
+        return plan.collect(engine='streaming')
+
+    if any(isinstance(params.get(window), str) for window in ('sma_window', 'rsi_window')):
+        quarterly = _run_per_ticker(path, tickers, features_dir, min_trading_days, **params)
+    else:
+        quarterly = _run_chunked(path, tickers, features_dir, min_trading_days, chunk_rows, **params)
+
+    if output_path:
+        quarterly.write_parquet(output_path)
+        return None
+    return quarterly
+
+
+def _run_chunked(path, tickers, features_dir, min_trading_days, chunk_rows, **params):
+    """Each ticker in time ranges, continued range to range by IncrementalIndicators"""
+    engine = IncrementalIndicators(min_trading_days=min_trading_days, **params)
+    for ticker in tickers:
+        source = _ticker_source(path, ticker)
+        # date=<day> partitions hold that day's ticks: filtering on them too skips other days' files unopened
+        by_date = source.collect_schema().get('date') == pl.Date
+        for part, (start, end) in enumerate(time_ranges(source, chunk_rows)):
+            in_range = pl.col('timestamp').is_between(start, end, closed='left')
+            if by_date:
+                last_day = (end - np.timedelta64(1, 'us')).astype('datetime64[D]')
+                in_range &= pl.col('date').is_between(start.astype('datetime64[D]'), last_day)
+            rows = source.filter(in_range).collect()
+            if not rows.height:
+                continue
+            features = engine.update(rows)
+            if features_dir:
+                directory = os.path.join(features_dir, f'ticker={ticker}')
+                os.makedirs(directory, exist_ok=True)
+                features.write_parquet(os.path.join(directory, f'part-{part:05d}.parquet'))
+
+    return engine.quarterly()
+
+
+def _run_per_ticker(path, tickers, features_dir, min_trading_days, **params):
+    """
+    Each ticker as one plan, for duration windows, which IncrementalIndicators does not continue
+    across ranges: memory is bounded by the largest ticker, not by the dataset
+    """
+    partials = []
+    for ticker in tickers:
+        source = _ticker_source(path, ticker)
+        if features_dir:
+            sink_features(source, os.path.join(features_dir, f'ticker={ticker}', 'part.parquet'), **params)
+        partials.append(aggregate_quarters(source, **params).collect(engine='streaming'))
+
+    # Quarterly aggregates are tiny compared to the input; rank them in memory
+    return finalize_quarters(pl.concat(partials).lazy(), min_trading_days).collect()
+
+
+def sink_features(source, output_path, sma_window=20, rsi_window=14, ema_span=12, **_):
+    """Write the per-row indicator columns of a source straight to Parquet"""
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    add_indicators(source, sma_window, rsi_window, ema_span).sink_parquet(output_path)